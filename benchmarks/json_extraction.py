@@ -0,0 +1,121 @@
+"""
+Micro-benchmark for JSON extraction from model outputs.
+
+Compares the regex scans that used to locate JSON in supervisor and worker
+responses with the single-pass scanners in minions.utils.json_parsing. The
+inputs are the prompts and outputs captured in minion_logs/, plus synthetic
+brace-heavy and unbalanced outputs of growing size to show how each approach
+scales.
+
+Usage:
+    python benchmarks/json_extraction.py [--log-dir minion_logs] [--repeat 5]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import timeit
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from minions.utils.json_parsing import (  # noqa: E402
+    escape_control_chars_in_strings,
+    find_fenced_blocks,
+    find_json_objects,
+)
+
+
+def legacy_objects(text: str) -> List[str]:
+    matches = list(re.finditer(r"\{.*?\}", text, re.DOTALL))
+    matches.sort(key=lambda m: len(m.group(0)), reverse=True)
+    return [m.group(0) for m in matches]
+
+
+def legacy_blocks(text: str) -> List[str]:
+    return [m.group(1).strip() for m in re.finditer(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)]
+
+
+def legacy_escape(text: str) -> str:
+    return re.sub(r'(".*?")', lambda m: m.group(1).replace("\n", "\\n"), text, flags=re.DOTALL)
+
+
+CASES: Dict[str, Dict[str, Callable[[str], object]]] = {
+    "objects": {"regex": legacy_objects, "scanner": find_json_objects},
+    "fenced blocks": {"regex": legacy_blocks, "scanner": lambda t: find_fenced_blocks(t, "json")},
+    "escape newlines": {
+        "regex": legacy_escape,
+        "scanner": lambda t: escape_control_chars_in_strings(t)[0],
+    },
+}
+
+
+def load_captured_outputs(log_dir: str) -> List[str]:
+    """Every prompt and output string recorded in the Minion conversation logs."""
+    texts = []
+    for path in sorted(glob.glob(os.path.join(log_dir, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            try:
+                log = json.load(f)
+            except json.JSONDecodeError:
+                # Logs of runs that crashed mid-write
+                continue
+        for turn in log.get("conversation", []):
+            for key in ("prompt", "output"):
+                if isinstance(turn.get(key), str):
+                    texts.append(turn[key])
+    return texts
+
+
+def synthetic_output(n_objects: int) -> str:
+    """A worker-style answer with many small objects and one unclosed brace."""
+    item = 'Step: {"id": %d, "note": "uses {braces} and \\"quotes\\"\nacross lines"} '
+    return "{ unclosed reasoning " + "".join(item % i for i in range(n_objects))
+
+
+def unbalanced_output(n_braces: int) -> str:
+    """LaTeX-style worker output whose braces never close, followed by the answer."""
+    return "\\frac{a" * n_braces + '\n{"answer": "done"'
+
+
+def bench(texts: List[str], repeat: int) -> None:
+    for case, impls in CASES.items():
+        timings = {}
+        for name, fn in impls.items():
+            timer = timeit.Timer(lambda: [fn(t) for t in texts])
+            timings[name] = min(timer.repeat(repeat=repeat, number=1))
+        speedup = timings["regex"] / timings["scanner"] if timings["scanner"] else float("inf")
+        print(
+            f"  {case:<16} regex {timings['regex'] * 1e3:9.2f} ms"
+            f"   scanner {timings['scanner'] * 1e3:9.2f} ms   x{speedup:.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--log-dir", default="minion_logs")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    captured = load_captured_outputs(args.log_dir)
+    total = sum(len(t) for t in captured)
+    print(f"Captured outputs: {len(captured)} texts, {total} chars")
+    if captured:
+        bench(captured, args.repeat)
+
+    for n_objects in (100, 1000, 4000):
+        text = synthetic_output(n_objects)
+        print(f"Synthetic output: {n_objects} objects, {len(text)} chars")
+        bench([text], args.repeat)
+
+    for n_braces in (1000, 4000):
+        text = unbalanced_output(n_braces)
+        print(f"Unbalanced output: {n_braces} open braces, {len(text)} chars")
+        bench([text], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
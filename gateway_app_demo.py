@@ -59,7 +59,7 @@ Additional Context (if provided):
 import os
 import time
 import pandas as pd
-import fitz  # PyMuPDF
+from minions.utils.ingestion import pdf_to_text
 from PIL import Image
 import io
 from streamlit_theme import st_theme
@@ -112,12 +112,7 @@ def is_dark_mode():
 def extract_text_from_pdf(pdf_bytes):
     """Extract text from a PDF file using PyMuPDF."""
     try:
-        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        doc.close()
-        return text
+        return pdf_to_text(pdf_bytes)
     except Exception as e:
         st.error(f"Error processing PDF: {str(e)}")
         return None
@@ -314,7 +309,7 @@ def run_gateway(task, context, doc_metadata, status, use_refined_prompt):
             if message_callback:
                 message_callback("supervisor", None, is_final=False)
 
-            supervisor_response, supervisor_usage = st.session_state.remote_client.chat(
+            supervisor_response, supervisor_usage, _ = st.session_state.remote_client.chat(
                 messages=supervisor_messages
             )
 
@@ -701,7 +696,7 @@ class Gateway:
         if self.callback:
             self.callback("supervisor", None, is_final=False)
 
-        supervisor_response, supervisor_usage = self.remote_client.chat(
+        supervisor_response, supervisor_usage, _ = self.remote_client.chat(
             messages=supervisor_messages
         )
         remote_usage += supervisor_usage
@@ -820,7 +815,7 @@ def submit_to_api(query, context, doc_metadata):
             if st.session_state.callback:
                 st.session_state.callback("supervisor", None, is_final=False)
 
-            supervisor_response, supervisor_usage = st.session_state.remote_client.chat(
+            supervisor_response, supervisor_usage, _ = st.session_state.remote_client.chat(
                 messages=supervisor_messages
             )
 
@@ -1,4 +1,6 @@
+from minions.clients.base import BaseClient, ChatResult
 from minions.clients.ollama import OllamaClient
+from minions.clients.ollama_pool import OllamaPoolClient
 from minions.clients.openai import OpenAIClient
 from minions.clients.anthropic import AnthropicClient
 from minions.clients.together import TogetherClient
@@ -6,9 +8,14 @@ from minions.clients.perplexity import PerplexityAIClient
 from minions.clients.openrouter import OpenRouterClient
 
 from minions.clients.groq import GroqClient
+from minions.clients.cached import CachedClient
+from minions.clients.routing import RoutingClient
 
 __all__ = [
+    "BaseClient",
+    "ChatResult",
     "OllamaClient",
+    "OllamaPoolClient",
     "OpenAIClient",
     "AnthropicClient",
     "TogetherClient",
@@ -16,4 +23,6 @@ __all__ = [
     "OpenRouterClient",
     "MLXLMClient",
     "GroqClient",
+    "CachedClient",
+    "RoutingClient",
 ]
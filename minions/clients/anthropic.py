@@ -1,12 +1,19 @@
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 import os
+import time
 import anthropic
 
+from minions.clients.base import BaseClient, ChatResult
+from minions.clients.pool import get_connection_pool
+from minions.clients.rate_limit import estimate_request_tokens, get_rate_limiter
 from minions.usage import Usage
 
+# Anthropic stop reasons in the OpenAI/Ollama vocabulary the protocols check
+_DONE_REASONS = {"end_turn": "stop", "stop_sequence": "stop", "max_tokens": "length"}
 
-class AnthropicClient:
+
+class AnthropicClient(BaseClient):
     def __init__(
         self,
         model_name: str = "claude-3-sonnet-20240229",
@@ -32,9 +39,64 @@ class AnthropicClient:
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.stream = stream
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        # Retries are left to the rate limiter, which backs off across callers
+        self.client = get_connection_pool().sdk_client(
+            anthropic.Anthropic, api_key=self.api_key, max_retries=0
+        )
+        self.rate_limiter = get_rate_limiter("anthropic", self.api_key)
+
+    @property
+    def async_client(self) -> "anthropic.AsyncAnthropic":
+        """Pooled async SDK client for the running event loop."""
+        return get_connection_pool().async_sdk_client(
+            anthropic.AsyncAnthropic, api_key=self.api_key, max_retries=0
+        )
+
+    @staticmethod
+    def _to_result(message: Any, start: float) -> ChatResult:
+        """ChatResult of a finished Anthropic message requested at ``start`` (perf_counter)."""
+        return ChatResult(
+            [message.content[0].text],
+            Usage(
+                prompt_tokens=message.usage.input_tokens,
+                completion_tokens=message.usage.output_tokens
+            ),
+            [_DONE_REASONS.get(message.stop_reason, message.stop_reason or "stop")],
+            latency=time.perf_counter() - start,
+        )
+
+    @staticmethod
+    def _on_event(event: Any, state: Dict[str, Any], start: float, stream_callback) -> None:
+        """Fold one raw streaming event into ``state`` (text, usage, stop reason, ttft)."""
+        if event.type == "message_start":
+            state["input_tokens"] = event.message.usage.input_tokens
+        elif event.type == "content_block_delta" and hasattr(event.delta, "text"):
+            if state["ttft"] is None:
+                state["ttft"] = time.perf_counter() - start
+            state["text"] += event.delta.text
+            stream_callback(event.delta.text)
+        elif event.type == "message_delta":
+            state["output_tokens"] = event.usage.output_tokens
+            state["stop_reason"] = event.delta.stop_reason
 
-    def chat(self, messages: List[Dict[str, Any]], stream_callback=None, **kwargs) -> Tuple[List[str], Usage]:
+    @staticmethod
+    def _stream_result(state: Dict[str, Any], start: float) -> ChatResult:
+        return ChatResult(
+            [state["text"]],
+            Usage(
+                prompt_tokens=state["input_tokens"],
+                completion_tokens=state["output_tokens"]
+            ),
+            [_DONE_REASONS.get(state["stop_reason"], state["stop_reason"] or "stop")],
+            latency=time.perf_counter() - start,
+            ttft=state["ttft"],
+        )
+
+    @staticmethod
+    def _new_stream_state() -> Dict[str, Any]:
+        return {"text": "", "input_tokens": 0, "output_tokens": 0, "stop_reason": None, "ttft": None}
+
+    def chat(self, messages: List[Dict[str, Any]], stream_callback=None, **kwargs) -> ChatResult:
         """
         Handle chat completions using the Anthropic API.
 
@@ -44,7 +106,7 @@ class AnthropicClient:
             **kwargs: Additional arguments to pass to client.messages.create
 
         Returns:
-            Tuple of (List[str], Usage) containing response strings and token usage
+            ChatResult with the response strings, token usage and finish reasons
         """
         assert len(messages) > 0, "Messages cannot be empty."
 
@@ -57,37 +119,64 @@ class AnthropicClient:
                 "stream": self.stream,
                 **kwargs,
             }
+            tokens = estimate_request_tokens(messages, self.max_tokens)
+            start = time.perf_counter()
 
             if self.stream and stream_callback:
-                # Handle streaming response
-                response_content = ""
-                prompt_tokens = 0
-                completion_tokens = 0
-                
-                with self.client.messages.stream(**params) as stream:
-                    for chunk in stream:
-                        if hasattr(chunk, 'delta') and hasattr(chunk.delta, 'text'):
-                            chunk_text = chunk.delta.text
-                            response_content += chunk_text
-                            stream_callback(chunk_text)
-                
-                # Since streaming doesn't provide token usage, we need to get it from a separate API call or estimate
-                # For simplicity, we'll just create a minimal usage object
-                usage = Usage(
-                    prompt_tokens=prompt_tokens,
-                    completion_tokens=completion_tokens
+                # Handle streaming response; throttling errors arrive before
+                # the first event, so only opening the stream is retried
+                state = self._new_stream_state()
+                stream = self.rate_limiter.call(
+                    self.client.messages.create, tokens=tokens, **params
                 )
-                
-                return [response_content], usage
+                for event in stream:
+                    self._on_event(event, state, start, stream_callback)
+                return self._stream_result(state, start)
             else:
                 # Handle non-streaming response
-                response = self.client.messages.create(**params)
-                usage = Usage(
-                    prompt_tokens=response.usage.input_tokens,
-                    completion_tokens=response.usage.output_tokens
+                response = self.rate_limiter.call(
+                    self.client.messages.create, tokens=tokens, **params
                 )
-                return [response.content[0].text], usage
+                return self._to_result(response, start)
             
         except Exception as e:
             self.logger.error(f"Error during Anthropic API call: {e}")
-            raise 
\ No newline at end of file
+            raise
+
+    async def achat(self, messages: List[Dict[str, Any]], stream_callback=None, **kwargs) -> ChatResult:
+        """
+        Asynchronous variant of `chat` built on ``anthropic.AsyncAnthropic``.
+
+        Returns:
+            ChatResult with the response strings, token usage and finish reasons
+        """
+        assert len(messages) > 0, "Messages cannot be empty."
+
+        try:
+            params = {
+                "model": self.model_name,
+                "messages": messages,
+                "max_tokens": self.max_tokens,
+                "temperature": self.temperature,
+                **kwargs,
+            }
+            tokens = estimate_request_tokens(messages, self.max_tokens)
+            start = time.perf_counter()
+
+            if self.stream and stream_callback:
+                state = self._new_stream_state()
+                stream = await self.rate_limiter.acall(
+                    self.async_client.messages.create, tokens=tokens, stream=True, **params
+                )
+                async for event in stream:
+                    self._on_event(event, state, start, stream_callback)
+                return self._stream_result(state, start)
+            else:
+                response = await self.rate_limiter.acall(
+                    self.async_client.messages.create, tokens=tokens, **params
+                )
+                return self._to_result(response, start)
+
+        except Exception as e:
+            self.logger.error(f"Error during async Anthropic API call: {e}")
+            raise
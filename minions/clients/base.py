@@ -2,69 +2,300 @@
 Base classes for LLM clients.
 """
 
-from typing import Any, Dict, List, Optional, Tuple, Union
-from dataclasses import dataclass
+import asyncio
+import queue
+import threading
+import time
+from typing import Any, Dict, Generator, List, Optional, Sequence, Tuple, Union
 
+# All clients share the same usage dataclass so counts can be summed across them
+from minions.usage import Usage
 
-@dataclass
-class Usage:
+
+class ChatResult:
+    """
+    What every client's ``chat`` returns.
+
+    Unpacks like the tuple it replaces, ``responses, usage, done_reasons =
+    client.chat(...)``, and carries the call's timing on top. A plain
+    ``__slots__`` class rather than a dataclass so building one per request
+    costs no more than the tuple did.
+
+    Attributes:
+        responses: One completion per choice
+        usage: Token usage of the call
+        done_reasons: Why each completion ended ("stop", "length", ...)
+        latency: Wall time of the call in seconds
+        ttft: Seconds until the first streamed token, None if not streamed
+        cached: True if the result was replayed from a response cache
+    """
+
+    __slots__ = ("responses", "usage", "done_reasons", "latency", "ttft", "cached")
+
+    def __init__(
+        self,
+        responses: List[str],
+        usage: Optional[Usage] = None,
+        done_reasons: Optional[List[str]] = None,
+        latency: float = 0.0,
+        ttft: Optional[float] = None,
+        cached: bool = False,
+    ):
+        self.responses = responses
+        self.usage = usage if usage is not None else Usage()
+        self.done_reasons = (
+            done_reasons if done_reasons is not None else ["stop"] * len(responses)
+        )
+        self.latency = latency
+        self.ttft = ttft
+        self.cached = cached
+
+    @classmethod
+    def of(cls, result: Any) -> "ChatResult":
+        """Wrap the ``(responses, usage[, done_reasons])`` tuple of a third-party client."""
+        if isinstance(result, cls):
+            return result
+        done_reasons = result[2] if len(result) > 2 else None
+        if isinstance(done_reasons, str):
+            done_reasons = [done_reasons] * len(result[0])
+        return cls(list(result[0]), result[1], done_reasons)
+
+    def __iter__(self):
+        return iter((self.responses, self.usage, self.done_reasons))
+
+    def __len__(self) -> int:
+        return 3
+
+    def __getitem__(self, index):
+        return (self.responses, self.usage, self.done_reasons)[index]
+
+    def __repr__(self) -> str:
+        return (
+            f"ChatResult(responses={self.responses!r}, usage={self.usage!r}, "
+            f"done_reasons={self.done_reasons!r}, latency={self.latency:.3f}, "
+            f"ttft={self.ttft!r}, cached={self.cached!r})"
+        )
+
+
+async def achat(client: Any, messages: List[Dict[str, Any]], **kwargs) -> ChatResult:
     """
-    Dataclass to track token usage statistics for LLM calls.
+    Await one conversation on any client without blocking the event loop.
+
+    Uses the client's native coroutine when it has one (``aschat`` for clients
+    whose ``achat`` fans out independent requests, such as OllamaClient, else
+    ``achat``) and otherwise runs the blocking ``chat`` in a worker thread.
+
+    Returns:
+        A ChatResult
+    """
+    native = getattr(client, "aschat", None) or getattr(client, "achat", None)
+    if native is not None:
+        return ChatResult.of(await native(messages, **kwargs))
+    return ChatResult.of(await asyncio.to_thread(client.chat, messages, **kwargs))
+
+
+def _single_result(result: Any) -> Tuple[str, Usage, str]:
+    responses, usage, done_reasons = ChatResult.of(result)
+    return responses[0], usage, (done_reasons[0] if done_reasons else None) or "stop"
+
+
+class BatchChatMixin:
+    """
+    Adds `chat_batch` for sending many independent single-turn prompts.
+
+    None of the supported servers expose a synchronous batch endpoint, so the
+    batch is sent as concurrent requests with ``batch_size`` of them in flight at
+    any time; the server's continuous batching (Ollama's parallel slots,
+    Tokasaurus, vLLM, ...) then groups them on the GPU. Subclasses set
+    ``batch_size`` to a default that saturates their server.
     """
-    prompt_tokens: int = 0
-    completion_tokens: int = 0
-    total_tokens: int = 0
-    
-    def __add__(self, other):
-        """Allow Usage objects to be added together."""
-        if other is None:
-            return self
-        return Usage(
-            prompt_tokens=self.prompt_tokens + other.prompt_tokens,
-            completion_tokens=self.completion_tokens + other.completion_tokens,
-            total_tokens=self.total_tokens + other.total_tokens
+
+    batch_size: int = 8
+
+    def chat_batch(
+        self,
+        conversations: Sequence[Union[List[Dict[str, Any]], Dict[str, Any]]],
+        batch_size: Optional[int] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> ChatResult:
+        """
+        Run independent conversations and return their results in input order.
+
+        Args:
+            conversations: Conversations (lists of messages) or single messages
+            batch_size: Maximum requests in flight (default: the client's batch_size)
+            timeout: Optional per-request timeout in seconds
+            **kwargs: Passed to every `chat` call
+
+        Returns:
+            A ChatResult with one response and done reason per conversation;
+            failed requests give an empty response and a done reason of
+            "error" or "timeout"
+        """
+        # Imported here: minions.utils imports this module
+        from minions.utils.executor import JobExecutor
+        from minions.utils.tracing import get_tracer
+
+        start = time.perf_counter()
+        executor = JobExecutor(
+            max_concurrency=batch_size or self.batch_size, timeout=timeout
+        )
+        results = executor.map(
+            lambda conversation: self._chat_one(conversation, **kwargs),
+            list(conversations),
+        )
+
+        tracer = get_tracer()
+        responses, done_reasons = [], []
+        usage = Usage()
+        for result in results:
+            if not result.ok:
+                print(f"Batch request {result.index} failed: {result.error}")
+                responses.append("")
+                done_reasons.append("timeout" if result.timed_out else "error")
+            else:
+                response, item_usage, done_reason = result.value
+                responses.append(response)
+                usage += item_usage
+                done_reasons.append(done_reason)
+            if tracer.enabled:
+                # Jobs ran in executor threads; record them under the caller's span
+                start_ns = int(result.started_at * 1e9)
+                tracer.record_span(
+                    "worker.job",
+                    start_ns,
+                    start_ns + int(result.latency * 1e9),
+                    index=result.index,
+                    done_reason=done_reasons[-1],
+                    prompt_tokens=item_usage.prompt_tokens if result.ok else 0,
+                    completion_tokens=item_usage.completion_tokens if result.ok else 0,
+                )
+        return ChatResult(
+            responses, usage, done_reasons, latency=time.perf_counter() - start
         )
-    
-    def __radd__(self, other):
-        """Support sum() function on lists of Usage objects."""
-        if other == 0:
-            return self
-        return self.__add__(other)
 
+    def _chat_one(
+        self, conversation: Union[List[Dict[str, Any]], Dict[str, Any]], **kwargs
+    ) -> Tuple[str, Usage, str]:
+        if isinstance(conversation, dict):
+            conversation = [conversation]
+        return _single_result(self.chat(conversation, **kwargs))
 
-class BaseClient:
+
+def chat_batch(
+    client: Any,
+    conversations: Sequence[Union[List[Dict[str, Any]], Dict[str, Any]]],
+    batch_size: Optional[int] = None,
+    timeout: Optional[float] = None,
+    **kwargs,
+) -> ChatResult:
+    """
+    Run independent conversations on any client, batched where it supports it.
+
+    Returns:
+        A ChatResult with one response per conversation, in input order
+    """
+    if not hasattr(client, "chat_batch"):
+        client = _BatchAdapter(client)
+    return client.chat_batch(
+        conversations, batch_size=batch_size, timeout=timeout, **kwargs
+    )
+
+
+class _BatchAdapter(BatchChatMixin):
+    def __init__(self, client: Any):
+        self.chat = client.chat
+
+
+class BaseClient(BatchChatMixin):
     """
     Base class for all LLM clients.
-    
-    This class defines the interface that all LLM clients should implement.
+
+    Subclasses implement `chat`, returning a ChatResult; `achat`, `stream` and
+    `chat_batch` are built on it here, and clients with a native async API
+    override `achat`.
     """
-    
+
+    supports_response_format: bool = False
+
     def __init__(self, model_name: str = None, temperature: float = 0.0):
         """
         Initialize the client.
-        
+
         Args:
             model_name: Name of the model to use
             temperature: Temperature for generation (0.0 to 1.0)
         """
         self.model_name = model_name
         self.temperature = temperature
-        self.supports_response_format = False
-    
+
     def chat(
         self,
         messages: Union[List[Dict[str, Any]], Dict[str, Any]],
         **kwargs
-    ) -> Tuple[List[str], Usage, List[str]]:
+    ) -> ChatResult:
         """
         Process a chat request with the model.
-        
+
         Args:
             messages: A list of message dictionaries or a single message dictionary
             **kwargs: Additional arguments to pass to the underlying API
                 - stream_callback: Optional function to call with each chunk of streamed output
-            
+
         Returns:
-            A tuple of (responses, usage, completion_reasons)
+            A ChatResult
         """
-        raise NotImplementedError("Subclasses must implement chat()") 
\ No newline at end of file
+        raise NotImplementedError("Subclasses must implement chat()")
+
+    async def achat(
+        self,
+        messages: Union[List[Dict[str, Any]], Dict[str, Any]],
+        **kwargs
+    ) -> ChatResult:
+        """Asynchronous variant of `chat`; runs it in a worker thread by default."""
+        return await asyncio.to_thread(self.chat, messages, **kwargs)
+
+    def stream(
+        self,
+        messages: Union[List[Dict[str, Any]], Dict[str, Any]],
+        **kwargs
+    ) -> Generator[str, None, ChatResult]:
+        """
+        Yield the response text as it is generated.
+
+        The generator's return value (``result = yield from client.stream(...)``)
+        is the call's ChatResult. Clients that do not stream yield the whole
+        response once it is complete.
+        """
+        chunks: "queue.Queue[Any]" = queue.Queue()
+        done = object()
+        outcome: Dict[str, Any] = {}
+
+        def run() -> None:
+            try:
+                outcome["result"] = self.chat(
+                    messages, stream_callback=chunks.put, **kwargs
+                )
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                chunks.put(done)
+
+        threading.Thread(target=run, daemon=True).start()
+        streamed = False
+        while True:
+            chunk = chunks.get()
+            if chunk is done:
+                break
+            if not chunk:
+                continue
+            streamed = True
+            yield chunk
+
+        if "error" in outcome:
+            raise outcome["error"]
+        result = outcome["result"]
+        if not streamed and result.responses:
+            yield result.responses[0]
+        return result
@@ -0,0 +1,139 @@
+import logging
+from typing import Any, Dict, List, Optional, Union
+
+from minions.clients.base import ChatResult, achat
+from minions.usage import Usage
+from minions.utils.cache import ResponseCache
+
+
+class CachedClient:
+    """Wraps any client in `minions.clients` and replays identical requests from disk.
+
+    The cache key covers the model, the messages, the temperature and every other
+    option that influences generation (client settings such as ``max_tokens`` plus
+    the per-call kwargs). By default only deterministic (temperature 0) calls are
+    replayed; sampled calls go straight to the wrapped client.
+
+    Hits and misses are reported through ``Usage.cache_hits`` / ``Usage.cache_misses``,
+    and replayed results have ``ChatResult.cached`` set. A cache hit carries no
+    token counts since nothing was sent to the model.
+    """
+
+    # Client attributes that change the generated output
+    OPTION_ATTRIBUTES = ("max_tokens", "num_ctx", "format_structured_output")
+
+    def __init__(
+        self,
+        client,
+        cache: Optional[ResponseCache] = None,
+        cache_nonzero_temperature: bool = False,
+    ):
+        """
+        Initialize the cached client.
+
+        Args:
+            client: The client to wrap (e.g. OllamaClient, OpenAIClient)
+            cache: ResponseCache to use (default: the shared on-disk cache)
+            cache_nonzero_temperature: Also replay calls sampled with temperature > 0
+        """
+        self.client = client
+        self.cache = cache or ResponseCache()
+        self.cache_nonzero_temperature = cache_nonzero_temperature
+        self.logger = logging.getLogger("CachedClient")
+        self.logger.setLevel(logging.INFO)
+
+    def __getattr__(self, name: str) -> Any:
+        # Everything else (model_name, supports_response_format, ...) comes from the wrapped client
+        if name == "client":
+            # Not set yet (copy, unpickling, failed __init__); don't recurse
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def _cache_key(
+        self, messages: Union[List[Dict[str, Any]], Dict[str, Any]], kwargs: Dict[str, Any]
+    ) -> Optional[str]:
+        """Return the cache key for a request, or None if it should not be cached."""
+        options = {k: v for k, v in kwargs.items() if k != "stream_callback"}
+        temperature = options.pop("temperature", getattr(self.client, "temperature", None))
+        if temperature and not self.cache_nonzero_temperature:
+            return None
+
+        for attr in self.OPTION_ATTRIBUTES:
+            value = getattr(self.client, attr, None)
+            if value is not None:
+                options.setdefault(f"client.{attr}", value)
+
+        return ResponseCache.make_key(
+            model=getattr(self.client, "model_name", None),
+            messages=messages,
+            temperature=temperature,
+            options={"client": type(self.client).__name__, **options},
+        )
+
+    def _replay(self, cached: Dict[str, Any], stream_callback=None) -> ChatResult:
+        responses = cached["responses"]
+        if stream_callback:
+            for response in responses:
+                stream_callback(response)
+        done_reasons = cached.get("done_reasons")
+        if isinstance(done_reasons, str):
+            # Entries written before every client returned a list
+            done_reasons = [done_reasons] * len(responses)
+        return ChatResult(responses, Usage(cache_hits=1), done_reasons, cached=True)
+
+    def _store(self, key: str, result: Any) -> ChatResult:
+        result = ChatResult.of(result)
+        try:
+            self.cache.put(
+                key,
+                {
+                    "responses": list(result.responses),
+                    "done_reasons": list(result.done_reasons),
+                },
+            )
+        except Exception as e:
+            # A broken cache must never break the request itself
+            self.logger.error(f"Error writing to response cache: {e}")
+        result.usage = (result.usage or Usage()) + Usage(cache_misses=1)
+        return result
+
+    def chat(self, messages: Union[List[Dict[str, Any]], Dict[str, Any]], **kwargs) -> ChatResult:
+        """
+        Handle chat completions, serving repeated deterministic requests from the cache.
+
+        Returns:
+            A ChatResult
+        """
+        key = self._cache_key(messages, kwargs)
+        if key is None:
+            return self.client.chat(messages, **kwargs)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._replay(cached, kwargs.get("stream_callback"))
+
+        return self._store(key, self.client.chat(messages, **kwargs))
+
+    async def achat(self, messages: Union[List[Dict[str, Any]], Dict[str, Any]], **kwargs) -> ChatResult:
+        """Asynchronous variant of `chat` for clients that implement ``achat``."""
+        key = self._cache_key(messages, kwargs)
+        if key is None:
+            return await self.client.achat(messages, **kwargs)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._replay(cached, kwargs.get("stream_callback"))
+
+        return self._store(key, await self.client.achat(messages, **kwargs))
+
+    async def aschat(self, messages: Union[List[Dict[str, Any]], Dict[str, Any]], **kwargs) -> ChatResult:
+        """Await a single conversation on the wrapped client, see `minions.clients.base.achat`."""
+        key = self._cache_key(messages, kwargs)
+        if key is None:
+            return await achat(self.client, messages, **kwargs)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._replay(cached, kwargs.get("stream_callback"))
+
+        return self._store(key, await achat(self.client, messages, **kwargs))
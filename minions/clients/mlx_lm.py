@@ -1,11 +1,13 @@
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+import time
+from typing import Any, Dict, List, Optional
 
 
+from minions.clients.base import BaseClient, ChatResult
 from minions.usage import Usage
 
 
-class MLXLMClient:
+class MLXLMClient(BaseClient):
     def __init__(
         self,
         model_name: str = "mlx-community/Llama-3.2-3B-Instruct",
@@ -34,7 +36,7 @@ class MLXLMClient:
         self.model, self.tokenizer = load(path_or_hf_repo=model_name)
         self.logger.info(f"Model {model_name} loaded successfully")
 
-    def chat(self, messages: List[Dict[str, Any]], **kwargs) -> Tuple[List[str], Usage]:
+    def chat(self, messages: List[Dict[str, Any]], **kwargs) -> ChatResult:
         """
         Handle chat completions using the MLX LM client.
 
@@ -43,7 +45,7 @@ class MLXLMClient:
             **kwargs: Additional arguments to pass to generate function
 
         Returns:
-            Tuple of (List[str], Usage) containing response strings and token usage
+            ChatResult with the response string and token usage
         """
         assert len(messages) > 0, "Messages cannot be empty."
 
@@ -63,6 +65,7 @@ class MLXLMClient:
                 **kwargs,
             }
 
+            start = time.perf_counter()
             response = generate(**params)
 
             # Since MLX LM doesn't provide token usage information directly,
@@ -75,7 +78,9 @@ class MLXLMClient:
                 completion_tokens=completion_tokens,
             )
 
-            return [response], usage, "END_OF_TEXT"
+            return ChatResult(
+                [response], usage, ["END_OF_TEXT"], latency=time.perf_counter() - start
+            )
 
         except Exception as e:
             self.logger.error(f"Error during MLX LM generation: {e}")
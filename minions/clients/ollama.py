@@ -2,13 +2,24 @@ import logging
 from typing import Any, Dict, List, Optional, Union, Tuple
 import asyncio
 import functools
+import os
+import threading
+import time
+from concurrent import futures
 
 from pydantic import BaseModel
 
-from minions.clients.base import Usage
+from minions.clients.base import BaseClient, ChatResult, Usage
+from minions.clients.pool import get_connection_pool
+from minions.clients.warmup import KeepAlive, ModelLoad, get_model_warmer, keep_alive_from_env
+from minions.usage import GenerationMetrics
+from minions.utils.token_budget import get_token_counter
 
 
-class OllamaClient:
+class OllamaClient(BaseClient):
+    # One request per parallel slot of the server
+    batch_size = int(os.environ.get("OLLAMA_NUM_PARALLEL") or 4)
+
     def __init__(
         self,
         model_name: str = None,
@@ -17,44 +28,93 @@ class OllamaClient:
         num_ctx: int = 4096,
         structured_output_schema: Optional[BaseModel] = None,
         use_async: bool = False,
+        host: Optional[str] = None,
+        auto_num_ctx: bool = True,
+        max_num_ctx: int = 32768,
+        keep_alive: KeepAlive = None,
+        preload: bool = True,
     ):
-        """Initialize Ollama Client."""
+        """Initialize Ollama Client.
+
+        ``num_ctx`` is the context window sent with every request. With
+        ``auto_num_ctx`` it is the starting size, doubled (up to ``max_num_ctx``)
+        whenever a prompt plus ``max_tokens`` would not fit; it never shrinks,
+        since every change makes Ollama reload the model.
+
+        With ``preload`` the model is pulled if missing and loaded on a
+        background thread (see `wait_until_loaded`), so clients for several
+        models load concurrently; the first request waits for the load.
+        ``keep_alive`` (seconds, or a duration such as "30m"; -1 keeps the
+        model loaded) is sent with every request, since Ollama resets the
+        model's expiry to its default on any request without one. It defaults
+        to MINIONS_OLLAMA_KEEP_ALIVE, or the server's default.
+        """
         self.model_name = model_name
+        self.host = host
         self.logger = logging.getLogger("OllamaClient")
         self.logger.setLevel(logging.INFO)
 
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.num_ctx = num_ctx
+        self.auto_num_ctx = auto_num_ctx
+        self.max_num_ctx = max(max_num_ctx, num_ctx)
         self.use_async = use_async
+        self.keep_alive = keep_alive if keep_alive is not None else keep_alive_from_env()
+
+        # Prompt token estimates, calibrated per model from prompt_eval_count
+        self.token_counter = get_token_counter(model_name)
+        # Requests whose prompt did not fit the context window
+        self.truncation_events: List[Dict[str, Any]] = []
+        self._num_ctx_lock = threading.Lock()
 
         # If we want structured schema output:
         self.format_structured_output = None
         if structured_output_schema:
             self.format_structured_output = structured_output_schema.model_json_schema()
 
-        # For async calls - lazy initialized
-        self._async_client = None
-        
         # Cache for model availability check
         self._model_available = False
 
-        # Ensure model is pulled
-        self._ensure_model_available()
+        # Timing of the most recent call, see GenerationMetrics
+        self.last_metrics: Optional[GenerationMetrics] = None
+
+        # Background pull and load of the model, see wait_until_loaded
+        self.warmup: Optional["futures.Future[ModelLoad]"] = None
+        if preload:
+            self.warmup = get_model_warmer().preload(
+                self.model_name, self.host, keep_alive=self.keep_alive, num_ctx=self.num_ctx
+            )
+        else:
+            # Ensure model is pulled
+            self._ensure_model_available()
+
+    @property
+    def client(self):
+        """Pooled ollama.Client, shared by every instance talking to the same host."""
+        import ollama
+        return get_connection_pool().get_client(
+            (ollama.Client, self.host),
+            lambda: ollama.Client(host=self.host, limits=get_connection_pool().limits),
+        )
 
     @property
     def async_client(self):
-        """Lazy initialization of async client."""
-        if self._async_client is None and self.use_async:
-            from ollama import AsyncClient
-            self._async_client = AsyncClient()
-        return self._async_client
+        """Pooled ollama.AsyncClient for the running event loop."""
+        from ollama import AsyncClient
+        return get_connection_pool().get_async_client(
+            (AsyncClient, self.host),
+            lambda: AsyncClient(host=self.host, limits=get_connection_pool().limits),
+        )
 
     @functools.lru_cache(maxsize=1)
     def _prepare_options(self) -> Dict[str, Any]:
         """Prepare options for Ollama API call with caching."""
         options = {}
-        
+
+        if self.keep_alive is not None:
+            options["keep_alive"] = self.keep_alive
+
         if self.format_structured_output:
             options["format"] = "json"
             options["system"] = (
@@ -65,52 +125,130 @@ class OllamaClient:
         return options
 
     def _ensure_model_available(self) -> None:
-        """Ensure the specified model is available locally."""
+        """Ensure the specified model is available locally, without loading it."""
         if self._model_available:
             return
-            
-        import ollama
-        try:
-            # Use a quick, minimal test to check if model is available
-            ollama.chat(
-                model=self.model_name,
-                messages=[{"role": "system", "content": "test"}]
+        get_model_warmer().ensure_available(self.model_name, self.host)
+        self._model_available = True
+
+    def wait_until_loaded(self, timeout: Optional[float] = None) -> Optional[ModelLoad]:
+        """
+        Block until the background load started by ``preload`` has finished.
+
+        Returns:
+            The load's timings (load time is reported here, not as request
+            latency), or None if the client was created with ``preload=False``
+
+        Raises:
+            The error of the load, if it failed
+        """
+        if self.warmup is None:
+            return None
+        return self.warmup.result(timeout)
+
+    @property
+    def load_time(self) -> Optional[float]:
+        """Seconds the background load took, None while it runs or if it failed."""
+        if self.warmup is None or not self.warmup.done() or self.warmup.exception():
+            return None
+        return self.warmup.result().load_time
+
+    def _wait_for_warmup(self) -> None:
+        # Errors of the load are left for the request itself to report
+        if self.warmup is not None and not self.warmup.done():
+            futures.wait([self.warmup])
+
+    async def _await_warmup(self) -> None:
+        if self.warmup is not None and not self.warmup.done():
+            await asyncio.wait([asyncio.wrap_future(self.warmup)])
+
+    @property
+    def max_prompt_tokens(self) -> int:
+        """Largest prompt that fits the context window next to ``max_tokens`` of output."""
+        window = self.max_num_ctx if self.auto_num_ctx else self.num_ctx
+        return window - self.max_tokens
+
+    def _with_context_window(
+        self, messages: List[Dict[str, Any]], request_kwargs: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], int]:
+        """
+        Add ``options.num_ctx`` sized for ``messages`` to the request.
+
+        Returns:
+            The request kwargs and the raw prompt token estimate (for calibration)
+        """
+        raw_estimate = self.token_counter.raw_count_messages(messages)
+        prompt_tokens = self.token_counter.count_messages(messages)
+        needed = prompt_tokens + self.max_tokens
+
+        if self.auto_num_ctx:
+            with self._num_ctx_lock:
+                while self.num_ctx < needed and self.num_ctx < self.max_num_ctx:
+                    self.num_ctx = min(self.num_ctx * 2, self.max_num_ctx)
+
+        if needed > self.num_ctx:
+            event = {
+                "model": self.model_name,
+                "prompt_tokens": prompt_tokens,
+                "max_tokens": self.max_tokens,
+                "num_ctx": self.num_ctx,
+            }
+            self.truncation_events.append(event)
+            self.logger.warning(
+                f"Prompt of ~{prompt_tokens} tokens plus {self.max_tokens} output tokens "
+                f"exceeds num_ctx={self.num_ctx}; the server will truncate it"
             )
-            self._model_available = True
-        except ollama.ResponseError as e:
-            if "no model found with name" in str(e).lower():
-                self.logger.info(f"Model {self.model_name} not found. Attempting to pull...")
-                try:
-                    ollama.pull(self.model_name)
-                    self._model_available = True
-                    self.logger.info(f"Successfully pulled model {self.model_name}")
-                except Exception as pull_error:
-                    self.logger.error(f"Failed to pull model {self.model_name}: {pull_error}")
-                    raise
-            else:
-                self.logger.error(f"Error checking model availability: {e}")
-                raise
+
+        options = dict(request_kwargs.get("options") or {})
+        options.setdefault("num_ctx", self.num_ctx)
+        return {**request_kwargs, "options": options}, raw_estimate
+
+    def _record_metrics(
+        self,
+        response: Any,
+        time_to_first_token: Optional[float] = None,
+        raw_prompt_estimate: Optional[int] = None,
+    ) -> GenerationMetrics:
+        """
+        Read token counts and timings from a final (``done``) Ollama response or stream chunk.
+
+        Ollama reports durations in nanoseconds. With ``raw_prompt_estimate`` the
+        reported prompt token count also calibrates the token counter.
+        """
+        response = response or {}
+        if raw_prompt_estimate:
+            self.token_counter.observe(
+                raw_prompt_estimate, response.get("prompt_eval_count") or 0
+            )
+        metrics = GenerationMetrics(
+            prompt_tokens=response.get("prompt_eval_count") or 0,
+            completion_tokens=response.get("eval_count") or 0,
+            total_duration=(response.get("total_duration") or 0) / 1e9,
+            load_duration=(response.get("load_duration") or 0) / 1e9,
+            prompt_eval_duration=(response.get("prompt_eval_duration") or 0) / 1e9,
+            eval_duration=(response.get("eval_duration") or 0) / 1e9,
+            time_to_first_token=time_to_first_token,
+        )
+        self.last_metrics = metrics
+        return metrics
 
     async def _achat_internal(
         self,
         messages: Union[List[Dict[str, Any]], Dict[str, Any]],
         **kwargs,
-    ) -> Tuple[List[str], Usage, List[str]]:
+    ) -> ChatResult:
         """
         Internal async chat implementation. Takes a list of messages and returns responses.
         """
         # Import here to avoid importing if not needed
         import asyncio
         
-        # Make sure we have the async client
-        if not self.async_client:
-            from ollama import AsyncClient
-            self._async_client = AsyncClient()
-            
         # If the user provided a single dictionary, wrap it
         if isinstance(messages, dict):
             messages = [messages]
 
+        await self._await_warmup()
+
         chat_kwargs = self._prepare_options()
         
         # Filter out temperature from kwargs as it's not supported by ollama.chat()
@@ -121,17 +259,15 @@ class OllamaClient:
 
         async def process_one(msg):
             try:
+                request_kwargs, raw_estimate = self._with_context_window(msg, chat_kwargs)
                 response = await self.async_client.chat(
                     model=self.model_name,
                     messages=msg,
-                    **chat_kwargs,
+                    **request_kwargs,
                 )
                 return (
                     response["message"]["content"],
-                    Usage(
-                        prompt_tokens=response["prompt_eval_count"],
-                        completion_tokens=response["eval_count"],
-                    ),
+                    self._record_metrics(response, raw_prompt_estimate=raw_estimate).usage,
                     response["done_reason"],
                 )
             except Exception as e:
@@ -139,6 +275,7 @@ class OllamaClient:
                 raise
 
         # Use asyncio.gather for parallel processing if multiple message sets
+        start = time.perf_counter()
         results = await asyncio.gather(*(process_one([m]) for m in messages))
         
         # Unzip the results
@@ -147,13 +284,16 @@ class OllamaClient:
         # Sum up all usages
         total_usage = sum(usages, Usage())
         
-        return list(contents), total_usage, list(done_reasons)
+        return ChatResult(
+            list(contents), total_usage, list(done_reasons),
+            latency=time.perf_counter() - start,
+        )
 
     async def achat(
         self,
         messages: Union[List[Dict[str, Any]], Dict[str, Any]],
         **kwargs,
-    ) -> Tuple[List[str], List[Usage], List[str]]:
+    ) -> ChatResult:
         """
         Handle asynchronous chat completions. If you pass a list of message dicts,
         we do one call for that entire conversation. If you pass a single dict,
@@ -161,19 +301,88 @@ class OllamaClient:
         """
         return await self._achat_internal(messages, **kwargs)
 
+    async def aschat(
+        self,
+        messages: Union[List[Dict[str, Any]], Dict[str, Any]],
+        **kwargs,
+    ) -> ChatResult:
+        """
+        Asynchronous counterpart of `schat`: one conversation, optionally streamed.
+
+        Unlike `achat`, which sends every message as an independent request,
+        this treats ``messages`` as a single chat history.
+        """
+        # If the user provided a single dictionary, wrap it
+        if isinstance(messages, dict):
+            messages = [messages]
+
+        await self._await_warmup()
+
+        chat_kwargs = self._prepare_options()
+
+        # Filter out temperature from kwargs as it's not supported by ollama.chat()
+        filtered_kwargs = {k: v for k, v in kwargs.items() if k != 'temperature'}
+        stream_callback = filtered_kwargs.pop("stream_callback", None)
+
+        try:
+            request_kwargs, raw_estimate = self._with_context_window(
+                messages, {**chat_kwargs, **filtered_kwargs}
+            )
+            start = time.perf_counter()
+            if stream_callback:
+                full_response = ""
+                last_chunk = None
+                time_to_first_token = None
+                async for chunk in await self.async_client.chat(
+                    model=self.model_name,
+                    messages=messages,
+                    stream=True,
+                    **request_kwargs,
+                ):
+                    if "message" in chunk and "content" in chunk["message"]:
+                        content = chunk["message"]["content"]
+                        if content and time_to_first_token is None:
+                            time_to_first_token = time.perf_counter() - start
+                        stream_callback(content)
+                        full_response += content
+                    last_chunk = chunk
+
+                # The final chunk of a stream carries the token counts and timings
+                metrics = self._record_metrics(last_chunk, time_to_first_token, raw_estimate)
+                done_reason = (last_chunk or {}).get("done_reason") or "stop"
+                return ChatResult(
+                    [full_response], metrics.usage, [done_reason],
+                    latency=time.perf_counter() - start, ttft=time_to_first_token,
+                )
+
+            response = await self.async_client.chat(
+                model=self.model_name,
+                messages=messages,
+                **request_kwargs,
+            )
+            usage = self._record_metrics(response, raw_prompt_estimate=raw_estimate).usage
+            return ChatResult(
+                [response["message"]["content"]], usage, [response["done_reason"]],
+                latency=time.perf_counter() - start,
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error during async Ollama API call: {e}")
+            raise
+
     def schat(
         self,
         messages: Union[List[Dict[str, Any]], Dict[str, Any]],
         **kwargs,
-    ) -> Tuple[List[str], Usage, List[str]]:
+    ) -> ChatResult:
         """
         Synchronous implementation of chat. Takes a list of messages and returns responses.
         """
-        import ollama
-        
         # If the user provided a single dictionary, wrap it
         if isinstance(messages, dict):
             messages = [messages]
+
+        self._wait_for_warmup()
         
         # Add options from self._prepare_options
         chat_kwargs = self._prepare_options()
@@ -184,73 +393,86 @@ class OllamaClient:
         responses = []
         usage_total = Usage()
         done_reasons = []
+        time_to_first_token = None
         
         try:
             # Extract stream_callback if provided
             stream_callback = filtered_kwargs.pop("stream_callback", None)
+            request_kwargs, raw_estimate = self._with_context_window(
+                messages, {**chat_kwargs, **filtered_kwargs}
+            )
+            start = time.perf_counter()
             
             # If streaming is requested
             if stream_callback:
                 full_response = ""
+                last_chunk = None
                 # Process all messages in a single call for efficiency with streaming
-                for chunk in ollama.chat(
+                for chunk in self.client.chat(
                     model=self.model_name,
                     messages=messages,
                     stream=True,
-                    **chat_kwargs,
-                    **filtered_kwargs,
+                    **request_kwargs,
                 ):
                     if "message" in chunk and "content" in chunk["message"]:
                         content = chunk["message"]["content"]
+                        if content and time_to_first_token is None:
+                            time_to_first_token = time.perf_counter() - start
                         stream_callback(content)
                         full_response += content
+                    last_chunk = chunk
                 
                 # At the end, return the full response
                 responses.append(full_response)
-                # We still need to get usage data, so make one more non-streaming call
-                # but with system-only instruction to avoid generating more content
-                response = ollama.chat(
-                    model=self.model_name,
-                    messages=[{"role": "system", "content": "Usage stats only"}],
-                    **chat_kwargs,
-                )
-                usage_total += Usage(
-                    prompt_tokens=response["prompt_eval_count"],
-                    completion_tokens=response["eval_count"],
-                )
-                done_reasons.append("stop")
+                # The final chunk of a stream carries the token counts and timings
+                usage_total += self._record_metrics(
+                    last_chunk, time_to_first_token, raw_estimate
+                ).usage
+                done_reasons.append((last_chunk or {}).get("done_reason") or "stop")
             else:
                 # Process all messages in a single call for efficiency
-                response = ollama.chat(
+                response = self.client.chat(
                     model=self.model_name,
                     messages=messages,
-                    **chat_kwargs,
-                    **filtered_kwargs,
+                    **request_kwargs,
                 )
                 responses.append(response["message"]["content"])
-                usage_total += Usage(
-                    prompt_tokens=response["prompt_eval_count"],
-                    completion_tokens=response["eval_count"],
-                )
+                usage_total += self._record_metrics(
+                    response, raw_prompt_estimate=raw_estimate
+                ).usage
                 done_reasons.append(response["done_reason"])
                 
         except Exception as e:
             self.logger.error(f"Error during Ollama API call: {e}")
             raise
         
-        return responses, usage_total, done_reasons
+        return ChatResult(
+            responses, usage_total, done_reasons,
+            latency=time.perf_counter() - start, ttft=time_to_first_token,
+        )
     
+    def _chat_one(
+        self, conversation: Union[List[Dict[str, Any]], Dict[str, Any]], **kwargs
+    ) -> Tuple[str, Usage, str]:
+        # Each batch entry is one conversation, whatever use_async says
+        responses, usage, done_reasons = self.schat(conversation, **kwargs)
+        return responses[0], usage, done_reasons[0]
+
     def chat(
         self,
         messages: Union[List[Dict[str, Any]], Dict[str, Any]],
         **kwargs,
-    ) -> Tuple[List[str], Usage, List[str]]:
+    ) -> ChatResult:
         """
         Handle chat completions. Delegates to async or sync implementation based on configuration.
         """
         if self.use_async:
             import asyncio
-            loop = asyncio.get_event_loop()
+            try:
+                loop = asyncio.get_event_loop()
+            except RuntimeError:
+                # Worker threads (e.g. JobExecutor) have no event loop
+                return asyncio.run(self.achat(messages, **kwargs))
             return loop.run_until_complete(self.achat(messages, **kwargs))
         else:
             return self.schat(messages, **kwargs)
@@ -0,0 +1,373 @@
+"""
+Load balancing of local worker requests across several Ollama servers.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import httpx
+
+from minions.clients.base import BaseClient, ChatResult, Usage
+from minions.clients.ollama import OllamaClient
+from minions.clients.warmup import get_model_warmer
+from minions.utils.scheduling import common_prefix_length
+from minions.utils.token_budget import get_token_counter
+
+# Errors raised before a request reached the server, so it can be sent elsewhere
+# (the ollama package turns httpx.ConnectError into ConnectionError)
+_UNREACHABLE = (ConnectionError, httpx.ConnectError, httpx.ConnectTimeout)
+
+
+def _hosts_from_env() -> List[Optional[str]]:
+    hosts = os.environ.get("MINIONS_OLLAMA_HOSTS", "")
+    return [host.strip() for host in hosts.split(",") if host.strip()] or [None]
+
+
+def _with_tag(model_name: Optional[str]) -> Optional[str]:
+    # `ollama ps` lists models with their tag
+    if model_name and ":" not in model_name:
+        return f"{model_name}:latest"
+    return model_name
+
+
+def _prompt_text(messages: Union[List[Dict[str, Any]], Dict[str, Any]]) -> str:
+    if isinstance(messages, dict):
+        messages = [messages]
+    return "\n".join(
+        f"{message.get('role', '')}: {message.get('content', '')}" for message in messages
+    )
+
+
+class _Endpoint:
+    """One Ollama server of the pool and what the router knows about it."""
+
+    def __init__(self, host: Optional[str], window: int):
+        self.host = host
+        self.client: Optional[OllamaClient] = None
+        # None until the first health check
+        self.healthy: Optional[bool] = None
+        self.warm = False
+        self.outstanding = 0
+        self.requests = 0
+        self.errors = 0
+        self.sticky_hits = 0
+        # Recent prompts, to route requests sharing a prefix to the same KV cache
+        self.recent: deque = deque(maxlen=window)
+
+    @property
+    def name(self) -> str:
+        return self.host or "default"
+
+    def prefix_match(self, prompt: str) -> int:
+        return max((common_prefix_length(prompt, seen) for seen in self.recent), default=0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "healthy": self.healthy,
+            "warm": self.warm,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "errors": self.errors,
+            "sticky_hits": self.sticky_hits,
+        }
+
+
+class OllamaPoolClient(BaseClient):
+    """
+    Spreads local model requests over several Ollama servers (machines or ports).
+
+    Each request goes to the healthy server with the fewest requests in flight
+    per parallel slot, with servers that do not have the model loaded counted
+    as fully busy. A request whose prompt shares a long prefix with one a
+    server handled recently (e.g. another job on the same chunk, or the next
+    turn of a conversation) is sent to that server instead, so its KV cache is
+    reused, unless that would leave it more than ``balance_threshold`` slots
+    busier than the least loaded server. Servers are health checked in the
+    background, and a request to a server that cannot be reached is retried
+    on the others.
+
+    Hosts default to the comma-separated MINIONS_OLLAMA_HOSTS, or the default
+    Ollama host. Works as the ``local_client`` of Minion and Minions; the
+    ``batch_size`` of the pool is the number of slots of all its servers.
+    """
+
+    def __init__(
+        self,
+        model_name: str = None,
+        hosts: Optional[Sequence[Optional[str]]] = None,
+        slots_per_host: Optional[int] = None,
+        health_check_interval: float = 15.0,
+        sticky_min_prefix: int = 256,
+        balance_threshold: float = 1.0,
+        sticky_window: int = 64,
+        max_prefix_chars: int = 16384,
+        **client_kwargs,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            model_name: Ollama model served by every host
+            hosts: Ollama hosts, e.g. ["http://gpu1:11434", "http://gpu2:11434"]
+            slots_per_host: Parallel requests per host (default: OLLAMA_NUM_PARALLEL or 4)
+            health_check_interval: Seconds between background health checks
+            sticky_min_prefix: Characters of prefix a host must share with a prompt,
+                beyond what the least loaded host shares, to route it there
+            balance_threshold: How many slots busier than the least loaded
+                host a sticky host may be
+            sticky_window: Recent prompts remembered per host
+            max_prefix_chars: Characters of each prompt remembered
+            **client_kwargs: Passed to each host's OllamaClient
+        """
+        self.model_name = model_name
+        self.temperature = client_kwargs.get("temperature", 0.0)
+        self.logger = logging.getLogger("OllamaPoolClient")
+        self.logger.setLevel(logging.INFO)
+
+        self.client_kwargs = client_kwargs
+        self.slots_per_host = slots_per_host or OllamaClient.batch_size
+        self.health_check_interval = health_check_interval
+        self.sticky_min_prefix = sticky_min_prefix
+        self.balance_threshold = balance_threshold
+        self.max_prefix_chars = max_prefix_chars
+        self.endpoints = [
+            _Endpoint(host, sticky_window) for host in (hosts or _hosts_from_env())
+        ]
+        self.batch_size = self.slots_per_host * len(self.endpoints)
+        self.token_counter = get_token_counter(model_name)
+
+        self._lock = threading.Lock()
+        self._checking = False
+        self._last_check = 0.0
+
+        self.check_health()
+        if not any(endpoint.healthy for endpoint in self.endpoints):
+            raise RuntimeError(
+                f"None of the Ollama hosts {[e.name for e in self.endpoints]} is reachable"
+            )
+
+    # ------------------------------------------------------------------
+    # Health
+    # ------------------------------------------------------------------
+
+    def _check_endpoint(self, endpoint: _Endpoint) -> None:
+        try:
+            loaded = get_model_warmer().client(endpoint.host).ps().models
+            if endpoint.client is None:
+                # Pulls and loads the model in the background; the host turns
+                # warm once that is done
+                endpoint.client = OllamaClient(
+                    model_name=self.model_name, host=endpoint.host, **self.client_kwargs
+                )
+            endpoint.warm = any(
+                _with_tag(self.model_name) in (model.model, model.name) for model in loaded
+            )
+            endpoint.healthy = True
+        except Exception as e:
+            if endpoint.healthy is not False:
+                self.logger.warning(f"Ollama host {endpoint.name} is unavailable: {e}")
+            endpoint.healthy = False
+            endpoint.warm = False
+
+    def check_health(self) -> Dict[str, Dict[str, Any]]:
+        """Probe every host now; returns `stats`."""
+        threads = [
+            threading.Thread(target=self._check_endpoint, args=(endpoint,), daemon=True)
+            for endpoint in self.endpoints
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self._last_check = time.monotonic()
+        return self.stats()
+
+    def _background_check(self) -> None:
+        try:
+            self.check_health()
+        finally:
+            self._checking = False
+
+    def _maybe_check_health(self) -> None:
+        # Called with the lock held
+        if self._checking or time.monotonic() - self._last_check < self.health_check_interval:
+            return
+        self._checking = True
+        threading.Thread(target=self._background_check, daemon=True).start()
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def _load(self, endpoint: _Endpoint) -> float:
+        return endpoint.outstanding / self.slots_per_host + (0.0 if endpoint.warm else 1.0)
+
+    def _acquire(self, prompt: str, exclude: Sequence[_Endpoint] = ()) -> _Endpoint:
+        """Choose the host for ``prompt`` and count the request against it."""
+        with self._lock:
+            self._maybe_check_health()
+            candidates = [
+                e for e in self.endpoints
+                if e.healthy and e.client is not None and e not in exclude
+            ]
+            if not candidates:
+                # Nothing known healthy: try hosts that were reachable once
+                candidates = [
+                    e for e in self.endpoints if e.client is not None and e not in exclude
+                ]
+            if not candidates:
+                raise ConnectionError("No Ollama host of the pool is reachable")
+
+            least = min(candidates, key=self._load)
+            chosen = least
+            if len(candidates) > 1:
+                matches = {id(e): e.prefix_match(prompt) for e in candidates}
+                sticky = max(candidates, key=lambda e: matches[id(e)])
+                if (
+                    sticky is not least
+                    and matches[id(sticky)] - matches[id(least)] >= self.sticky_min_prefix
+                    and self._load(sticky) - self._load(least) <= self.balance_threshold
+                ):
+                    chosen = sticky
+                    chosen.sticky_hits += 1
+
+            chosen.outstanding += 1
+            chosen.requests += 1
+            chosen.recent.append(prompt[: self.max_prefix_chars])
+            return chosen
+
+    def _release(self, endpoint: _Endpoint, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            endpoint.outstanding -= 1
+            if error is None:
+                # A request just ran, so the model is loaded there
+                endpoint.warm = True
+                return
+            endpoint.errors += 1
+            if isinstance(error, (ConnectionError, httpx.TransportError)):
+                endpoint.healthy = False
+                endpoint.warm = False
+                endpoint.recent.clear()
+
+    def _route(self, messages, call: Callable[[OllamaClient], Any]) -> Any:
+        prompt = _prompt_text(messages)
+        tried: List[_Endpoint] = []
+        while True:
+            endpoint = self._acquire(prompt, exclude=tried)
+            try:
+                result = call(endpoint.client)
+            except BaseException as e:
+                self._release(endpoint, e)
+                if not isinstance(e, _UNREACHABLE) or len(tried) + 1 >= len(self.endpoints):
+                    raise
+                self.logger.warning(f"Ollama host {endpoint.name} unreachable; retrying elsewhere")
+                tried.append(endpoint)
+                continue
+            self._release(endpoint)
+            return result
+
+    async def _aroute(self, messages, call: Callable[[OllamaClient], Any]) -> Any:
+        prompt = _prompt_text(messages)
+        tried: List[_Endpoint] = []
+        while True:
+            endpoint = self._acquire(prompt, exclude=tried)
+            try:
+                result = await call(endpoint.client)
+            except BaseException as e:
+                self._release(endpoint, e)
+                if not isinstance(e, _UNREACHABLE) or len(tried) + 1 >= len(self.endpoints):
+                    raise
+                self.logger.warning(f"Ollama host {endpoint.name} unreachable; retrying elsewhere")
+                tried.append(endpoint)
+                continue
+            self._release(endpoint)
+            return result
+
+    # ------------------------------------------------------------------
+    # Client interface
+    # ------------------------------------------------------------------
+
+    @property
+    def host(self) -> Optional[str]:
+        """A healthy host of the pool, for helpers that need a single server."""
+        for endpoint in self.endpoints:
+            if endpoint.healthy:
+                return endpoint.host
+        return self.endpoints[0].host
+
+    @property
+    def max_prompt_tokens(self) -> int:
+        clients = [e.client for e in self.endpoints if e.client is not None]
+        return min(client.max_prompt_tokens for client in clients)
+
+    @property
+    def truncation_events(self) -> List[Dict[str, Any]]:
+        return [
+            event
+            for endpoint in self.endpoints
+            if endpoint.client is not None
+            for event in endpoint.client.truncation_events
+        ]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host health, load and routing counts."""
+        return {endpoint.name: endpoint.to_dict() for endpoint in self.endpoints}
+
+    def schat(
+        self,
+        messages: Union[List[Dict[str, Any]], Dict[str, Any]],
+        **kwargs,
+    ) -> ChatResult:
+        """One conversation on the best host; see `OllamaClient.schat`."""
+        return self._route(messages, lambda client: client.schat(messages, **kwargs))
+
+    def chat(
+        self,
+        messages: Union[List[Dict[str, Any]], Dict[str, Any]],
+        **kwargs,
+    ) -> ChatResult:
+        """One conversation on the best host; see `OllamaClient.chat`."""
+        return self._route(messages, lambda client: client.chat(messages, **kwargs))
+
+    def _chat_one(
+        self, conversation: Union[List[Dict[str, Any]], Dict[str, Any]], **kwargs
+    ) -> Tuple[str, Usage, str]:
+        responses, usage, done_reasons = self.schat(conversation, **kwargs)
+        return responses[0], usage, done_reasons[0]
+
+    async def aschat(
+        self,
+        messages: Union[List[Dict[str, Any]], Dict[str, Any]],
+        **kwargs,
+    ) -> ChatResult:
+        """Asynchronous `schat`; see `OllamaClient.aschat`."""
+        return await self._aroute(
+            messages, lambda client: client.aschat(messages, **kwargs)
+        )
+
+    async def achat(
+        self,
+        messages: Union[List[Dict[str, Any]], Dict[str, Any]],
+        **kwargs,
+    ) -> ChatResult:
+        """
+        Send every message as an independent request, like `OllamaClient.achat`,
+        each routed to its own host.
+        """
+        if isinstance(messages, dict):
+            messages = [messages]
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(self.aschat([message], **kwargs) for message in messages)
+        )
+        return ChatResult(
+            [result.responses[0] for result in results],
+            sum((result.usage for result in results), Usage()),
+            [result.done_reasons[0] for result in results],
+            latency=time.perf_counter() - start,
+        )
@@ -1,13 +1,16 @@
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 import os
+import time
 import openai
 
+from minions.clients.base import BaseClient, ChatResult
+from minions.clients.pool import get_connection_pool
+from minions.clients.rate_limit import estimate_request_tokens, get_rate_limiter
 from minions.usage import Usage
 
 
-# TODO: define one dataclass for what is returned from all the clients
-class OpenAIClient:
+class OpenAIClient(BaseClient):
     def __init__(
         self,
         model_name: str = "gpt-4o",
@@ -27,14 +30,55 @@ class OpenAIClient:
             stream: Whether to stream the response (default: False)
         """
         self.model_name = model_name
-        openai.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.base_url = None
         self.logger = logging.getLogger("OpenAIClient")
         self.logger.setLevel(logging.INFO)
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.stream = stream
+        self.rate_limiter = get_rate_limiter("openai", self.api_key)
 
-    def chat(self, messages: List[Dict[str, Any]], stream_callback=None, **kwargs) -> Tuple[List[str], Usage]:
+    @property
+    def client(self) -> "openai.OpenAI":
+        """Pooled SDK client, shared by every instance with the same key and endpoint."""
+        # Retries are left to the rate limiter, which backs off across callers
+        return get_connection_pool().sdk_client(
+            openai.OpenAI, api_key=self.api_key, base_url=self.base_url, max_retries=0
+        )
+
+    @property
+    def async_client(self) -> "openai.AsyncOpenAI":
+        """Pooled async SDK client for the running event loop."""
+        return get_connection_pool().async_sdk_client(
+            openai.AsyncOpenAI, api_key=self.api_key, base_url=self.base_url, max_retries=0
+        )
+
+    def _build_params(self, messages: List[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+        params = {
+            "model": self.model_name,
+            "messages": messages,
+            "max_completion_tokens": self.max_tokens,
+            "stream": self.stream,
+            **kwargs,
+        }
+
+        # Only add temperature if NOT using the reasoning models (e.g., o3-mini model)
+        if "o1" not in self.model_name and "o3" not in self.model_name:
+            params["temperature"] = self.temperature
+        return params
+
+    @staticmethod
+    def _to_result(response: Any, start: float) -> ChatResult:
+        """ChatResult of a non-streamed completion requested at ``start`` (perf_counter)."""
+        return ChatResult(
+            [choice.message.content for choice in response.choices],
+            Usage.from_openai(response.usage),
+            [choice.finish_reason or "stop" for choice in response.choices],
+            latency=time.perf_counter() - start,
+        )
+
+    def chat(self, messages: List[Dict[str, Any]], stream_callback=None, **kwargs) -> ChatResult:
         """
         Handle chat completions using the OpenAI API.
 
@@ -44,58 +88,101 @@ class OpenAIClient:
             **kwargs: Additional arguments to pass to openai.chat.completions.create
 
         Returns:
-            Tuple of (List[str], Usage) containing response strings and token usage
+            ChatResult with the response strings, token usage and finish reasons
         """
         assert len(messages) > 0, "Messages cannot be empty."
 
         try:
-            params = {
-                "model": self.model_name,
-                "messages": messages,
-                "max_completion_tokens": self.max_tokens,
-                "stream": self.stream,
-                **kwargs,
-            }
-
-            # Only add temperature if NOT using the reasoning models (e.g., o3-mini model)
-            if "o1" not in self.model_name and "o3" not in self.model_name:
-                params["temperature"] = self.temperature
+            params = self._build_params(messages, **kwargs)
+            tokens = estimate_request_tokens(messages, self.max_tokens)
+            start = time.perf_counter()
 
             if self.stream and stream_callback:
                 # Handle streaming response
                 response_content = ""
-                prompt_tokens = 0
-                completion_tokens = 0
+                usage = Usage()
+                finish_reason = None
+                ttft = None
                 
-                response = openai.chat.completions.create(**params)
+                response = self.rate_limiter.call(
+                    self.client.chat.completions.create, tokens=tokens, **params
+                )
                 for chunk in response:
                     if hasattr(chunk, 'choices') and len(chunk.choices) > 0:
                         delta = chunk.choices[0].delta
                         if hasattr(delta, 'content') and delta.content is not None:
+                            if ttft is None:
+                                ttft = time.perf_counter() - start
                             response_content += delta.content
                             stream_callback(delta.content)
+                        finish_reason = chunk.choices[0].finish_reason or finish_reason
                     
                     # Update token count if available
                     if hasattr(chunk, 'usage') and chunk.usage is not None:
-                        prompt_tokens = getattr(chunk.usage, 'prompt_tokens', 0)
-                        completion_tokens = getattr(chunk.usage, 'completion_tokens', 0)
+                        usage = Usage.from_openai(chunk.usage)
                 
-                # Create usage object with accumulated tokens
-                usage = Usage(
-                    prompt_tokens=prompt_tokens,
-                    completion_tokens=completion_tokens
+                return ChatResult(
+                    [response_content], usage, [finish_reason or "stop"],
+                    latency=time.perf_counter() - start, ttft=ttft,
                 )
-                
-                return [response_content], usage
             else:
                 # Handle non-streaming response
-                response = openai.chat.completions.create(**params)
-                usage = Usage(
-                    prompt_tokens=response.usage.prompt_tokens,
-                    completion_tokens=response.usage.completion_tokens
+                response = self.rate_limiter.call(
+                    self.client.chat.completions.create, tokens=tokens, **params
                 )
-                return [choice.message.content for choice in response.choices], usage
+                return self._to_result(response, start)
                 
         except Exception as e:
             self.logger.error(f"Error during OpenAI API call: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    async def achat(self, messages: List[Dict[str, Any]], stream_callback=None, **kwargs) -> ChatResult:
+        """
+        Asynchronous variant of `chat` built on ``openai.AsyncOpenAI``.
+
+        Returns:
+            ChatResult with the response strings, token usage and finish reasons
+        """
+        assert len(messages) > 0, "Messages cannot be empty."
+
+        try:
+            params = self._build_params(messages, **kwargs)
+            tokens = estimate_request_tokens(messages, self.max_tokens)
+            start = time.perf_counter()
+
+            if self.stream and stream_callback:
+                response_content = ""
+                usage = Usage()
+                finish_reason = None
+                ttft = None
+
+                response = await self.rate_limiter.acall(
+                    self.async_client.chat.completions.create, tokens=tokens, **params
+                )
+                async for chunk in response:
+                    if hasattr(chunk, 'choices') and len(chunk.choices) > 0:
+                        delta = chunk.choices[0].delta
+                        if hasattr(delta, 'content') and delta.content is not None:
+                            if ttft is None:
+                                ttft = time.perf_counter() - start
+                            response_content += delta.content
+                            stream_callback(delta.content)
+                        finish_reason = chunk.choices[0].finish_reason or finish_reason
+
+                    if hasattr(chunk, 'usage') and chunk.usage is not None:
+                        usage = Usage.from_openai(chunk.usage)
+
+                return ChatResult(
+                    [response_content], usage, [finish_reason or "stop"],
+                    latency=time.perf_counter() - start, ttft=ttft,
+                )
+            else:
+                params["stream"] = False
+                response = await self.rate_limiter.acall(
+                    self.async_client.chat.completions.create, tokens=tokens, **params
+                )
+                return self._to_result(response, start)
+
+        except Exception as e:
+            self.logger.error(f"Error during async OpenAI API call: {e}")
+            raise
@@ -1,10 +1,11 @@
 import logging
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional
 import os
-from openai import OpenAI
-from minions.clients.openai import OpenAIClient
+import time
 
-from minions.usage import Usage
+from minions.clients.base import ChatResult
+from minions.clients.openai import OpenAIClient
+from minions.clients.rate_limit import estimate_request_tokens, get_rate_limiter
 
 
 class OpenRouterClient(OpenAIClient):
@@ -38,15 +39,26 @@ class OpenRouterClient(OpenAIClient):
                     "OpenRouter API key not provided and OPENROUTER_API_KEY environment variable not set."
                 )
 
-        # Initialize the OpenAI client with the OpenRouter base URL
-        self.client = OpenAI(api_key=api_key, base_url=base_url)
+        # Route the pooled OpenAI clients to the OpenRouter base URL
+        self.api_key = api_key
+        self.base_url = base_url
         self.model_name = model_name
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.logger = logging.getLogger("OpenRouterClient")
         self.logger.setLevel(logging.INFO)
-
-    def chat(self, messages: List[Dict[str, Any]], **kwargs) -> Tuple[List[str], Usage]:
+        self.rate_limiter = get_rate_limiter("openrouter", self.api_key)
+
+    def _build_params(self, messages: List[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+        return {
+            "model": self.model_name,
+            "messages": messages,
+            "max_completion_tokens": self.max_tokens,
+            **kwargs,
+            "temperature": self.temperature,
+        }
+
+    def chat(self, messages: List[Dict[str, Any]], **kwargs) -> ChatResult:
         """
         Handle chat completions using the OpenAI  client, but route to perplexity
 
@@ -55,32 +67,38 @@ class OpenRouterClient(OpenAIClient):
             **kwargs: Additional arguments to pass to openai.chat.completions.create
 
         Returns:
-            Tuple of (List[str], Usage) containing response strings and token usage
+            ChatResult with the response strings, token usage and finish reasons
         """
         assert len(messages) > 0, "Messages cannot be empty."
 
         # add a system prompt to the top of the messages
 
+        start = time.perf_counter()
         try:
-            params = {
-                "model": self.model_name,
-                "messages": messages,
-                "max_completion_tokens": self.max_tokens,
-                **kwargs,
-            }
-
-            params["temperature"] = self.temperature
-
-            response = self.client.chat.completions.create(**params)
+            response = self.rate_limiter.call(
+                self.client.chat.completions.create,
+                tokens=estimate_request_tokens(messages, self.max_tokens),
+                **self._build_params(messages, **kwargs),
+            )
         except Exception as e:
             self.logger.error(f"Error during OpenRouter API call: {e}")
             raise
 
-        # Extract usage information
-        usage = Usage(
-            prompt_tokens=response.usage.prompt_tokens,
-            completion_tokens=response.usage.completion_tokens,
-        )
+        return self._to_result(response, start)
+
+    async def achat(self, messages: List[Dict[str, Any]], **kwargs) -> ChatResult:
+        """Asynchronous variant of `chat`."""
+        assert len(messages) > 0, "Messages cannot be empty."
+
+        start = time.perf_counter()
+        try:
+            response = await self.rate_limiter.acall(
+                self.async_client.chat.completions.create,
+                tokens=estimate_request_tokens(messages, self.max_tokens),
+                **self._build_params(messages, **kwargs),
+            )
+        except Exception as e:
+            self.logger.error(f"Error during async OpenRouter API call: {e}")
+            raise
 
-        # The content is now nested under message
-        return [choice.message.content for choice in response.choices], usage
+        return self._to_result(response, start)
@@ -1,12 +1,16 @@
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 import os
+import time
 import openai
 
+from minions.clients.base import BaseClient, ChatResult
+from minions.clients.pool import get_connection_pool
+from minions.clients.rate_limit import estimate_request_tokens, get_rate_limiter
 from minions.usage import Usage
 
 
-class PerplexityAIClient:
+class PerplexityAIClient(BaseClient):
     def __init__(
         self,
         model_name: str = "sonar-pro",
@@ -24,17 +28,19 @@ class PerplexityAIClient:
             max_tokens: Maximum number of tokens to generate (default: 4096)
         """
         self.model_name = model_name
-        openai.api_key = api_key or os.getenv("PERPLEXITY_API_KEY")
-        self.api_key = openai.api_key
+        self.api_key = api_key or os.getenv("PERPLEXITY_API_KEY")
         self.logger = logging.getLogger("PerplexityAIClient")
         self.logger.setLevel(logging.INFO)
         self.temperature = temperature
         self.max_tokens = max_tokens
-        self.client = openai.OpenAI(
-            api_key=self.api_key, base_url="https://api.perplexity.ai"
+        # Retries are left to the rate limiter, which backs off across callers
+        self.client = get_connection_pool().sdk_client(
+            openai.OpenAI, api_key=self.api_key, base_url="https://api.perplexity.ai",
+            max_retries=0,
         )
+        self.rate_limiter = get_rate_limiter("perplexity", self.api_key)
 
-    def chat(self, messages: List[Dict[str, Any]], **kwargs) -> Tuple[List[str], Usage]:
+    def chat(self, messages: List[Dict[str, Any]], **kwargs) -> ChatResult:
         """
         Handle chat completions using the OpenAI  client, but route to perplexity
 
@@ -43,7 +49,7 @@ class PerplexityAIClient:
             **kwargs: Additional arguments to pass to openai.chat.completions.create
 
         Returns:
-            Tuple of (List[str], Usage) containing response strings and token usage
+            ChatResult with the response strings, token usage and finish reasons
         """
         assert len(messages) > 0, "Messages cannot be empty."
 
@@ -65,16 +71,23 @@ class PerplexityAIClient:
             }
 
             params["temperature"] = self.temperature
-            response = self.client.chat.completions.create(**params)
+            start = time.perf_counter()
+            response = self.rate_limiter.call(
+                self.client.chat.completions.create,
+                tokens=estimate_request_tokens(messages, self.max_tokens),
+                **params,
+            )
         except Exception as e:
             self.logger.error(f"Error during Sonar API call: {e}")
             raise
 
         # Extract usage information
-        usage = Usage(
-            prompt_tokens=response.usage.prompt_tokens,
-            completion_tokens=response.usage.completion_tokens,
-        )
+        usage = Usage.from_openai(response.usage)
 
         # The content is now nested under message
-        return [choice.message.content for choice in response.choices], usage
+        return ChatResult(
+            [choice.message.content for choice in response.choices],
+            usage,
+            [choice.finish_reason or "stop" for choice in response.choices],
+            latency=time.perf_counter() - start,
+        )
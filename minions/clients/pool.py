@@ -0,0 +1,226 @@
+"""
+Shared, long-lived HTTP connection pools and SDK client objects.
+
+Provider clients draw their SDK objects from here instead of building their own,
+so every request to the same endpoint reuses warm keep-alive connections rather
+than paying DNS, TCP and TLS setup again, and all sockets are closed at exit.
+"""
+
+import asyncio
+import atexit
+import importlib.util
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import httpx
+
+
+def _env_number(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return type(default)(value) if value else default
+
+
+class ConnectionPool:
+    """
+    One synchronous ``httpx.Client`` for the process and one ``httpx.AsyncClient``
+    per event loop, plus memoized SDK objects built on top of them.
+
+    Async clients are tied to the loop they were created on, so they are cached
+    per running loop and dropped once that loop is closed.
+
+    Pool sizes can be tuned through MINIONS_HTTP_MAX_CONNECTIONS,
+    MINIONS_HTTP_MAX_KEEPALIVE and MINIONS_HTTP_KEEPALIVE_EXPIRY. HTTP/2 is used
+    when the ``h2`` package is installed. Functions registered with
+    `add_response_hook` see every response (e.g. to read rate-limit headers).
+
+    Connections belong to the process that opened them: a forked child (such
+    as a code sandbox worker) gets a fresh pool from `get_connection_pool`,
+    and closing the parent's pool from the child is a no-op.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: Optional[bool] = None,
+        timeout: float = 600.0,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            max_connections: Maximum open connections per client (default: 100)
+            max_keepalive_connections: Idle connections kept open (default: 20)
+            keepalive_expiry: Seconds an idle connection is kept open (default: 30)
+            http2: Whether to negotiate HTTP/2 (default: if ``h2`` is installed)
+            timeout: Request timeout in seconds
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections
+            or int(_env_number("MINIONS_HTTP_MAX_CONNECTIONS", 100)),
+            max_keepalive_connections=max_keepalive_connections
+            or int(_env_number("MINIONS_HTTP_MAX_KEEPALIVE", 20)),
+            keepalive_expiry=keepalive_expiry
+            or _env_number("MINIONS_HTTP_KEEPALIVE_EXPIRY", 30.0),
+        )
+        self.http2 = http2 if http2 is not None else importlib.util.find_spec("h2") is not None
+        self.timeout = timeout
+
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._http_client: Optional[httpx.Client] = None
+        self._response_hooks: List[Callable[[httpx.Response], None]] = []
+        self._clients: Dict[Hashable, Any] = {}
+        # id(loop) -> (loop, httpx.AsyncClient, {key: client})
+        self._async_clients: Dict[int, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient, Dict[Hashable, Any]]] = {}
+
+    def httpx_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for SDKs that build their own httpx client (e.g. ollama)."""
+        return {"limits": self.limits, "http2": self.http2, "timeout": self.timeout}
+
+    def add_response_hook(self, hook: Callable[[httpx.Response], None]) -> None:
+        """Call ``hook(response)`` for every response received through the pool."""
+        with self._lock:
+            if hook not in self._response_hooks:
+                self._response_hooks.append(hook)
+
+    def _on_response(self, response: httpx.Response) -> None:
+        for hook in self._response_hooks:
+            try:
+                hook(response)
+            except Exception:
+                # Observers must never break the request
+                pass
+
+    async def _aon_response(self, response: httpx.Response) -> None:
+        self._on_response(response)
+
+    def http_client(self) -> httpx.Client:
+        """The shared synchronous HTTP client."""
+        with self._lock:
+            if self._http_client is None:
+                self._http_client = httpx.Client(
+                    follow_redirects=True,
+                    event_hooks={"response": [self._on_response]},
+                    **self.httpx_kwargs(),
+                )
+            return self._http_client
+
+    def _loop_entry(self) -> Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient, Dict[Hashable, Any]]:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._async_clients.get(id(loop))
+            if entry is None or entry[0] is not loop:
+                # Forget clients whose loops are gone; their connections died with them
+                for loop_id, (other_loop, _, _) in list(self._async_clients.items()):
+                    if other_loop.is_closed():
+                        del self._async_clients[loop_id]
+                entry = (
+                    loop,
+                    httpx.AsyncClient(
+                        follow_redirects=True,
+                        event_hooks={"response": [self._aon_response]},
+                        **self.httpx_kwargs(),
+                    ),
+                    {},
+                )
+                self._async_clients[id(loop)] = entry
+            return entry
+
+    def async_http_client(self) -> httpx.AsyncClient:
+        """The shared asynchronous HTTP client for the running event loop."""
+        return self._loop_entry()[1]
+
+    def get_client(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the client stored under ``key``, creating it with ``factory`` once."""
+        with self._lock:
+            client = self._clients.get(key)
+        if client is None:
+            client = factory()
+            with self._lock:
+                client = self._clients.setdefault(key, client)
+        return client
+
+    def get_async_client(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Like `get_client`, but memoized per running event loop."""
+        clients = self._loop_entry()[2]
+        client = clients.get(key)
+        if client is None:
+            client = clients.setdefault(key, factory())
+        return client
+
+    @staticmethod
+    def _build_sdk_client(cls: type, http_client: Callable[[], Any], kwargs: Dict[str, Any]) -> Any:
+        try:
+            return cls(http_client=http_client(), **kwargs)
+        except TypeError:
+            # SDK built on a different HTTP stack; the shared instance still
+            # keeps its own connection pool alive
+            return cls(**kwargs)
+
+    def sdk_client(self, cls: type, **kwargs) -> Any:
+        """
+        Shared ``cls(**kwargs)`` for SDKs that accept an ``http_client``
+        (openai, anthropic, groq, together).
+        """
+        return self.get_client(
+            (cls, tuple(sorted(kwargs.items()))),
+            lambda: self._build_sdk_client(cls, self.http_client, kwargs),
+        )
+
+    def async_sdk_client(self, cls: type, **kwargs) -> Any:
+        """Asynchronous counterpart of `sdk_client` for the running event loop."""
+        return self.get_async_client(
+            (cls, tuple(sorted(kwargs.items()))),
+            lambda: self._build_sdk_client(cls, self.async_http_client, kwargs),
+        )
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        if os.getpid() != self._pid:
+            # Inherited across a fork; the sockets are still the parent's
+            return
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._async_clients.clear()
+            http_client, self._http_client = self._http_client, None
+
+        # SDK clients that built their own HTTP client (e.g. ollama) close it here
+        for client in clients:
+            close = getattr(client, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception:
+                    pass
+        if http_client is not None:
+            http_client.close()
+
+
+_default_pool: Optional[ConnectionPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # Keep-alive sockets are shared with the parent after a fork, so the child
+    # must not reuse them (the lock may also have been held while forking)
+    global _default_pool, _default_pool_lock
+    _default_pool = None
+    _default_pool_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_connection_pool() -> ConnectionPool:
+    """The process-wide ConnectionPool shared by all clients."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ConnectionPool()
+            atexit.register(_default_pool.close)
+        return _default_pool
@@ -0,0 +1,493 @@
+"""
+Client-side rate limiting and retries for remote providers.
+
+Every provider API key gets a RateLimiter holding a token bucket for requests
+per minute and one for tokens per minute, plus an adaptive concurrency window.
+Requests reserve capacity before they are sent and wait if the buckets are in
+debt, so parallel Minions rounds spread their calls over the quota instead of
+bursting into it. Limits come from MINIONS_<PROVIDER>_RPM / _TPM, and are then
+corrected from the rate-limit headers of every response seen on the shared
+connection pool.
+
+Throttled (429), overloaded and failed (5xx) requests are retried with jittered
+exponential backoff, never sooner than the server's Retry-After. A 429 also
+pauses the whole key and halves its concurrency window, so the other in-flight
+callers back off together rather than piling into the same wall. A process-wide
+governor caps the requests in flight across all providers
+(MINIONS_MAX_CONCURRENT_REQUESTS).
+"""
+
+import asyncio
+import email.utils
+import hashlib
+import logging
+import random
+import re
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from minions.clients.pool import _env_number, get_connection_pool
+
+# Statuses worth retrying: timeouts, conflicts, throttling and server errors
+# (529 is Anthropic's "overloaded")
+RETRY_STATUSES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+
+# (limit, remaining, reset) header names per quota, across providers
+_REQUEST_HEADERS = (
+    ("x-ratelimit-limit-requests", "x-ratelimit-remaining-requests", "x-ratelimit-reset-requests"),
+    ("anthropic-ratelimit-requests-limit", "anthropic-ratelimit-requests-remaining", "anthropic-ratelimit-requests-reset"),
+    ("x-ratelimit-limit", "x-ratelimit-remaining", "x-ratelimit-reset"),
+)
+_TOKEN_HEADERS = (
+    ("x-ratelimit-limit-tokens", "x-ratelimit-remaining-tokens", "x-ratelimit-reset-tokens"),
+    ("anthropic-ratelimit-tokens-limit", "anthropic-ratelimit-tokens-remaining", "anthropic-ratelimit-tokens-reset"),
+    ("x-tokenlimit-limit", "x-tokenlimit-remaining", "x-tokenlimit-reset"),
+)
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def _parse_reset(value: Optional[str]) -> Optional[float]:
+    """Seconds until a quota resets, from "12", "1m30s", "250ms" or an RFC 3339 time."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(n + u for n, u in parts) == value:
+        scale = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+        return sum(float(n) * scale[u] for n, u in parts)
+    try:
+        reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return max(0.0, reset_at.timestamp() - time.time())
+    except ValueError:
+        return None
+
+
+def _parse_retry_after(headers: Any) -> Optional[float]:
+    """Seconds to wait according to Retry-After (or OpenAI's retry-after-ms)."""
+    if headers is None:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _header_int(headers: Any, name: str) -> Optional[int]:
+    value = headers.get(name)
+    try:
+        return int(float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def estimate_request_tokens(messages: List[Dict[str, Any]], max_tokens: int = 0) -> int:
+    """
+    Rough token cost of a request for the tokens-per-minute budget.
+
+    Providers count ``max_tokens`` against the quota when the request is
+    admitted, so it is included; the estimate is corrected from the reported
+    usage once the response arrives.
+    """
+    chars = 0
+    for message in messages:
+        content = message.get("content")
+        chars += len(content) if isinstance(content, str) else len(str(content or ""))
+    return chars // 4 + 4 * len(messages) + (max_tokens or 0)
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations.
+
+    `reserve` always succeeds and returns how long the caller must wait before
+    using what it reserved; the bucket may go into debt, which later callers
+    wait off in turn. This works the same for threads (``time.sleep``) and
+    coroutines (``asyncio.sleep``). A bucket without a rate never waits.
+    """
+
+    def __init__(self, per_minute: Optional[float] = None, capacity: Optional[float] = None):
+        """
+        Initialize the bucket.
+
+        Args:
+            per_minute: Refill rate; None means unlimited until headers set it
+            capacity: Largest burst (default: one minute's worth)
+        """
+        self._lock = threading.Lock()
+        self.rate: Optional[float] = per_minute / 60 if per_minute else None
+        self.capacity: float = capacity or per_minute or 0.0
+        self.level: float = self.capacity
+        self.paused_until = 0.0
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        if self.rate:
+            self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` and return the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(0.0, self.paused_until - now)
+            if self.rate:
+                self.level -= amount
+                if self.level < 0:
+                    wait = max(wait, -self.level / self.rate)
+            return wait
+
+    def refund(self, amount: float) -> None:
+        """Give back ``amount`` (negative to charge more) after the fact."""
+        with self._lock:
+            if self.rate:
+                self.level = min(self.capacity, self.level + amount)
+
+    def pause(self, seconds: float) -> None:
+        """Make every reservation wait at least ``seconds`` from now."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def observe(self, limit: Optional[int], remaining: Optional[int], reset: Optional[float]) -> None:
+        """Correct the bucket from a response's limit / remaining / reset headers."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if limit and not self.rate:
+                # Quotas without a configured rate are taken to be per minute
+                self.rate = limit / 60
+                self.capacity = float(limit)
+                self.level = float(limit)
+            if remaining is not None and self.rate:
+                self.level = min(self.level, float(remaining))
+            if remaining is not None and remaining <= 0 and reset:
+                self.paused_until = max(self.paused_until, now + reset)
+
+
+class ConcurrencyGovernor:
+    """
+    Counting limit on requests in flight, optionally adaptive.
+
+    With ``adaptive`` the limit follows AIMD: it halves whenever the provider
+    throttles and grows by about one request per window of successes, up to
+    ``max_limit``.
+    """
+
+    def __init__(self, max_limit: int, adaptive: bool = False):
+        self.max_limit = max(1, int(max_limit))
+        self.limit = float(self.max_limit)
+        self.adaptive = adaptive
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def try_acquire(self) -> bool:
+        with self._cond:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return True
+            return False
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    async def aacquire(self) -> None:
+        # Polling keeps a cancelled coroutine from leaking a slot
+        delay = 0.005
+        while not self.try_acquire():
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.1)
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+
+    def on_success(self) -> None:
+        if not self.adaptive or self.limit >= self.max_limit:
+            return
+        with self._cond:
+            before = int(self.limit)
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            if int(self.limit) > before:
+                self._cond.notify()
+
+    def on_throttle(self) -> None:
+        if self.adaptive:
+            with self._cond:
+                self.limit = max(1.0, self.limit / 2)
+
+
+_global_governor = ConcurrencyGovernor(int(_env_number("MINIONS_MAX_CONCURRENT_REQUESTS", 64)))
+
+
+def _error_status(error: BaseException) -> Optional[int]:
+    status = getattr(error, "status_code", None) or getattr(error, "http_status", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _is_transient(error: BaseException) -> bool:
+    """Network failures that are worth retrying (SDK connection / timeout errors)."""
+    names = {cls.__name__ for cls in type(error).__mro__}
+    return bool(
+        names & {"APIConnectionError", "APITimeoutError", "TransportError", "TimeoutException"}
+        or isinstance(error, (ConnectionError, TimeoutError))
+    )
+
+
+def _used_tokens(result: Any) -> Optional[int]:
+    """Total tokens reported by an SDK response, if it has usage."""
+    usage = getattr(result, "usage", None)
+    if usage is None:
+        return None
+    total = getattr(usage, "total_tokens", None)
+    if total is None and hasattr(usage, "input_tokens"):
+        total = (usage.input_tokens or 0) + (getattr(usage, "output_tokens", 0) or 0)
+    return total if isinstance(total, int) else None
+
+
+class RateLimiter:
+    """
+    Request and token budgets, concurrency window and retry policy for one
+    provider API key. Shared by every client using that key; get one with
+    `get_rate_limiter`.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        base_delay: float = 0.5,
+        max_delay: float = 60.0,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            provider: Provider name, used in log messages
+            requests_per_minute: Request quota (default: learned from headers)
+            tokens_per_minute: Token quota (default: learned from headers)
+            max_concurrency: Largest concurrency window (default: the global cap)
+            max_retries: Retries per request (default: MINIONS_MAX_RETRIES or 6)
+            base_delay: First backoff step in seconds
+            max_delay: Longest backoff in seconds
+        """
+        self.provider = provider
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.governor = ConcurrencyGovernor(
+            max_concurrency or _global_governor.max_limit, adaptive=True
+        )
+        self.max_retries = (
+            max_retries if max_retries is not None
+            else int(_env_number("MINIONS_MAX_RETRIES", 6))
+        )
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.throttled = 0
+        self.retried = 0
+        self.logger = logging.getLogger("RateLimiter")
+
+    def observe_headers(self, headers: Any, status: Optional[int] = None) -> None:
+        """Update the budgets from a response's rate-limit headers."""
+        for bucket, names in ((self.requests, _REQUEST_HEADERS), (self.tokens, _TOKEN_HEADERS)):
+            for limit_name, remaining_name, reset_name in names:
+                remaining = _header_int(headers, remaining_name)
+                limit = _header_int(headers, limit_name)
+                if remaining is None and limit is None:
+                    continue
+                bucket.observe(limit, remaining, _parse_reset(headers.get(reset_name)))
+                break
+        if status == 429:
+            retry_after = _parse_retry_after(headers)
+            if retry_after:
+                self.requests.pause(retry_after)
+
+    def _wait_time(self, tokens: int) -> float:
+        return max(self.requests.reserve(1), self.tokens.reserve(tokens))
+
+    def _backoff(self, error: BaseException, attempt: int) -> Optional[float]:
+        """Delay before retrying after ``error``, or None if it should be raised."""
+        status = _error_status(error)
+        if attempt >= self.max_retries or not (
+            (status is not None and status in RETRY_STATUSES)
+            or (status is None and _is_transient(error))
+        ):
+            return None
+
+        # Full jitter: spreads the retries of concurrent callers apart
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        retry_after = _parse_retry_after(getattr(getattr(error, "response", None), "headers", None))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if status == 429:
+            self.throttled += 1
+            self.governor.on_throttle()
+            # Everyone using this key waits, not just this request
+            self.requests.pause(delay)
+        self.retried += 1
+        self.logger.warning(
+            f"{self.provider} request failed ({status or type(error).__name__}); "
+            f"retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})"
+        )
+        return delay
+
+    def _settle(self, tokens: int, result: Any) -> None:
+        used = _used_tokens(result)
+        if used is not None:
+            self.tokens.refund(tokens - used)
+        self.governor.on_success()
+
+    @contextmanager
+    def _slot(self):
+        _global_governor.acquire()
+        try:
+            self.governor.acquire()
+            try:
+                yield
+            finally:
+                self.governor.release()
+        finally:
+            _global_governor.release()
+
+    @asynccontextmanager
+    async def _aslot(self):
+        await _global_governor.aacquire()
+        try:
+            await self.governor.aacquire()
+            try:
+                yield
+            finally:
+                self.governor.release()
+        finally:
+            _global_governor.release()
+
+    def call(self, fn: Callable[..., Any], *args, tokens: int = 0, **kwargs) -> Any:
+        """
+        Run ``fn(*args, **kwargs)`` within the budgets, retrying transient failures.
+
+        Args:
+            fn: The SDK call, e.g. ``client.chat.completions.create``
+            tokens: Estimated token cost, see `estimate_request_tokens`
+
+        Returns:
+            Whatever ``fn`` returns
+        """
+        attempt = 0
+        while True:
+            wait = self._wait_time(tokens)
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                with self._slot():
+                    result = fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._backoff(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self._settle(tokens, result)
+            return result
+
+    async def acall(self, fn: Callable[..., Any], *args, tokens: int = 0, **kwargs) -> Any:
+        """Asynchronous variant of `call` for coroutine functions."""
+        attempt = 0
+        while True:
+            wait = self._wait_time(tokens)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                async with self._aslot():
+                    result = await fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._backoff(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self._settle(tokens, result)
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Throttling counters and the current concurrency window."""
+        return {
+            "provider": self.provider,
+            "throttled": self.throttled,
+            "retried": self.retried,
+            "concurrency_limit": int(self.governor.limit),
+            "in_flight": self.governor.in_flight,
+        }
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _fingerprint(api_key: Optional[str]) -> Optional[str]:
+    if not api_key:
+        return None
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+def _observe_response(response: Any) -> None:
+    """Connection-pool hook: route rate-limit headers to the limiter of the request's key."""
+    request_headers = response.request.headers
+    api_key = request_headers.get("x-api-key")
+    if api_key is None:
+        auth = request_headers.get("authorization", "")
+        api_key = auth[7:] if auth.lower().startswith("bearer ") else None
+    limiter = _limiters.get(_fingerprint(api_key))
+    if limiter is not None:
+        limiter.observe_headers(response.headers, response.status_code)
+
+
+def get_rate_limiter(provider: str, api_key: Optional[str] = None) -> RateLimiter:
+    """
+    The RateLimiter shared by all clients of ``provider`` using ``api_key``.
+
+    Quotas default to MINIONS_<PROVIDER>_RPM and MINIONS_<PROVIDER>_TPM when set.
+    """
+    key = _fingerprint(api_key) or provider
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            if not _limiters:
+                get_connection_pool().add_response_hook(_observe_response)
+            env = re.sub(r"\W", "_", provider).upper()
+            limiter = RateLimiter(
+                provider,
+                requests_per_minute=_env_number(f"MINIONS_{env}_RPM", 0.0) or None,
+                tokens_per_minute=_env_number(f"MINIONS_{env}_TPM", 0.0) or None,
+            )
+            _limiters[key] = limiter
+        return limiter
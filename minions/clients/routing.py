@@ -0,0 +1,444 @@
+"""
+Latency-aware routing, hedging and failover across several remote clients.
+"""
+
+import asyncio
+import inspect
+import logging
+import math
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from minions.clients.base import BaseClient, ChatResult, achat
+from minions.utils.tracing import current_span
+
+
+class HedgeCancelled(Exception):
+    """Raised inside a losing attempt's stream to abort it."""
+
+    def __init__(self):
+        super().__init__("hedged request cancelled")
+
+
+class ProviderStats:
+    """
+    Running latency and error statistics of one provider behind a RoutingClient.
+
+    Latency and error rate are exponentially weighted moving averages; the
+    time-to-first-token samples of recent requests set the hedging deadline.
+    """
+
+    def __init__(self, name: str, client: Any, alpha: float = 0.2, window: int = 200):
+        self.name = name
+        self.client = client
+        self.alpha = alpha
+        self.latency_ewma: Optional[float] = None
+        self.error_ewma = 0.0
+        self.ttfts: deque = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.wins = 0
+        self._lock = threading.Lock()
+        try:
+            self.streams = "stream_callback" in inspect.signature(client.chat).parameters
+        except (TypeError, ValueError):
+            self.streams = False
+
+    def record_success(self, latency: float, ttft: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.wins += 1
+            self.ttfts.append(ttft)
+            self.latency_ewma = (
+                latency if self.latency_ewma is None
+                else self.alpha * latency + (1 - self.alpha) * self.latency_ewma
+            )
+            self.error_ewma *= 1 - self.alpha
+
+    def record_error(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self.errors += 1
+            self.error_ewma = self.alpha + (1 - self.alpha) * self.error_ewma
+
+    def record_cancelled(self, elapsed: float) -> None:
+        """
+        Record an attempt that lost to a faster provider after ``elapsed`` seconds.
+
+        Its latency is only known to exceed ``elapsed``, so it can raise the
+        latency estimate but never lower it.
+        """
+        with self._lock:
+            self.requests += 1
+            if self.latency_ewma is None:
+                self.latency_ewma = elapsed
+            elif elapsed > self.latency_ewma:
+                self.latency_ewma = self.alpha * elapsed + (1 - self.alpha) * self.latency_ewma
+
+    @property
+    def score(self) -> float:
+        """Expected seconds per successful request; untried providers score 0."""
+        if self.latency_ewma is None:
+            # Providers that have only ever failed go last
+            return math.inf if self.errors else 0.0
+        return self.latency_ewma / max(1e-3, 1 - self.error_ewma)
+
+    def ttft_percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self.ttfts)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, math.ceil(q * len(samples)) - 1)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "latency_ewma": self.latency_ewma,
+            "error_ewma": self.error_ewma,
+            "ttft_p50": self.ttft_percentile(0.5),
+            "ttft_p90": self.ttft_percentile(0.9),
+            "requests": self.requests,
+            "errors": self.errors,
+            "wins": self.wins,
+        }
+
+
+class _Attempt:
+    """One provider's try at a request. Buffers streamed chunks until it wins."""
+
+    def __init__(self, stats: ProviderStats, post: Callable[[tuple], None], stream_callback):
+        self.stats = stats
+        self.post = post
+        self.stream_callback = stream_callback
+        self.start = time.perf_counter()
+        self.ttft: Optional[float] = None
+        self.cancelled = False
+        self.forward = False
+        self.buffer: List[str] = []
+        self.task: Optional[asyncio.Future] = None
+        self._lock = threading.Lock()
+
+    def on_chunk(self, chunk: str) -> None:
+        with self._lock:
+            if self.cancelled:
+                raise HedgeCancelled()
+            if self.forward:
+                if self.stream_callback is not None:
+                    self.stream_callback(chunk)
+            elif self.stream_callback is not None:
+                self.buffer.append(chunk)
+            first = self.ttft is None
+            if first:
+                self.ttft = time.perf_counter() - self.start
+        if first:
+            self.post(("first", self, None))
+
+    def promote(self) -> None:
+        """Make this attempt the winner: replay its buffered chunks and stream the rest."""
+        with self._lock:
+            if self.stream_callback is not None:
+                for chunk in self.buffer:
+                    self.stream_callback(chunk)
+            self.buffer = []
+            self.forward = True
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled = True
+        if self.task is not None:
+            self.task.cancel()
+
+
+class _HedgedCall:
+    """
+    Decision logic of one routed request, shared by the sync and async paths.
+
+    Attempts report ``("first" | "done" | "error", attempt, payload)`` events;
+    the caller's loop feeds them to `handle` and calls `start_next` to hedge
+    when `hedge_timeout` expires.
+    """
+
+    def __init__(self, router: "RoutingClient", stream_callback, post, launch):
+        self.router = router
+        self.stream_callback = stream_callback
+        self.post = post
+        self.launch = launch
+        self.pending = router.ranked_providers()
+        self.attempts: List[_Attempt] = []
+        self.winner: Optional[_Attempt] = None
+        # Providers whose attempts lost to the winner, to retry if it fails
+        # before anything reached the caller
+        self.beaten: List[ProviderStats] = []
+        self.hedged = False
+        self.last_error: Optional[BaseException] = None
+
+    @property
+    def live(self) -> List[_Attempt]:
+        return [a for a in self.attempts if not a.cancelled]
+
+    def start_next(self) -> bool:
+        if not self.pending:
+            return False
+        stats = self.pending.pop(0)
+        attempt = _Attempt(stats, self.post, self.stream_callback)
+        self.attempts.append(attempt)
+        self.launch(attempt)
+        return True
+
+    def hedge_timeout(self) -> Optional[float]:
+        """Seconds until the next hedge should be sent, or None if no hedge is due."""
+        if (
+            self.winner is not None
+            or not self.pending
+            or len(self.live) > self.router.max_hedges
+            or not self.live
+        ):
+            return None
+        primary = self.live[0]
+        deadline = primary.start + self.router.hedge_delay(primary.stats)
+        return max(0.0, deadline - time.perf_counter())
+
+    def hedge(self) -> None:
+        self.hedged = True
+        self.start_next()
+
+    def _win(self, attempt: _Attempt) -> None:
+        self.winner = attempt
+        for other in self.attempts:
+            if other is not attempt and not other.cancelled:
+                other.cancel()
+                self.beaten.append(other.stats)
+                other.stats.record_cancelled(time.perf_counter() - other.start)
+        attempt.promote()
+
+    def handle(self, kind: str, attempt: _Attempt, payload: Any) -> Optional[ChatResult]:
+        """Process one event; returns the result once the winning attempt is done."""
+        if attempt.cancelled:
+            return None
+        if kind == "first":
+            if self.winner is None:
+                self._win(attempt)
+            return None
+        if kind == "done":
+            if self.winner is None:
+                self._win(attempt)
+            if attempt is not self.winner:
+                return None
+            result = ChatResult.of(payload)
+            latency = time.perf_counter() - attempt.start
+            ttft = attempt.ttft if attempt.ttft is not None else latency
+            attempt.stats.record_success(latency, ttft)
+            result.latency = latency
+            result.ttft = attempt.ttft
+            return result
+
+        # An attempt failed
+        attempt.cancelled = True
+        attempt.stats.record_error()
+        self.last_error = payload
+        if attempt is self.winner:
+            if self.stream_callback is not None:
+                # Part of its output was already streamed to the caller
+                raise payload
+            # Nothing reached the caller yet, so the providers it beat get
+            # another try
+            self.winner = None
+            self.pending[:0] = self.beaten
+            self.beaten = []
+        self.router.logger.warning(
+            f"{attempt.stats.name} failed ({type(payload).__name__}: {payload}); failing over"
+        )
+        if not self.live and not self.start_next():
+            raise self.last_error
+        return None
+
+    def annotate_span(self) -> None:
+        current_span().set_attributes(
+            provider=self.winner.stats.name if self.winner else None,
+            hedged=self.hedged,
+            attempts=len(self.attempts),
+        )
+
+
+class RoutingClient(BaseClient):
+    """
+    Sends each request to the provider expected to answer fastest, hedging and
+    failing over to the others.
+
+    Providers are ranked by expected time per successful request (latency EWMA
+    inflated by the error EWMA). If the chosen provider has not produced its
+    first token (or, for non-streamed calls, its response) by the
+    ``hedge_percentile`` of its recent time-to-first-token, the same request
+    goes to the next provider too. The first attempt to produce output wins
+    and the others are cancelled. A failed attempt immediately fails over to
+    the next provider.
+
+    Losing async attempts are cancelled outright. Blocking clients are aborted
+    at their next streamed chunk; a non-streamed blocking request cannot be
+    interrupted, so it runs to completion in the background and is discarded.
+    """
+
+    def __init__(
+        self,
+        clients: Union[Sequence[Any], Dict[str, Any]],
+        hedge_percentile: float = 0.9,
+        initial_hedge_delay: float = 2.0,
+        min_hedge_delay: float = 0.05,
+        min_samples: int = 5,
+        max_hedges: int = 1,
+        ewma_alpha: float = 0.2,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            clients: The clients to route between, in order of preference, or
+                a mapping of provider name to client
+            hedge_percentile: Time-to-first-token percentile that triggers a hedge
+            initial_hedge_delay: Hedge deadline in seconds until a provider
+                has ``min_samples`` measurements
+            min_hedge_delay: Lower bound of the hedge deadline in seconds
+            min_samples: Measurements needed before the percentile is used
+            max_hedges: Extra concurrent attempts per request (0 disables hedging)
+            ewma_alpha: Weight of the newest sample in the moving averages
+        """
+        if not clients:
+            raise ValueError("RoutingClient needs at least one client")
+        if not isinstance(clients, dict):
+            clients = {
+                f"{type(c).__name__}:{getattr(c, 'model_name', i)}": c
+                for i, c in enumerate(clients)
+            }
+        self.providers = [
+            ProviderStats(name, client, alpha=ewma_alpha) for name, client in clients.items()
+        ]
+        self.hedge_percentile = hedge_percentile
+        self.initial_hedge_delay = initial_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.min_samples = min_samples
+        self.max_hedges = max_hedges
+        self.model_name = "route:" + ",".join(clients)
+        self.temperature = getattr(self.providers[0].client, "temperature", 0.0)
+        # Only ask for JSON mode if every provider understands it
+        self.supports_response_format = all(
+            getattr(p.client, "supports_response_format", False) for p in self.providers
+        )
+        self.logger = logging.getLogger("RoutingClient")
+        self.logger.setLevel(logging.INFO)
+
+    def ranked_providers(self) -> List[ProviderStats]:
+        """Providers from most to least preferred (ties keep the configured order)."""
+        return sorted(self.providers, key=lambda p: p.score)
+
+    def hedge_delay(self, stats: ProviderStats) -> float:
+        """Seconds to wait for ``stats``' first token before hedging."""
+        if len(stats.ttfts) < self.min_samples:
+            return self.initial_hedge_delay
+        return max(self.min_hedge_delay, stats.ttft_percentile(self.hedge_percentile))
+
+    @staticmethod
+    def _chat_kwargs(attempt: _Attempt, stream_callback, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        # Clients that name stream_callback report their first token even when
+        # the caller is not streaming; the others only get it if the caller
+        # asked for streaming, as they would without the router
+        if stream_callback is not None or attempt.stats.streams:
+            return {**kwargs, "stream_callback": attempt.on_chunk}
+        return kwargs
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-provider latency / error statistics."""
+        return {p.name: p.to_dict() for p in self.providers}
+
+    def chat(
+        self,
+        messages: Union[List[Dict[str, Any]], Dict[str, Any]],
+        stream_callback=None,
+        **kwargs,
+    ) -> ChatResult:
+        """
+        Route one conversation, hedging and failing over between providers.
+
+        Args:
+            messages: The conversation
+            stream_callback: Optional callback receiving the winner's chunks
+            **kwargs: Passed to the chosen clients' ``chat``
+
+        Returns:
+            The winning provider's ChatResult
+        """
+        events: "queue.Queue[tuple]" = queue.Queue()
+
+        def run(attempt: _Attempt) -> None:
+            try:
+                result = attempt.stats.client.chat(
+                    messages, **self._chat_kwargs(attempt, stream_callback, kwargs)
+                )
+                events.put(("done", attempt, result))
+            except Exception as e:
+                events.put(("error", attempt, e))
+
+        def launch(attempt: _Attempt) -> None:
+            threading.Thread(target=run, args=(attempt,), daemon=True).start()
+
+        call = _HedgedCall(self, stream_callback, events.put, launch)
+        call.start_next()
+        while True:
+            try:
+                event = events.get(timeout=call.hedge_timeout())
+            except queue.Empty:
+                call.hedge()
+                continue
+            result = call.handle(*event)
+            if result is not None:
+                call.annotate_span()
+                return result
+
+    async def achat(
+        self,
+        messages: Union[List[Dict[str, Any]], Dict[str, Any]],
+        stream_callback=None,
+        **kwargs,
+    ) -> ChatResult:
+        """Asynchronous variant of `chat`; losing attempts are cancelled as tasks."""
+        loop = asyncio.get_running_loop()
+        events: "asyncio.Queue[tuple]" = asyncio.Queue()
+
+        def post(event: tuple) -> None:
+            # Blocking clients stream from worker threads
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+        async def run(attempt: _Attempt) -> None:
+            try:
+                result = await achat(
+                    attempt.stats.client,
+                    messages,
+                    **self._chat_kwargs(attempt, stream_callback, kwargs),
+                )
+                post(("done", attempt, result))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                post(("error", attempt, e))
+
+        def launch(attempt: _Attempt) -> None:
+            attempt.task = asyncio.ensure_future(run(attempt))
+
+        call = _HedgedCall(self, stream_callback, post, launch)
+        call.start_next()
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(events.get(), call.hedge_timeout())
+                except asyncio.TimeoutError:
+                    call.hedge()
+                    continue
+                result = call.handle(*event)
+                if result is not None:
+                    call.annotate_span()
+                    return result
+        finally:
+            for attempt in call.attempts:
+                if attempt.task is not None and not attempt.task.done():
+                    attempt.task.cancel()
@@ -1,12 +1,16 @@
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 import os
+import time
 from together import Together
 
+from minions.clients.base import BaseClient, ChatResult
+from minions.clients.pool import get_connection_pool
+from minions.clients.rate_limit import estimate_request_tokens, get_rate_limiter
 from minions.usage import Usage
 
 
-class TogetherClient:
+class TogetherClient(BaseClient):
     def __init__(
         self,
         model_name: str = "meta-llama/Meta-Llama-3.1-70B-Instruct-Turbo",
@@ -29,9 +33,13 @@ class TogetherClient:
         self.logger.setLevel(logging.INFO)
         self.temperature = temperature
         self.max_tokens = max_tokens
-        self.client = Together(api_key=self.api_key)
+        # Retries are left to the rate limiter, which backs off across callers
+        self.client = get_connection_pool().sdk_client(
+            Together, api_key=self.api_key, max_retries=0
+        )
+        self.rate_limiter = get_rate_limiter("together", self.api_key)
 
-    def chat(self, messages: List[Dict[str, Any]], **kwargs) -> Tuple[List[str], Usage]:
+    def chat(self, messages: List[Dict[str, Any]], **kwargs) -> ChatResult:
         """
         Handle chat completions using the Together API.
 
@@ -40,7 +48,7 @@ class TogetherClient:
             **kwargs: Additional arguments to pass to client.chat.completions.create
 
         Returns:
-            Tuple of (List[str], Usage) containing response strings and token usage
+            ChatResult with the response strings, token usage and finish reasons
         """
         assert len(messages) > 0, "Messages cannot be empty."
 
@@ -53,7 +61,12 @@ class TogetherClient:
                 **kwargs,
             }
 
-            response = self.client.chat.completions.create(**params)
+            start = time.perf_counter()
+            response = self.rate_limiter.call(
+                self.client.chat.completions.create,
+                tokens=estimate_request_tokens(messages, self.max_tokens),
+                **params,
+            )
         except Exception as e:
             self.logger.error(f"Error during Together API call: {e}")
             raise
@@ -64,4 +77,9 @@ class TogetherClient:
             completion_tokens=response.usage.completion_tokens
         )
 
-        return [choice.message.content for choice in response.choices], usage 
\ No newline at end of file
+        return ChatResult(
+            [choice.message.content for choice in response.choices],
+            usage,
+            [choice.finish_reason or "stop" for choice in response.choices],
+            latency=time.perf_counter() - start,
+        ) 
\ No newline at end of file
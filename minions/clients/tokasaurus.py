@@ -1,14 +1,19 @@
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 import os
+import time
 from openai import OpenAI
 
+from minions.clients.pool import get_connection_pool
+from minions.clients.base import BaseClient, ChatResult
 from minions.usage import Usage
 from minions.clients.utils import ServerMixin
 
 
-# TODO: define one dataclass for what is returned from all the clients
-class TokasaurusClient(ServerMixin):
+class TokasaurusClient(ServerMixin, BaseClient):
+    # Tokasaurus batches concurrent requests on the GPU, so keep many in flight
+    batch_size = 64
+
     def __init__(
         self,
         model_name: str = "meta-llama/Llama-3.2-1B-Instruct",
@@ -42,12 +47,13 @@ class TokasaurusClient(ServerMixin):
         else:
             self.port = port
         
-        self.client = OpenAI(
+        self.client = get_connection_pool().sdk_client(
+            OpenAI,
             api_key='fake-key',
             base_url=f"http://0.0.0.0:{self.port}/v1"
         )
 
-    def chat(self, messages: List[Dict[str, Any]], **kwargs) -> Tuple[List[str], Usage]:
+    def chat(self, messages: List[Dict[str, Any]], **kwargs) -> ChatResult:
         """
         Handle chat completions using the OpenAI API.
 
@@ -56,7 +62,7 @@ class TokasaurusClient(ServerMixin):
             **kwargs: Additional arguments to pass to openai.chat.completions.create
 
         Returns:
-            Tuple of (List[str], Usage) containing response strings and token usage
+            ChatResult with the response strings, token usage and finish reasons
         """
         assert len(messages) > 0, "Messages cannot be empty."
 
@@ -66,6 +72,7 @@ class TokasaurusClient(ServerMixin):
             if "o1" not in self.model_name and "o3" not in self.model_name:
                 kwargs["temperature"] = self.temperature
 
+            start = time.perf_counter()
             response = self.client.chat.completions.create(
                 model=self.model_name,
                 messages=messages,
@@ -77,10 +84,12 @@ class TokasaurusClient(ServerMixin):
             raise
 
         # Extract usage information
-        usage = Usage(
-            prompt_tokens=response.usage.prompt_tokens,
-            completion_tokens=response.usage.completion_tokens
-        )
+        usage = Usage.from_openai(response.usage)
 
         # The content is now nested under message
-        return [choice.message.content for choice in response.choices], usage, ""
+        return ChatResult(
+            [choice.message.content for choice in response.choices],
+            usage,
+            [choice.finish_reason or "stop" for choice in response.choices],
+            latency=time.perf_counter() - start,
+        )
@@ -0,0 +1,213 @@
+"""
+Background pulling, loading and unloading of Ollama models.
+
+Constructing an OllamaClient used to send a throwaway chat to check that its
+model exists, which loaded the model on the constructing thread; building a
+worker and a supervisor client in a row paid both loads one after the other.
+The ModelWarmer checks availability through the show API (pulling only if the
+model is missing) and loads models by sending a request without messages, on
+background threads, so several models load concurrently while the caller
+carries on, and each model is loaded at most once per host.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+
+from minions.clients.pool import get_connection_pool
+
+KeepAlive = Union[str, float, None]
+
+
+def keep_alive_from_env() -> KeepAlive:
+    """MINIONS_OLLAMA_KEEP_ALIVE as Ollama expects it: seconds, or a duration such as "30m"."""
+    value = os.environ.get("MINIONS_OLLAMA_KEEP_ALIVE")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+@dataclass
+class ModelLoad:
+    """
+    How long it took to make a model ready on one host.
+
+    Times are in seconds. ``available_time`` covers the availability check
+    (and the pull, if ``pulled``); ``load_time`` is the wall time of loading
+    the model into memory, ``load_duration`` the part of it the server reports.
+    """
+    model: str
+    host: Optional[str]
+    available_time: float = 0.0
+    load_time: float = 0.0
+    load_duration: float = 0.0
+    pulled: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "host": self.host,
+            "available_time": self.available_time,
+            "load_time": self.load_time,
+            "load_duration": self.load_duration,
+            "pulled": self.pulled,
+        }
+
+
+class ModelWarmer:
+    """
+    Pulls and loads Ollama models in the background, once per (host, model).
+
+    `preload` returns a Future of the ModelLoad; clients wait on it before
+    their first request, so the load is reported on its own rather than as
+    the latency of the first query.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger("ModelWarmer")
+        self.logger.setLevel(logging.INFO)
+        self._loads: Dict[Tuple[Optional[str], str], Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def client(host: Optional[str]):
+        """Pooled ollama.Client for ``host``, shared with OllamaClient instances."""
+        import ollama
+        return get_connection_pool().get_client(
+            (ollama.Client, host),
+            lambda: ollama.Client(host=host, limits=get_connection_pool().limits),
+        )
+
+    def ensure_available(self, model_name: str, host: Optional[str] = None) -> bool:
+        """
+        Pull ``model_name`` if ``host`` does not have it, without loading it.
+
+        Returns:
+            True if the model had to be pulled
+        """
+        import ollama
+        client = self.client(host)
+        try:
+            client.show(model_name)
+            return False
+        except ollama.ResponseError as e:
+            if e.status_code != 404:
+                self.logger.error(f"Error checking model availability: {e}")
+                raise
+        self.logger.info(f"Model {model_name} not found. Attempting to pull...")
+        try:
+            client.pull(model_name)
+        except Exception as pull_error:
+            self.logger.error(f"Failed to pull model {model_name}: {pull_error}")
+            raise
+        self.logger.info(f"Successfully pulled model {model_name}")
+        return True
+
+    def load(
+        self,
+        model_name: str,
+        host: Optional[str] = None,
+        keep_alive: KeepAlive = None,
+        num_ctx: Optional[int] = None,
+    ) -> ModelLoad:
+        """
+        Make ``model_name`` available on ``host`` and load it into memory now.
+
+        Args:
+            model_name: Ollama model
+            host: Ollama server (default: the ollama package default)
+            keep_alive: How long the server keeps the model loaded (default: the
+                server's); -1 keeps it loaded, 0 unloads it after this request
+            num_ctx: Context window to load the model with; loading it with the
+                window requests will use avoids a reload on the first request
+
+        Returns:
+            The ModelLoad timings
+        """
+        start = time.perf_counter()
+        result = ModelLoad(model=model_name, host=host)
+        result.pulled = self.ensure_available(model_name, host)
+        result.available_time = time.perf_counter() - start
+
+        kwargs: Dict[str, Any] = {}
+        if keep_alive is not None:
+            kwargs["keep_alive"] = keep_alive
+        if num_ctx:
+            kwargs["options"] = {"num_ctx": num_ctx}
+        # A chat without messages loads the model and generates nothing
+        response = self.client(host).chat(model=model_name, messages=[], **kwargs)
+        result.load_time = time.perf_counter() - start - result.available_time
+        result.load_duration = (response.get("load_duration") or 0) / 1e9
+        self.logger.info(
+            f"Loaded {model_name} on {host or 'the default host'} in {result.load_time:.2f}s"
+        )
+        return result
+
+    def preload(
+        self,
+        model_name: str,
+        host: Optional[str] = None,
+        keep_alive: KeepAlive = None,
+        num_ctx: Optional[int] = None,
+    ) -> "Future[ModelLoad]":
+        """
+        Start `load` on a background thread, unless the model is already
+        loading or loaded on ``host``; failed loads are retried.
+
+        Returns:
+            A Future of the ModelLoad
+        """
+        key = (host, model_name)
+        with self._lock:
+            future = self._loads.get(key)
+            if future is not None and not (future.done() and future.exception()):
+                return future
+            future = Future()
+            self._loads[key] = future
+
+        def run() -> None:
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(self.load(model_name, host, keep_alive, num_ctx))
+            except BaseException as e:
+                self.logger.warning(f"Could not preload {model_name}: {e}")
+                future.set_exception(e)
+
+        threading.Thread(target=run, name=f"preload-{model_name}", daemon=True).start()
+        return future
+
+    def unload(self, model_name: str, host: Optional[str] = None) -> None:
+        """Free the memory ``model_name`` holds on ``host``."""
+        with self._lock:
+            self._loads.pop((host, model_name), None)
+        self.client(host).chat(model=model_name, messages=[], keep_alive=0)
+
+    def loads(self) -> Dict[Hashable, ModelLoad]:
+        """The finished loads, keyed by (host, model)."""
+        with self._lock:
+            futures = dict(self._loads)
+        return {
+            key: future.result()
+            for key, future in futures.items()
+            if future.done() and not future.exception()
+        }
+
+
+_default_warmer: Optional[ModelWarmer] = None
+_default_warmer_lock = threading.Lock()
+
+
+def get_model_warmer() -> ModelWarmer:
+    """The process-wide ModelWarmer shared by all Ollama clients."""
+    global _default_warmer
+    with _default_warmer_lock:
+        if _default_warmer is None:
+            _default_warmer = ModelWarmer()
+        return _default_warmer
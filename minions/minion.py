@@ -1,12 +1,14 @@
 from typing import List, Dict, Any, Optional, Set, Tuple, Callable
+import asyncio
 import json
 import re
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from minions.clients import OpenAIClient, TogetherClient
-from minions.clients.base import BaseClient
+from minions.clients.base import BaseClient, achat
 
 from minions.prompts.minion import (
     SUPERVISOR_CONVERSATION_PROMPT,
@@ -19,7 +21,14 @@ from minions.prompts.minion import (
     REFORMAT_QUERY_PROMPT,
 )
 from minions.usage import Usage
-from minions.utils import escape_newlines_in_strings, extract_json, clean_json_string, aggressive_json_repair, apply_privacy_shield
+from minions.utils.tracing import NOOP_SPAN, current_span, get_tracer, traced
+from minions.utils.json_parsing import (
+    StreamingJSONParser,
+    escape_control_chars_in_strings,
+    find_fenced_blocks,
+    find_json_objects,
+)
+from minions.utils import escape_newlines_in_strings, extract_json, clean_json_string, aggressive_json_repair, apply_privacy_shield, aapply_privacy_shield
 
 # Import Colors class for terminal coloring
 class Colors:
@@ -39,16 +48,14 @@ def colorize(text: str, color: str) -> str:
         return text
     return f"{color}{text}{Colors.END}"
 
+def _print_stream_chunk(chunk: str) -> None:
+    """Stream callback that echoes each chunk to the terminal as it arrives."""
+    print(chunk, end="", flush=True)
+
 def _escape_newlines_in_strings(json_str: str) -> str:
-    # This regex naively matches any content inside double quotes (including escaped quotes)
-    # and replaces any literal newline characters within those quotes.
+    # Escapes literal newlines (and tabs/carriage returns) inside double-quoted strings.
     # was especially useful for anthropic client
-    return re.sub(
-        r'(".*?")',
-        lambda m: m.group(1).replace("\n", "\\n"),
-        json_str,
-        flags=re.DOTALL,
-    )
+    return escape_control_chars_in_strings(json_str)[0]
 
 
 def _extract_json(text: str) -> Dict[str, Any]:
@@ -62,21 +69,17 @@ def _extract_json(text: str) -> Dict[str, Any]:
         }
         
     # First, try to find JSON in code blocks
-    block_matches = list(re.finditer(r"```(?:json)?\s*(.*?)```", text, re.DOTALL))
+    block_matches = find_fenced_blocks(text, "json")
     
-    # Then look for standalone JSON objects - looking for the largest JSON object
-    bracket_matches = list(re.finditer(r"\{.*?\}", text, re.DOTALL))
-    
-    # Sort bracket matches by length to find the most complete JSON object
-    if bracket_matches:
-        bracket_matches.sort(key=lambda m: len(m.group(0)), reverse=True)
+    # Then look for standalone JSON objects
+    bracket_matches = find_json_objects(text) if not block_matches else []
 
     # Try code blocks first (most common format from LLMs)
     if block_matches:
-        json_str = block_matches[-1].group(1).strip()
+        json_str = block_matches[-1]
     # Fall back to bracket matching
     elif bracket_matches:
-        json_str = bracket_matches[0].group(0)  # Use the largest JSON object found
+        json_str = max(bracket_matches, key=len)  # Use the largest JSON object found
     # If no matches, use the whole text
     else:
         json_str = text
@@ -128,43 +131,8 @@ def _clean_json_string(json_str: str) -> str:
 
 def _aggressive_json_repair(json_str: str) -> str:
     """More aggressive JSON repair for when standard cleaning fails."""
-    # Fix unescaped quotes within strings
-    fixed = ""
-    in_string = False
-    escape_next = False
-    
-    for char in json_str:
-        if escape_next:
-            fixed += char
-            escape_next = False
-            continue
-            
-        if char == '\\':
-            fixed += char
-            escape_next = True
-            continue
-            
-        if char == '"' and not in_string:
-            in_string = True
-            fixed += char
-            continue
-            
-        if char == '"' and in_string and not escape_next:
-            in_string = False
-            fixed += char
-            continue
-            
-        # Handle special characters in strings
-        if in_string and char in ['\n', '\r', '\t']:
-            if char == '\n':
-                fixed += '\\n'
-            elif char == '\r':
-                fixed += '\\r'
-            elif char == '\t':
-                fixed += '\\t'
-            continue
-            
-        fixed += char
+    # Escape control characters inside strings in a single pass
+    fixed, in_string = escape_control_chars_in_strings(json_str)
     
     # Ensure strings are properly closed
     if in_string:
@@ -199,13 +167,20 @@ class Minion:
         max_rounds: Optional[int] = 5,
         callback: Optional[Callable] = None,
         log_dir: str = "minion_logs",
+        speculative_worker: bool = True,
     ):
-   
+        """
+        Args:
+            speculative_worker: Start the worker's next turn as soon as the
+                supervisor's streamed decision contains its question, instead
+                of waiting for the whole completion
+        """
         self.local_client = local_client
         self.remote_client = remote_client
         self.max_rounds = max_rounds or 5  # Default to 5 rounds if None
         self.callback = callback
         self.log_dir = log_dir
+        self.speculative_worker = speculative_worker
 
         # Create log directory if it doesn't exist
         os.makedirs(log_dir, exist_ok=True)
@@ -217,6 +192,7 @@ class Minion:
         # Cache for expensive operations
         self._session_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
+    @traced("minion")
     def __call__(
         self,
         task: str,
@@ -252,16 +228,7 @@ class Minion:
         merged_context = "\n\n".join(context)
 
         # Initialize the log structure
-        conversation_log = {
-            "task": task,
-            "context": merged_context,
-            "conversation": [],
-            "generated_final_answer": "",
-            "metadata": {
-                "timestamp": self._session_timestamp,
-                "document_metadata": doc_metadata or {},
-            }
-        }
+        conversation_log = self._create_conversation_log(task, merged_context, doc_metadata)
 
         # Track usage statistics
         local_usage = 0
@@ -317,6 +284,102 @@ class Minion:
             "execution_time": execution_time,
         }
         
+    @traced("minion")
+    async def acall(
+        self,
+        task: str,
+        context: List[str],
+        max_rounds: Optional[int] = None,
+        doc_metadata: Optional[Dict[str, Any]] = None,
+        logging_id: Optional[str] = None,
+        is_privacy: bool = False,
+    ) -> Dict[str, Any]:
+        """Asynchronous variant of `__call__`, built on each client's ``achat``.
+
+        Nothing blocks the event loop, so one loop can drive many sessions at
+        once. Steps that do not depend on each other overlap: PII extraction of
+        the context runs alongside the query rewrite.
+        Duplicate tracking is per instance, so use one Minion per concurrent
+        session.
+
+        Args:
+            task: The task/question to answer
+            context: List of context strings
+            max_rounds: Override default max_rounds if provided
+            doc_metadata: Optional metadata about the documents
+            logging_id: Optional identifier for the task, used for named log files
+            is_privacy: Whether to use privacy shield
+
+        Returns:
+            Dict containing final_answer, conversation histories, and usage statistics
+        """
+        start_time = time.time()
+        
+        if max_rounds is None:
+            max_rounds = self.max_rounds
+            
+        # Reset tracking of used questions and answers for this run
+        self.used_questions = set()
+        self.used_answers = set()
+
+        merged_context = "\n\n".join(context)
+        conversation_log = self._create_conversation_log(task, merged_context, doc_metadata)
+
+        supervisor_messages, worker_messages, pii_extracted = await self._asetup_initial_messages(
+            task, merged_context, is_privacy, conversation_log
+        )
+
+        if self.callback:
+            self.callback("supervisor", None, is_final=False)
+
+        supervisor_response, remote_usage = await self._aget_supervisor_response(supervisor_messages)
+        self._add_supervisor_question(
+            supervisor_response, supervisor_messages, conversation_log
+        )
+
+        if self.callback:
+            self.callback("supervisor", supervisor_messages[-1])
+
+        final_answer, local_usage, rounds_remote_usage = await self._arun_conversation_rounds(
+            task,
+            max_rounds,
+            supervisor_messages,
+            worker_messages,
+            conversation_log,
+            is_privacy,
+            pii_extracted,
+        )
+        remote_usage += rounds_remote_usage
+
+        log_filename = await asyncio.to_thread(
+            self._save_conversation_log, conversation_log, logging_id
+        )
+
+        return {
+            "final_answer": final_answer,
+            "supervisor_messages": supervisor_messages,
+            "worker_messages": worker_messages,
+            "local_usage": local_usage,
+            "remote_usage": remote_usage,
+            "log_path": log_filename,
+            "execution_time": time.time() - start_time,
+        }
+
+    def _create_conversation_log(
+        self, task: str, context: str, doc_metadata: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Create an empty conversation log for a run."""
+        return {
+            "task": task,
+            "context": context,
+            "conversation": [],
+            "generated_final_answer": "",
+            "metadata": {
+                "timestamp": self._session_timestamp,
+                "document_metadata": doc_metadata or {},
+            }
+        }
+
     def _setup_initial_messages(
         self, 
         task: str, 
@@ -350,86 +413,85 @@ class Minion:
                 self.callback("worker", f"**PII Reformated Task:**\n{pii_reformatted_task}")
                 
             # Initialize message histories with PII awareness
-            supervisor_messages = [
-                {
-                    "role": "user",
-                    "content": SUPERVISOR_INITIAL_PROMPT.format(task=pii_reformatted_task),
-                }
-            ]
-            worker_messages = [
-                {
-                    "role": "system",
-                    "content": WORKER_SYSTEM_PROMPT.format(context=context, task=task),
-                }
-            ]
-            
-            # Add to conversation log
-            conversation_log["conversation"].append({
-                "user": "remote",
-                "prompt": SUPERVISOR_INITIAL_PROMPT.format(task=pii_reformatted_task),
-                "output": None,
-            })
+            return self._create_initial_messages(
+                pii_reformatted_task, task, context, conversation_log
+            )
         else:
             # Standard initialization without privacy
-            supervisor_messages = [
-                {
-                    "role": "user",
-                    "content": SUPERVISOR_INITIAL_PROMPT.format(task=task),
-                }
-            ]
-            worker_messages = [
-                {
-                    "role": "system",
-                    "content": WORKER_SYSTEM_PROMPT.format(context=context, task=task),
-                }
-            ]
-            
-            # Add to conversation log
-            conversation_log["conversation"].append({
-                "user": "remote",
-                "prompt": SUPERVISOR_INITIAL_PROMPT.format(task=task),
-                "output": None,
-            })
-            
+            return self._create_initial_messages(task, task, context, conversation_log)
+
+    def _create_initial_messages(
+        self,
+        supervisor_task: str,
+        task: str,
+        context: str,
+        conversation_log: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+        """Create both message histories; the supervisor only ever sees ``supervisor_task``."""
+        supervisor_messages = [
+            {
+                "role": "user",
+                "content": SUPERVISOR_INITIAL_PROMPT.format(task=supervisor_task),
+            }
+        ]
+        worker_messages = [
+            {
+                "role": "system",
+                "content": WORKER_SYSTEM_PROMPT.format(context=context, task=task),
+            }
+        ]
+        
+        # Add to conversation log
+        conversation_log["conversation"].append({
+            "user": "remote",
+            "prompt": SUPERVISOR_INITIAL_PROMPT.format(task=supervisor_task),
+            "output": None,
+        })
+        
         return supervisor_messages, worker_messages
     
 
     
-    def _get_supervisor_response(self, supervisor_messages: List[Dict[str, str]]):
-        """Get response from the supervisor model with appropriate handling for different client types."""
+    @traced("minion.supervisor")
+    def _get_supervisor_response(
+        self,
+        supervisor_messages: List[Dict[str, str]],
+        parser: Optional[StreamingJSONParser] = None,
+    ):
+        """Get response from the supervisor model with appropriate handling for different client types.
+
+        If a ``parser`` is given, every streamed chunk is also fed to it, so its
+        field callbacks fire while the supervisor is still generating.
+        """
         try:
             # Set up streaming for supervisor response
-            buffer = ""
-            
             def supervisor_stream_callback(chunk):
-                nonlocal buffer
                 # Print the chunk immediately
                 print(chunk, end="", flush=True)
-                buffer += chunk
+                if parser is not None:
+                    parser.feed(chunk)
             
             # Display that the supervisor is thinking
             print(colorize("\nSupervisor (Remote) is thinking...", Colors.BOLD + Colors.BLUE))
 
             from deep_translator import GoogleTranslator 
             
+            kwargs = {}
             # Check if client supports response format parameter (like OpenAI)
-            if hasattr(self.remote_client, "supports_response_format") and self.remote_client.supports_response_format:
-                supervisor_response, supervisor_usage = self.remote_client.chat(
-                    messages=supervisor_messages, 
-                    response_format={"type": "json_object"},
-                    stream_callback=supervisor_stream_callback
-                )
-            else:
-                supervisor_response, supervisor_usage, _ = self.remote_client.chat(
-                    messages=supervisor_messages,
-                    stream_callback=supervisor_stream_callback
-                )
+            if getattr(self.remote_client, "supports_response_format", False):
+                kwargs["response_format"] = {"type": "json_object"}
+
+            supervisor_response, supervisor_usage, _ = self.remote_client.chat(
+                messages=supervisor_messages,
+                stream_callback=supervisor_stream_callback,
+                **kwargs
+            )
             
             # Clear the buffer with a newline
             print("\n")
 
             # Process supervisor response
-            
+            current_span().set_usage(supervisor_usage)
             return supervisor_response, supervisor_usage
         except Exception as e:
             # Log error and return a fallback response
@@ -473,10 +535,7 @@ class Minion:
         
         if response_key in self.used_answers:
             # Request a more unique response if duplicate detected
-            worker_uniqueness_prompt = """Your previous response was too similar to one you've already provided. 
-            Please provide a more unique and detailed perspective on the topic that adds new information.
-            Be specific and try to approach the question from a different angle. 
-            Avoid repeating similar points, phrases, or structures from your previous responses."""
+            worker_uniqueness_prompt = self._create_worker_uniqueness_prompt()
             
             worker_messages.append({"role": "user", "content": worker_uniqueness_prompt})
             
@@ -561,45 +620,45 @@ class Minion:
     ) -> Tuple[bool, int]:
         """Handle worker follow-up questions if any."""
         # Create follow-up prompt
-        worker_follow_up_prompt = f"""Based on your last response:
-        "{worker_response[0]}"
-        
-        Do you have any questions you would like to ask the supervisor model? 
-        If so, please provide a clear, specific question that will help you better
-        understand or solve the task at hand. If you do not have any questions,
-        say "No questions at this time."
-        
-        Keep your question direct and focused on the task: "{task}"
-        
-        Ensure your question is unique and hasn't been asked before. Ask something that
-        will provide new information or a different perspective on the task.
-        
-        The best questions are those that:
-        1. Seek clarification on aspects of the task you're unsure about
-        2. Request specific information that would help you provide a better response
-        3. Challenge assumptions in a constructive way
-        4. Explore perspectives that haven't been considered yet
-        5. Show critical thinking about the problem
-        
-        Remember: Your questions drive the conversation forward, so make them count!
-        """
+        worker_follow_up_prompt = self._create_worker_follow_up_prompt(task, worker_response[0])
         
         # Get worker's follow-up question
         worker_question_response, worker_follow_up_usage, _ = self.local_client.chat(
             messages=worker_messages + [{"role": "user", "content": worker_follow_up_prompt}]
         )
         
+        if not self._add_worker_question(
+            worker_question_response, supervisor_messages, conversation_log
+        ):
+            return False, worker_follow_up_usage
+        
+        # Get supervisor response
+        supervisor_reply, supervisor_usage = self._get_supervisor_response(supervisor_messages)
+        
+        self._add_supervisor_reply(
+            supervisor_reply, supervisor_messages, worker_messages, conversation_log
+        )
+        
+        return True, supervisor_usage + worker_follow_up_usage
+
+    def _add_worker_question(
+        self,
+        worker_question_response: List[str],
+        supervisor_messages: List[Dict[str, str]],
+        conversation_log: Dict[str, Any]
+    ) -> bool:
+        """Forward the worker's follow-up question to the supervisor unless it is empty or a repeat."""
         # Check if worker has a follow-up question and it's not a duplicate
         if not worker_question_response or worker_question_response[0].strip() == "No questions at this time.":
             # No follow-up question
-            return False, worker_follow_up_usage
+            return False
             
         question_key = worker_question_response[0].strip()[:100]
         
         # Check if question is unique
         if question_key in self.used_questions:
             # Question is a duplicate
-            return False, worker_follow_up_usage
+            return False
             
         # Add to used questions
         self.used_questions.add(question_key)
@@ -615,31 +674,20 @@ class Minion:
         })
         
         # Create supervisor prompt
-        supervisor_reply_prompt = f"""
-        ### Question
-        {worker_question_response[0]}
-        
-        ### Instructions
-        Please answer this specific question to help the small language model. Provide clear, 
-        helpful information directly related to this question. Remember that the small model
-        has access to the context, but may need guidance on how to interpret or use it.
-        
-        After thinking step-by-step, provide your answer in the following format:
-        
-        ```json
-        {{
-            "decision": "request_additional_info",
-            "message": "<your answer to the small model's question>"
-        }}
-        ```
-        """
+        supervisor_reply_prompt = self._create_supervisor_reply_prompt(worker_question_response[0])
         
         # Add to supervisor messages
         supervisor_messages.append({"role": "user", "content": supervisor_reply_prompt})
-        
-        # Get supervisor response
-        supervisor_reply, supervisor_usage = self._get_supervisor_response(supervisor_messages)
-        
+        return True
+
+    def _add_supervisor_reply(
+        self,
+        supervisor_reply: List[str],
+        supervisor_messages: List[Dict[str, str]],
+        worker_messages: List[Dict[str, str]],
+        conversation_log: Dict[str, Any]
+    ):
+        """Pass the supervisor's answer to a worker question back to the worker."""
         # Add to supervisor messages
         supervisor_messages.append({"role": "assistant", "content": supervisor_reply[0]})
         
@@ -660,8 +708,6 @@ class Minion:
         # Add answer to worker messages
         worker_messages.append({"role": "user", "content": supervisor_answer})
         
-        return True, supervisor_usage + worker_follow_up_usage
-        
     def _run_conversation_rounds(
         self,
         task: str,
@@ -685,27 +731,55 @@ class Minion:
                 [m["content"] for m in worker_messages if m.get("content")]
             ))
         
+        # Worker turns started while the supervisor was still streaming: (messages, future)
+        speculative = None
+        speculation_pool = ThreadPoolExecutor(max_workers=1) if self.speculative_worker else None
+
+        def start_speculative_worker(messages):
+            nonlocal speculative
+            speculative = (messages, speculation_pool.submit(self.local_client.chat, messages=messages))
+
         # Main conversation loop
+        tracer = get_tracer()
+        round_span, round_start = NOOP_SPAN, (local_usage, remote_usage)
         for round_idx in range(max_rounds):
+            self._end_round_span(round_span, round_start, local_usage, remote_usage)
+            round_span = tracer.start_span("minion.round", round=round_idx + 1)
+            round_start = (local_usage, remote_usage)
+
             # Get worker's response
             if self.callback:
                 self.callback("worker", None, is_final=False)
             
             # Set up streaming output for worker responses
             print(colorize("★ Worker (Local) is thinking... ★", Colors.BOLD + Colors.GREEN + Colors.UNDERLINE))
-            buffer = ""
             
             def worker_stream_callback(chunk):
-                nonlocal buffer
                 # Print the chunk immediately
                 print(chunk, end="", flush=True)
-                buffer += chunk
             
-            # Call the client with the streaming callback
-            worker_response, worker_usage, _ = self.local_client.chat(
-                messages=worker_messages, 
-                stream_callback=worker_stream_callback
-            )
+            with tracer.span("minion.worker") as worker_span:
+                worker_result = None
+                if speculative is not None and speculative[0] == worker_messages:
+                    # The turn already ran while the supervisor finished its reply
+                    try:
+                        worker_result = speculative[1].result()
+                    except Exception as e:
+                        print(f"Speculative worker turn failed ({e}); running it again")
+                    else:
+                        print(worker_result[0][0], end="")
+                        worker_span.set_attribute("speculative", True)
+                elif speculative is not None:
+                    speculative[1].cancel()
+                if worker_result is None:
+                    # Call the client with the streaming callback
+                    worker_result = self.local_client.chat(
+                        messages=worker_messages, 
+                        stream_callback=worker_stream_callback
+                    )
+                worker_response, worker_usage, _ = worker_result
+                worker_span.set_usage(worker_usage)
+            speculative = None
             
             # Clear the buffer by printing a newline
             print("\n")
@@ -749,55 +823,33 @@ class Minion:
             # If this isn't the last round and we didn't have a follow-up, get next supervisor question
             if round_idx < max_rounds - 1 and not had_followup:
                 # Prepare supervisor prompt
-                supervisor_next_prompt = self._create_supervisor_prompt(worker_response[0])
-                supervisor_messages.append({"role": "user", "content": supervisor_next_prompt})
-                
-                # Add to conversation log
-                conversation_log["conversation"].append({
-                    "user": "remote",
-                    "prompt": supervisor_next_prompt,
-                    "output": None,
-                })
+                self._add_supervisor_prompt(worker_response[0], supervisor_messages, conversation_log)
                 
-                # Get supervisor's response
-                supervisor_response, supervisor_usage = self._get_supervisor_response(supervisor_messages)
+                # Get supervisor's response, starting the worker early if it asks for more
+                parser = (
+                    self._decision_parser(worker_messages, start_speculative_worker)
+                    if speculation_pool is not None
+                    else None
+                )
+                supervisor_response, supervisor_usage = self._get_supervisor_response(
+                    supervisor_messages, parser=parser
+                )
                 remote_usage += supervisor_usage
                 
-                # Parse supervisor's response
-                supervisor_content = supervisor_response[0]
-                
-                # Try to extract JSON from supervisor response
-                try:
-                    supervisor_json = json.loads(supervisor_content)
-                except json.JSONDecodeError:
-                    supervisor_json = extract_json(supervisor_content)
-                
                 # Check if supervisor wants to end conversation
-                supervisor_decision = supervisor_json.get("decision", "")
-                if supervisor_decision == "end_conversation":
-                    final_answer = supervisor_json.get("answer", "")
-                    conversation_log["generated_final_answer"] = final_answer
+                final_answer = self._apply_supervisor_decision(
+                    supervisor_response[0], supervisor_messages, worker_messages, conversation_log,
+                    supervisor_json=parser.result if parser is not None else None,
+                )
+                if final_answer is not None:
                     break
-                
-                # Add supervisor's response
-                supervisor_messages.append({"role": "assistant", "content": supervisor_content})
-                conversation_log["conversation"][-1]["output"] = supervisor_content
-                
-                if self.callback:
-                    self.callback("supervisor", supervisor_messages[-1])
-                
-                # Extract message for worker
-                supervisor_message = supervisor_json.get("message", supervisor_content)
-                
-                # Add to worker messages
-                worker_messages.append({"role": "user", "content": supervisor_message})
-                
-                # Add to conversation log
-                conversation_log["conversation"].append({
-                    "user": "local",
-                    "prompt": supervisor_message,
-                    "output": None,
-                })
+        
+        self._end_round_span(round_span, round_start, local_usage, remote_usage)
+
+        if speculative is not None:
+            speculative[1].cancel()
+        if speculation_pool is not None:
+            speculation_pool.shutdown(wait=False)
         
         # If we don't have a final answer yet, get one from the worker
         if not final_answer:
@@ -805,7 +857,167 @@ class Minion:
             conversation_log["generated_final_answer"] = final_answer
         
         return final_answer
+
+    @staticmethod
+    def _end_round_span(round_span, round_start, local_usage, remote_usage) -> None:
+        """End a round's span, recording the tokens used since ``round_start``."""
+        round_span.set_usage(local_usage, "local_", since=round_start[0])
+        round_span.set_usage(remote_usage, "remote_", since=round_start[1])
+        round_span.end()
+
+    def _add_supervisor_prompt(
+        self,
+        worker_response: str,
+        supervisor_messages: List[Dict[str, str]],
+        conversation_log: Dict[str, Any]
+    ):
+        """Ask the supervisor for its next decision on the worker's response."""
+        supervisor_next_prompt = self._create_supervisor_prompt(worker_response)
+        supervisor_messages.append({"role": "user", "content": supervisor_next_prompt})
+        
+        # Add to conversation log
+        conversation_log["conversation"].append({
+            "user": "remote",
+            "prompt": supervisor_next_prompt,
+            "output": None,
+        })
+
+    def _decision_parser(
+        self,
+        worker_messages: List[Dict[str, str]],
+        start_worker: Callable[[List[Dict[str, str]]], Any],
+    ) -> StreamingJSONParser:
+        """
+        Parser for a streamed supervisor decision.
+
+        Once the decision is complete and is anything but ``end_conversation``
+        (the rule `_apply_supervisor_decision` applies) and its ``message`` has
+        arrived, ``start_worker`` is called once with the messages the
+        worker's next turn will see.
+        """
+        started = False
+
+        def on_field(name: str, value: Any) -> None:
+            nonlocal started
+            fields = parser.fields
+            if (
+                started
+                or not isinstance(fields.get("decision"), str)
+                or fields["decision"] == "end_conversation"
+                or not isinstance(fields.get("message"), str)
+            ):
+                return
+            started = True
+            start_worker(worker_messages + [{"role": "user", "content": fields["message"]}])
+
+        parser = StreamingJSONParser(on_field=on_field, required_key="decision")
+        return parser
+
+    def _apply_supervisor_decision(
+        self,
+        supervisor_content: str,
+        supervisor_messages: List[Dict[str, str]],
+        worker_messages: List[Dict[str, str]],
+        conversation_log: Dict[str, Any],
+        supervisor_json: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        """
+        Act on the supervisor's decision.
+
+        Args:
+            supervisor_json: The decision already parsed from the stream, if any
+
+        Returns:
+            The final answer if the supervisor ended the conversation, else None
+        """
+        # Try to extract JSON from supervisor response
+        if supervisor_json is None:
+            try:
+                supervisor_json = json.loads(supervisor_content)
+            except json.JSONDecodeError:
+                supervisor_json = extract_json(supervisor_content)
+        
+        # Check if supervisor wants to end conversation
+        supervisor_decision = supervisor_json.get("decision", "")
+        if supervisor_decision == "end_conversation":
+            final_answer = supervisor_json.get("answer", "")
+            conversation_log["generated_final_answer"] = final_answer
+            return final_answer
+        
+        # Add supervisor's response
+        supervisor_messages.append({"role": "assistant", "content": supervisor_content})
+        conversation_log["conversation"][-1]["output"] = supervisor_content
+        
+        if self.callback:
+            self.callback("supervisor", supervisor_messages[-1])
+        
+        # Extract message for worker
+        supervisor_message = supervisor_json.get("message", supervisor_content)
+        
+        # Add to worker messages
+        worker_messages.append({"role": "user", "content": supervisor_message})
+        
+        # Add to conversation log
+        conversation_log["conversation"].append({
+            "user": "local",
+            "prompt": supervisor_message,
+            "output": None,
+        })
+        return None
+        
+    def _create_worker_uniqueness_prompt(self) -> str:
+        """Create the prompt asking the worker to rephrase a duplicate response."""
+        return """Your previous response was too similar to one you've already provided. 
+            Please provide a more unique and detailed perspective on the topic that adds new information.
+            Be specific and try to approach the question from a different angle. 
+            Avoid repeating similar points, phrases, or structures from your previous responses."""
+
+    def _create_worker_follow_up_prompt(self, task: str, worker_response: str) -> str:
+        """Create the prompt asking the worker whether it has a question for the supervisor."""
+        return f"""Based on your last response:
+        "{worker_response}"
+        
+        Do you have any questions you would like to ask the supervisor model? 
+        If so, please provide a clear, specific question that will help you better
+        understand or solve the task at hand. If you do not have any questions,
+        say "No questions at this time."
+        
+        Keep your question direct and focused on the task: "{task}"
         
+        Ensure your question is unique and hasn't been asked before. Ask something that
+        will provide new information or a different perspective on the task.
+        
+        The best questions are those that:
+        1. Seek clarification on aspects of the task you're unsure about
+        2. Request specific information that would help you provide a better response
+        3. Challenge assumptions in a constructive way
+        4. Explore perspectives that haven't been considered yet
+        5. Show critical thinking about the problem
+        
+        Remember: Your questions drive the conversation forward, so make them count!
+        """
+
+    def _create_supervisor_reply_prompt(self, question: str) -> str:
+        """Create the prompt asking the supervisor to answer a worker question."""
+        return f"""
+        ### Question
+        {question}
+        
+        ### Instructions
+        Please answer this specific question to help the small language model. Provide clear, 
+        helpful information directly related to this question. Remember that the small model
+        has access to the context, but may need guidance on how to interpret or use it.
+        
+        After thinking step-by-step, provide your answer in the following format:
+        
+        ```json
+        {{
+            "decision": "request_additional_info",
+            "message": "<your answer to the small model's question>"
+        }}
+        ```
+        """
+
     def _create_supervisor_prompt(self, worker_response: str) -> str:
         """Create the next prompt for the supervisor based on worker's response."""
         return f"""
@@ -865,15 +1077,20 @@ class Minion:
                 
         return None
     
-    def _generate_final_answer(self, task: str, worker_messages: List[Dict[str, str]]) -> str:
-        """Generate a final answer if one wasn't provided during conversation."""
-        final_answer_prompt = f"""
+    def _create_final_answer_prompt(self, task: str) -> str:
+        """Create the prompt asking the worker for its final answer."""
+        return f"""
         Based on our conversation so far, please provide your final answer to the original task:
         
         "{task}"
         
         Please be comprehensive but concise. Format your answer for readability.
         """
+
+    @traced("minion.final_answer")
+    def _generate_final_answer(self, task: str, worker_messages: List[Dict[str, str]]) -> str:
+        """Generate a final answer if one wasn't provided during conversation."""
+        final_answer_prompt = self._create_final_answer_prompt(task)
         
         # Get final answer from worker
         final_answer_result, _, _ = self.local_client.chat(
@@ -882,6 +1099,268 @@ class Minion:
         
         return final_answer_result[0]
     
+    async def _asetup_initial_messages(
+        self,
+        task: str,
+        context: str,
+        is_privacy: bool,
+        conversation_log: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, str]], List[Dict[str, str]], Optional[Dict[str, List[str]]]]:
+        """
+        Asynchronous variant of `_setup_initial_messages`.
+
+        Also returns the PII found in the worker's context (None without the
+        privacy shield), extracted while the local model rewrites the query.
+        """
+        if not is_privacy:
+            supervisor_messages, worker_messages = self._create_initial_messages(
+                task, task, context, conversation_log
+            )
+            return supervisor_messages, worker_messages, None
+
+        from minions.utils.pii_extraction import PIIExtractor
+
+        pii_extractor = await asyncio.to_thread(PIIExtractor)
+        query_pii_extracted = await asyncio.to_thread(pii_extractor.extract_pii, task)
+        reformat_query_task = REFORMAT_QUERY_PROMPT.format(
+            query=task, pii_extracted=str(query_pii_extracted)
+        )
+        worker_system_prompt = WORKER_SYSTEM_PROMPT.format(context=context, task=task)
+
+        (reformatted_task, _, _), pii_extracted = await asyncio.gather(
+            achat(self.local_client, [{"role": "user", "content": reformat_query_task}]),
+            asyncio.to_thread(pii_extractor.extract_pii, worker_system_prompt),
+        )
+        pii_reformatted_task = reformatted_task[0]
+
+        if self.callback:
+            self.callback("worker", f"**PII Reformated Task:**\n{pii_reformatted_task}")
+
+        supervisor_messages, worker_messages = self._create_initial_messages(
+            pii_reformatted_task, task, context, conversation_log
+        )
+        return supervisor_messages, worker_messages, pii_extracted
+
+    @traced("minion.supervisor")
+    async def _aget_supervisor_response(
+        self,
+        supervisor_messages: List[Dict[str, str]],
+        parser: Optional[StreamingJSONParser] = None,
+    ):
+        """Asynchronous variant of `_get_supervisor_response`."""
+        try:
+            print(colorize("\nSupervisor (Remote) is thinking...", Colors.BOLD + Colors.BLUE))
+
+            def supervisor_stream_callback(chunk):
+                _print_stream_chunk(chunk)
+                if parser is not None:
+                    parser.feed(chunk)
+
+            kwargs = {}
+            if getattr(self.remote_client, "supports_response_format", False):
+                kwargs["response_format"] = {"type": "json_object"}
+
+            supervisor_response, supervisor_usage, _ = await achat(
+                self.remote_client,
+                supervisor_messages,
+                stream_callback=supervisor_stream_callback,
+                **kwargs
+            )
+            print("\n")
+            current_span().set_usage(supervisor_usage)
+            return supervisor_response, supervisor_usage
+        except Exception as e:
+            print(f"Error getting supervisor response: {e}")
+            return [f"I encountered an error: {str(e)}. Could you help with this task?"], 0
+
+    async def _aprocess_worker_response(
+        self,
+        task: str,
+        worker_response: List[str],
+        worker_messages: List[Dict[str, str]],
+        conversation_log: Dict[str, Any],
+        is_privacy: bool,
+        pii_extracted: Optional[Dict[str, List[str]]] = None
+    ) -> Tuple[List[str], List[str], int]:
+        """
+        Asynchronous variant of `_process_worker_response` that also drafts the
+        worker's follow-up question.
+
+        With the privacy shield on, the question is drafted from the shielded
+        answer, since it is sent to the supervisor as well.
+
+        Returns:
+            (worker_response, worker_question_response, local_usage)
+        """
+        local_usage = 0
+        response_key = worker_response[0].strip()[:100]
+
+        if response_key in self.used_answers:
+            # For uniqueness requests, don't stream to avoid confusion
+            worker_response, _, _ = await achat(
+                self.local_client,
+                worker_messages + [{"role": "user", "content": self._create_worker_uniqueness_prompt()}],
+            )
+
+        self.used_answers.add(response_key)
+
+        if is_privacy:
+            if self.callback:
+                self.callback("worker", f"**_My output (pre-privacy shield):_**\n\n{worker_response[0]}")
+
+            shielded_response = await aapply_privacy_shield(
+                worker_response[0], self.local_client, pii_json=pii_extracted
+            )
+            worker_response = [shielded_response]
+
+            if self.callback:
+                self.callback("worker", f"**_My output (post-privacy shield):_**\n\n{shielded_response}")
+
+        worker_response[0] = self._emphasize_worker_response(worker_response[0])
+        worker_messages.append({"role": "assistant", "content": worker_response[0]})
+        conversation_log["conversation"].append({
+            "user": "local",
+            "prompt": None,
+            "output": worker_response[0]
+        })
+
+        follow_up_prompt = self._create_worker_follow_up_prompt(task, worker_response[0])
+        worker_question_response, follow_up_usage, _ = await achat(
+            self.local_client,
+            worker_messages + [{"role": "user", "content": follow_up_prompt}],
+        )
+
+        local_usage += follow_up_usage
+        return worker_response, worker_question_response, local_usage
+
+    async def _arun_conversation_rounds(
+        self,
+        task: str,
+        max_rounds: int,
+        supervisor_messages: List[Dict[str, str]],
+        worker_messages: List[Dict[str, str]],
+        conversation_log: Dict[str, Any],
+        is_privacy: bool,
+        pii_extracted: Optional[Dict[str, List[str]]] = None
+    ) -> Tuple[str, int, int]:
+        """
+        Asynchronous variant of `_run_conversation_rounds`.
+
+        Returns:
+            (final_answer, local_usage, remote_usage)
+        """
+        final_answer = None
+        local_usage = 0
+        remote_usage = 0
+        # Worker turn started while the supervisor was still streaming: (messages, future)
+        speculative = None
+        loop = asyncio.get_running_loop()
+
+        def start_speculative_worker(messages):
+            nonlocal speculative
+            # Stream callbacks of blocking clients run in a worker thread
+            future = asyncio.run_coroutine_threadsafe(achat(self.local_client, messages), loop)
+            speculative = (messages, future)
+
+        tracer = get_tracer()
+        round_span, round_start = NOOP_SPAN, (local_usage, remote_usage)
+        for round_idx in range(max_rounds):
+            self._end_round_span(round_span, round_start, local_usage, remote_usage)
+            round_span = tracer.start_span("minion.round", round=round_idx + 1)
+            round_start = (local_usage, remote_usage)
+
+            if self.callback:
+                self.callback("worker", None, is_final=False)
+
+            print(colorize("★ Worker (Local) is thinking... ★", Colors.BOLD + Colors.GREEN + Colors.UNDERLINE))
+            with tracer.span("minion.worker") as worker_span:
+                worker_result = None
+                if speculative is not None and speculative[0] == worker_messages:
+                    try:
+                        worker_result = await asyncio.wrap_future(speculative[1])
+                    except Exception as e:
+                        print(f"Speculative worker turn failed ({e}); running it again")
+                    else:
+                        print(worker_result[0][0], end="")
+                        worker_span.set_attribute("speculative", True)
+                elif speculative is not None:
+                    speculative[1].cancel()
+                if worker_result is None:
+                    worker_result = await achat(
+                        self.local_client, worker_messages, stream_callback=_print_stream_chunk
+                    )
+                worker_response, worker_usage, _ = worker_result
+                worker_span.set_usage(worker_usage)
+            speculative = None
+            print("\n")
+            local_usage += worker_usage
+
+            worker_response, worker_question_response, worker_extra_usage = await self._aprocess_worker_response(
+                task, worker_response, worker_messages, conversation_log, is_privacy, pii_extracted
+            )
+            local_usage += worker_extra_usage
+
+            had_followup = self._add_worker_question(
+                worker_question_response, supervisor_messages, conversation_log
+            )
+            if had_followup:
+                supervisor_reply, supervisor_usage = await self._aget_supervisor_response(supervisor_messages)
+                remote_usage += supervisor_usage
+                self._add_supervisor_reply(
+                    supervisor_reply, supervisor_messages, worker_messages, conversation_log
+                )
+
+            if self.callback:
+                self.callback("remote", None, is_final=False)
+
+            supervisor_response, supervisor_usage = await self._aget_supervisor_response(supervisor_messages)
+            remote_usage += supervisor_usage
+            self._add_supervisor_question(
+                supervisor_response, supervisor_messages, conversation_log,
+                already_displayed=True
+            )
+
+            final_answer = self._extract_final_answer(worker_response[0])
+            if final_answer:
+                conversation_log["generated_final_answer"] = final_answer
+                break
+
+            if round_idx < max_rounds - 1 and not had_followup:
+                self._add_supervisor_prompt(worker_response[0], supervisor_messages, conversation_log)
+
+                parser = (
+                    self._decision_parser(worker_messages, start_speculative_worker)
+                    if self.speculative_worker
+                    else None
+                )
+                supervisor_response, supervisor_usage = await self._aget_supervisor_response(
+                    supervisor_messages, parser=parser
+                )
+                remote_usage += supervisor_usage
+
+                final_answer = self._apply_supervisor_decision(
+                    supervisor_response[0], supervisor_messages, worker_messages, conversation_log,
+                    supervisor_json=parser.result if parser is not None else None,
+                )
+                if final_answer is not None:
+                    break
+
+        self._end_round_span(round_span, round_start, local_usage, remote_usage)
+
+        if speculative is not None:
+            speculative[1].cancel()
+
+        if not final_answer:
+            final_answer_result, final_usage, _ = await achat(
+                self.local_client,
+                worker_messages + [{"role": "user", "content": self._create_final_answer_prompt(task)}],
+            )
+            local_usage += final_usage
+            final_answer = final_answer_result[0]
+            conversation_log["generated_final_answer"] = final_answer
+
+        return final_answer, local_usage, remote_usage
+
     def _save_conversation_log(
         self, 
         conversation_log: Dict[str, Any], 
@@ -1,19 +1,28 @@
 from typing import List, Dict, Any, Optional, Union, Tuple
+import hashlib
 import json
-import re
+import pickle
 import json
 from pydantic import BaseModel, field_validator, Field
 from inspect import getsource
-from rank_bm25 import BM25Plus
-import numpy as np
 
+from minions.clients.base import chat_batch
 from minions.usage import Usage
+from minions.utils.cache import TTLCache
+from minions.utils.json_parsing import find_fenced_blocks, find_json_objects
+from minions.utils.sandbox import CodeSandbox, SharedCorpus, compile_code, source_hash
+from minions.utils.scheduling import order_for_prefix_reuse, prefix_hit_ratio
+from minions.utils.token_budget import TOKENS_PER_MESSAGE
+from minions.utils.tracing import NOOP_SPAN, current_span, get_tracer, traced
+from minions.utils.retrieval import ChunkRetriever, OllamaEmbedder, get_bm25_index
+from minions.utils.chunking import iter_chunk_spans
 
 from minions.prompts.minions import (
     WORKER_PROMPT_TEMPLATE,
     WORKER_OUTPUT_TEMPLATE,
     WORKER_ICL_EXAMPLES,
     WORKER_PROMPT_SHORT,
+    WORKER_PROMPT_SHARED_PREFIX,
     ADVICE_PROMPT,
     ADVICE_PROMPT_STEPS,
     DECOMPOSE_TASK_PROMPT,
@@ -34,12 +43,9 @@ from minions.prompts.minions import (
 def chunk_by_section(
     doc: str, max_chunk_size: int = 3000, overlap: int = 20
 ) -> List[str]:
-    sections = []
-    start = 0
-    while start < len(doc):
-        end = start + max_chunk_size
-        sections.append(doc[start:end])
-        start += max_chunk_size - overlap
+    sections = [
+        doc[start:end] for start, end in iter_chunk_spans(len(doc), max_chunk_size, overlap)
+    ]
     return sections
 
 
@@ -55,17 +61,9 @@ def retrieve_top_k_chunks(
         relevant_chunks = retrieve_top_k_chunks(queries.keys(), chunks, k=10, weights=queries)
     """
     weights = {keyword: weights.get(keyword, 1.0) for keyword in keywords}
-    bm25_retriever = BM25Plus(chunks)
-
-    final_scores = np.zeros(len(chunks))
-    for keyword, weight in weights.items():
-        scores = bm25_retriever.get_scores(keyword)
-        final_scores += weight * scores
-
-    top_k_indices = sorted(
-        range(len(final_scores)), key=lambda i: final_scores[i], reverse=True
-    )[:k]
-    top_k_indices = sorted(top_k_indices)
+    # the index is built once per chunk set and reused across queries and rounds
+    index = get_bm25_index(chunks)
+    top_k_indices = index.top_k(weights, k=k)
     relevant_chunks = [chunks[i] for i in top_k_indices]
     return relevant_chunks
 
@@ -154,6 +152,18 @@ USEFUL_IMPORTS = {
 }
 
 
+# Source snippets shown to the supervisor in the decomposition prompt; they never
+# change, so they are extracted once instead of on every round
+PROMPT_SOURCES = dict(
+    manifest_source=getsource(JobManifest),
+    output_source=getsource(JobOutput),
+    signature_source=getsource(prepare_jobs),
+    transform_signature_source=getsource(transform_outputs),
+    chunking_source=getsource(chunk_by_section).split("    sections = ")[0],
+    retrieval_source=getsource(retrieve_top_k_chunks).split("    weights = ")[0],
+)
+
+
 class Minions:
     def __init__(
         self,
@@ -179,11 +189,57 @@ class Minions:
         self.max_jobs_per_round = 2048
         self.callback = callback
         self.num_samples = 1 or kwargs.get("num_samples", None)
-        self.worker_batch_size = 1 or kwargs.get("worker_batch_size", None)
         self.max_code_attempts = kwargs.get("max_code_attempts", 10)
+        # worker jobs are sent through the local client's chat_batch with this
+        # many in flight (None: the client's own batch_size, e.g. OLLAMA_NUM_PARALLEL)
+        self.worker_batch_size = kwargs.get("worker_batch_size") or kwargs.get(
+            "max_concurrent_jobs"
+        )
+        self.job_timeout = kwargs.get("job_timeout", None)
+        # supervisor code runs in a pool of resource-limited worker processes;
+        # pass sandbox_code=False to execute it in this process instead
+        self.code_sandbox = None
+        if kwargs.get("sandbox_code", True):
+            self.code_sandbox = kwargs.get("code_sandbox") or CodeSandbox(
+                max_workers=kwargs.get("max_code_workers", 2),
+                wall_time=kwargs.get("code_timeout", 60),
+                memory_limit_mb=kwargs.get("code_memory_limit_mb", 2048),
+            )
+        # retrieve_top_k_chunks given to supervisor code when use_bm25=True:
+        # "bm25", "embedding" (local Ollama embeddings) or "hybrid"
+        self.retrieval_backend = kwargs.get("retrieval_backend", "bm25")
+        self.chunk_retriever = retrieve_top_k_chunks
+        if self.retrieval_backend != "bm25":
+            self.chunk_retriever = ChunkRetriever(
+                self.retrieval_backend,
+                embedder=OllamaEmbedder(
+                    kwargs.get("embedding_model", "nomic-embed-text"),
+                    host=kwargs.get("embedding_host", getattr(local_client, "host", None)),
+                ),
+                dense_weight=kwargs.get("hybrid_dense_weight", 0.5),
+            )
+        self._shared_context = None
+        self._context_digest = None
+        # outputs of supervisor code keyed by (code, inputs), so an unchanged
+        # block run on unchanged inputs is not executed again
+        self.code_result_cache = (
+            TTLCache(ttl=None, max_entries=128)
+            if kwargs.get("cache_code_results", True)
+            else None
+        )
+        # successful worker responses keyed by chunk+task+advice+model, so jobs
+        # repeated in later rounds are answered without another local call
+        self.job_result_store = (
+            TTLCache(ttl=None, max_entries=kwargs.get("max_stored_job_results", 16384))
+            if kwargs.get("reuse_job_results", True)
+            else None
+        )
         # TODO: removed worker_prompt
-        self.worker_prompt_template = WORKER_PROMPT_SHORT or kwargs.get(
-            "worker_prompt_template", None
+        # instructions-first template by default so worker prompts share a prefix
+        self.worker_prompt_template = kwargs.get("worker_prompt_template") or (
+            WORKER_PROMPT_SHARED_PREFIX
+            if kwargs.get("shared_prefix_prompts", True)
+            else WORKER_PROMPT_SHORT
         )
         self.worker_icl_examples = WORKER_ICL_EXAMPLES or kwargs.get(
             "worker_icl_examples", None
@@ -217,6 +273,102 @@ class Minions:
             "synthesis_final_prompt", None
         )
 
+    def _share_context(self, context: List[str]) -> SharedCorpus:
+        # The same context list is reused for every attempt and round of a call
+        if self._shared_context is None or self._shared_context[0] is not context:
+            if self._shared_context is not None:
+                self._shared_context[1].close()
+            self._shared_context = (context, SharedCorpus(context))
+        return self._shared_context[1]
+
+    def _code_result_key(
+        self, code: str, fn_name: str, kwargs: Dict[str, Any]
+    ) -> Optional[str]:
+        context = kwargs.get("context")
+        if context is not None and (
+            self._context_digest is None or self._context_digest[0] is not context
+        ):
+            digest = hashlib.sha256()
+            for doc in context:
+                digest.update(pickle.dumps(doc))
+            self._context_digest = (context, digest.hexdigest())
+        try:
+            inputs = pickle.dumps({k: v for k, v in kwargs.items() if k != "context"})
+        except Exception:
+            return None
+        key = hashlib.sha256()
+        key.update(f"{source_hash(code)}:{fn_name}:".encode("utf-8"))
+        if context is not None:
+            key.update(self._context_digest[1].encode("utf-8"))
+        key.update(inputs)
+        return key.hexdigest()
+
+    @traced("minions.code_exec")
+    def _execute_candidates(
+        self,
+        code_blocks: List[str],
+        starting_globals: Dict[str, Any] = {},
+        fn_name: str = "prepare_jobs",
+        **kwargs,
+    ) -> Tuple[Any, str]:
+        """Run the supervisor's candidate code blocks and return the first valid output.
+
+        A block that already ran on the same inputs returns its cached output.
+        """
+        span = current_span()
+        span.set_attributes(fn_name=fn_name, candidates=len(code_blocks), cached=False)
+        keys = {}
+        if self.code_result_cache is not None:
+            for code in code_blocks:
+                keys[code] = self._code_result_key(code, fn_name, kwargs)
+                cached = keys[code] and self.code_result_cache.get(keys[code])
+                if cached is not None:
+                    print(f"Reusing the output of an identical {fn_name} run")
+                    span.set_attribute("cached", True)
+                    return cached, code
+
+        output, code = self._run_candidates(
+            code_blocks, starting_globals=starting_globals, fn_name=fn_name, **kwargs
+        )
+        if keys.get(code):
+            self.code_result_cache.put(keys[code], output)
+        return output, code
+
+    def _run_candidates(
+        self,
+        code_blocks: List[str],
+        starting_globals: Dict[str, Any] = {},
+        fn_name: str = "prepare_jobs",
+        **kwargs,
+    ) -> Tuple[Any, str]:
+        """Execute the candidate code blocks, returning the first successful output.
+
+        With the sandbox enabled the candidates run in parallel worker processes
+        and the context is handed over through shared memory. Otherwise they are
+        tried in order with `_execute_code`. If all fail, the first error is raised.
+        """
+        if self.code_sandbox is None:
+            errors = []
+            for code in code_blocks:
+                try:
+                    return self._execute_code(
+                        code, starting_globals=starting_globals, fn_name=fn_name, **kwargs
+                    )
+                except Exception as e:
+                    errors.append(e)
+            raise errors[0]
+
+        shared = {}
+        if isinstance(kwargs.get("context"), list):
+            shared["context"] = self._share_context(kwargs.pop("context"))
+        return self.code_sandbox.run_first(
+            code_blocks,
+            fn_name,
+            starting_globals=starting_globals,
+            kwargs=kwargs,
+            shared=shared,
+        )
+
     def _execute_code(
         self,
         code: str,
@@ -224,10 +376,14 @@ class Minions:
         fn_name: str = "prepare_jobs",
         **kwargs,
     ) -> Tuple[Any, str]:
+        if self.code_sandbox is not None:
+            return self._run_candidates(
+                [code], starting_globals=starting_globals, fn_name=fn_name, **kwargs
+            )
         exec_globals = {
             **starting_globals
         }  # dictionary to store variables in the code block
-        exec(code, exec_globals)  # first execution, with example usage
+        exec(compile_code(code), exec_globals)  # first execution, with example usage
         if fn_name not in exec_globals:
             raise ValueError(f"Function {fn_name} not found in the code block.")
         output = exec_globals[fn_name](
@@ -237,6 +393,148 @@ class Minions:
         # call exec_globsl (filter_fnf)
         return output, code
 
+    def _job_key(self, job_manifest: JobManifest) -> str:
+        return TTLCache.make_key(
+            getattr(self.local_client, "model_name", None),
+            hashlib.sha256(job_manifest.chunk.encode("utf-8")).hexdigest(),
+            job_manifest.task,
+            job_manifest.advice,
+        )
+
+    def _fit_jobs_to_context(self, job_manifests: List[Any]) -> Tuple[List[Any], int]:
+        """Split jobs whose prompt would overflow the local model's context window.
+
+        Every piece keeps the job's task and advice, so the server never has to
+        truncate a worker prompt. Only applies to clients that expose a token
+        budget (``max_prompt_tokens`` and ``token_counter``, e.g. OllamaClient).
+
+        Returns:
+            The fitted job manifests and the number of jobs that were split
+        """
+        budget = getattr(self.local_client, "max_prompt_tokens", None)
+        counter = getattr(self.local_client, "token_counter", None)
+        if not budget or counter is None:
+            return list(job_manifests), 0
+
+        fitted, num_split = [], 0
+        for job_manifest in job_manifests:
+            overhead = TOKENS_PER_MESSAGE + counter.count(
+                self.worker_prompt_template.format(
+                    context="", task=job_manifest.task, advice=job_manifest.advice
+                )
+            )
+            # Leave a little slack: pieces are counted apart from the template
+            pieces = counter.split(
+                job_manifest.chunk, max(1, int(0.98 * (budget - overhead)))
+            )
+            if len(pieces) == 1:
+                fitted.append(job_manifest)
+                continue
+            num_split += 1
+            fitted.extend(
+                JobManifest(chunk=piece, task=job_manifest.task, advice=job_manifest.advice)
+                for piece in pieces
+            )
+        if num_split:
+            print(f"Split {num_split} jobs whose chunk exceeded the local context window")
+        return fitted, num_split
+
+    @traced("minions.worker_dispatch")
+    def _dispatch_worker_jobs(
+        self, job_manifests: List[JobManifest], worker_chats: List[Dict[str, Any]]
+    ) -> Tuple[List[str], Usage, List[str], Dict[str, int]]:
+        """Run the worker chats that have no stored result and merge in the rest.
+
+        Jobs repeated within the round are sent once, and jobs answered in an
+        earlier round (or call) reuse the stored response. The rest are sent in
+        the order that maximizes shared prompt prefixes on the server.
+
+        Returns:
+            Responses, usage and done reasons in job order, plus counts of the
+            jobs dispatched, reused from the store and deduplicated in the round,
+            the achievable prefix-cache hit ratio of the dispatched prompts and
+            the prompt tokens it would save
+        """
+        results: Dict[str, Tuple[str, str]] = {}
+        new_chats: Dict[str, Dict[str, Any]] = {}
+        keys = [self._job_key(job_manifest) for job_manifest in job_manifests]
+        for key, worker_messages in zip(keys, worker_chats):
+            if key in results or key in new_chats:
+                continue
+            stored = (
+                self.job_result_store.get(key)
+                if self.job_result_store is not None
+                else None
+            )
+            if stored is not None:
+                results[key] = (stored, "stop")
+            else:
+                new_chats[key] = worker_messages
+
+        new_keys = list(new_chats)
+        prompts = [new_chats[key]["content"] for key in new_keys]
+        order = order_for_prefix_reuse(prompts)
+        new_keys = [new_keys[i] for i in order]
+        hit_ratio = prefix_hit_ratio([prompts[i] for i in order])
+
+        stats = {
+            "jobs": len(keys),
+            "dispatched": len(new_chats),
+            "reused": len(results),
+            "deduplicated": len(keys) - len(new_chats) - len(results),
+            "prefix_hit_ratio": round(hit_ratio, 4),
+        }
+        print(
+            f"Sending {len(new_chats)} worker chats to the worker client "
+            f"({stats['reused']} reused, {stats['deduplicated']} duplicates, "
+            f"{hit_ratio:.0%} shared prefix)"
+        )
+        responses, usage, done_reasons = self._run_worker_jobs(
+            [new_chats[key] for key in new_keys]
+        )
+        # Local servers do not report prefix-cache hits, so the estimate is
+        # kept apart from the measured cached_prompt_tokens
+        stats["estimated_cached_prompt_tokens"] = int(usage.prompt_tokens * hit_ratio)
+        span = current_span()
+        span.set_attributes(**stats)
+        span.set_usage(usage)
+        for key, response, done_reason in zip(new_keys, responses, done_reasons):
+            results[key] = (response, done_reason)
+            if done_reason == "stop" and self.job_result_store is not None:
+                self.job_result_store.put(key, response)
+
+        return (
+            [results[key][0] for key in keys],
+            usage,
+            [results[key][1] for key in keys],
+            stats,
+        )
+
+    def _run_worker_jobs(
+        self, worker_chats: List[Dict[str, Any]]
+    ) -> Tuple[List[str], Usage, List[str]]:
+        """Send the worker chats as one batch and collect results in order.
+
+        Jobs that fail or time out get a done reason of "error" / "timeout" so the
+        caller can drop them the same way it drops truncated responses.
+        """
+        if not worker_chats:
+            return [], Usage(), []
+        return chat_batch(
+            self.local_client,
+            [[message] for message in worker_chats],
+            batch_size=self.worker_batch_size,
+            timeout=self.job_timeout,
+        )
+
+    @staticmethod
+    def _end_round_span(round_span, round_start, local_usage, remote_usage) -> None:
+        """End a round's span, recording the tokens used since ``round_start``."""
+        round_span.set_usage(local_usage, "local_", since=round_start[0])
+        round_span.set_usage(remote_usage, "remote_", since=round_start[1])
+        round_span.end()
+
+    @traced("minions")
     def __call__(
         self,
         task: str,
@@ -278,9 +576,11 @@ class Minions:
         if self.callback:
             self.callback("supervisor", None, is_final=False)
 
-        advice_response, usage = self.remote_client.chat(
-            supervisor_messages,
-        )
+        with get_tracer().span("minions.advice") as span:
+            advice_response, usage, _ = self.remote_client.chat(
+                supervisor_messages,
+            )
+            span.set_usage(usage)
         remote_usage += usage
 
         supervisor_messages.append(
@@ -296,36 +596,44 @@ class Minions:
         meta: List[Dict[str, any]] = []
         final_answer: Optional[str] = None
 
+        try:
+            total_chars = int(
+                doc_metadata.split("Total extracted text length: ")[1].split(
+                    " characters"
+                )[0]
+            )
+        except:
+            # compute characters in context
+            total_chars = sum(len(doc) for doc in context)
+
+        decompose_message_kwargs = dict(
+            num_samples=self.num_samples,
+            ADVANCED_STEPS_INSTRUCTIONS="",
+            **PROMPT_SOURCES,
+            num_tasks_per_round=num_tasks_per_round,
+            num_samples_per_task=num_samples_per_task,
+            total_chars=total_chars,
+        )
+
+        tracer = get_tracer()
+        if self.retrieval_backend != "bm25":
+            # Embed the chunks supervisor code is shown how to make up front,
+            # so the first pass over the corpus does not count against the
+            # code sandbox's wall-time limit
+            with tracer.span("minions.embed"):
+                try:
+                    self.chunk_retriever.prepare(
+                        [chunk for doc in context for chunk in chunk_by_section(doc)]
+                    )
+                except Exception as e:
+                    print(f"Could not embed the context for retrieval: {e}")
+
+        round_span, round_start = NOOP_SPAN, (local_usage, remote_usage)
         for round_idx in range(self.max_rounds):
+            self._end_round_span(round_span, round_start, local_usage, remote_usage)
+            round_span = tracer.start_span("minions.round", round=round_idx + 1)
+            round_start = (local_usage, remote_usage)
             print(f"Round {round_idx + 1}/{self.max_rounds}")
-            try:
-                total_chars = int(
-                    doc_metadata.split("Total extracted text length: ")[1].split(
-                        " characters"
-                    )[0]
-                )
-            except:
-                # compute characters in context
-                total_chars = sum(len(doc) for doc in context)
-
-            decompose_message_kwargs = dict(
-                num_samples=self.num_samples,
-                ADVANCED_STEPS_INSTRUCTIONS="",
-                manifest_source=getsource(JobManifest),
-                output_source=getsource(JobOutput),
-                signature_source=getsource(prepare_jobs),
-                transform_signature_source=getsource(transform_outputs),
-                # read_file_source=getsource(read_folder),
-                chunking_source="\n\n".join(
-                    [getsource(chunk_by_section).split("    sections = ")[0]]
-                ),
-                retrieval_source=getsource(retrieve_top_k_chunks).split(
-                    "    weights = "
-                )[0],
-                num_tasks_per_round=num_tasks_per_round,
-                num_samples_per_task=num_samples_per_task,
-                total_chars=total_chars,
-            )
 
             decompose_prompt = (
                 self.decompose_task_prompt
@@ -371,9 +679,11 @@ class Minions:
                 if self.callback:
                     self.callback("supervisor", None, is_final=False)
 
-                task_response, usage = self.remote_client.chat(
-                    messages=supervisor_messages,
-                )
+                with tracer.span("minions.decompose", attempt=attempt_idx + 1) as span:
+                    task_response, usage, _ = self.remote_client.chat(
+                        messages=supervisor_messages,
+                    )
+                    span.set_usage(usage)
                 remote_usage += usage
 
                 task_response = task_response[0]
@@ -383,15 +693,9 @@ class Minions:
                 if self.callback:
                     self.callback("supervisor", supervisor_messages[-1], is_final=True)
 
-                code_block_match = re.search(
-                    r"```(?:python)?\s*(.*?)```",
-                    task_response,
-                    re.DOTALL,
-                )
+                code_blocks = find_fenced_blocks(task_response, "python", strict=True)
 
-                if code_block_match:
-                    code_block = code_block_match.group(1).strip()
-                else:
+                if not code_blocks:
                     print(f"No code block found in the supervisor response.")
                     supervisor_messages.append(
                         {
@@ -405,7 +709,7 @@ class Minions:
                 starting_globals = {
                     **USEFUL_IMPORTS,
                     "chunk_by_section": chunk_by_section,
-                    "retrieve_top_k_chunks": retrieve_top_k_chunks,
+                    "retrieve_top_k_chunks": self.chunk_retriever,
                     "JobManifest": JobManifest,
                     "JobOutput": JobOutput,
                     "Job": Job,
@@ -425,13 +729,17 @@ class Minions:
                     ),
                 }
                 try:
-                    job_manifests, compiled_code_block = self._execute_code(
-                        code_block,
+                    job_manifests, code_block = self._execute_candidates(
+                        code_blocks,
                         starting_globals=starting_globals,
                         fn_name="prepare_jobs",  # the global variable to extract from the code block
                         **fn_kwargs,
                     )
 
+                    job_manifests, num_split_jobs = self._fit_jobs_to_context(
+                        job_manifests
+                    )
+
                     # We need to coerce the type below to ensure that the type is
                     # not a different `JobManifest` object the model defined in it's
                     # own code. We also need to set the chunk_id and task_id.
@@ -508,9 +816,8 @@ class Minions:
             if self.callback:
                 self.callback("worker", None, is_final=False)
 
-            print(f"Sending {len(worker_chats)} worker chats to the worker client")
-            worker_response, usage, done_reasons = self.local_client.chat(
-                worker_chats,
+            worker_response, usage, done_reasons, job_stats = self._dispatch_worker_jobs(
+                job_manifests, worker_chats
             )
             local_usage += usage
 
@@ -523,16 +830,14 @@ class Minions:
                     # Try to extract JSON if it's wrapped in other text
                     try:
                         # Look for JSON in code blocks
-                        json_match = re.search(r"```(?:json)?\s*(.*?)```", response, re.DOTALL)
-                        if json_match:
-                            json_str = json_match.group(1).strip()
-                            return JobOutput.model_validate_json(json_str)
+                        json_blocks = find_fenced_blocks(response, "json")
+                        if json_blocks:
+                            return JobOutput.model_validate_json(json_blocks[0])
                         
                         # Look for JSON objects
-                        json_match = re.search(r"\{.*\}", response, re.DOTALL)
-                        if json_match:
-                            json_str = json_match.group(0)
-                            return JobOutput.model_validate_json(json_str)
+                        json_objects = find_json_objects(response)
+                        if json_objects:
+                            return JobOutput.model_validate_json(max(json_objects, key=len))
                     except Exception as nested_e:
                         print(f"Failed second attempt to extract JSON: {nested_e}")
                     
@@ -554,6 +859,8 @@ class Minions:
                         citation=None,
                     )
                     continue
+                elif done_reason in ("timeout", "error"):
+                    continue
                 elif done_reason == "stop":
                     job_output = extract_job_output(response=sample)
                 else:
@@ -577,8 +884,8 @@ class Minions:
                 for job in jobs:
                     print(job.output.answer)
 
-                aggregated_str, code_block = self._execute_code(
-                    code_block,
+                aggregated_str, code_block = self._execute_candidates(
+                    [code_block],
                     starting_globals=starting_globals,
                     fn_name="transform_outputs",  # the global variable to extract from the code block
                     **fn_kwargs,
@@ -676,9 +983,11 @@ class Minions:
                     }
                 )
 
-                step_by_step_response, usage = self.remote_client.chat(
-                    supervisor_messages,
-                )
+                with tracer.span("minions.synthesis", step="cot") as span:
+                    step_by_step_response, usage, _ = self.remote_client.chat(
+                        supervisor_messages,
+                    )
+                    span.set_usage(usage)
                 remote_usage += usage
                 if self.callback:
                     self.callback("supervisor", step_by_step_response[0])
@@ -702,9 +1011,11 @@ class Minions:
                     if self.callback:
                         self.callback("supervisor", None, is_final=False)
                     # Request JSON response from remote client
-                    synthesized_response, usage = self.remote_client.chat(
-                        supervisor_messages, response_format={"type": "json_object"}
-                    )
+                    with tracer.span("minions.synthesis", step="json", attempt=attempt_idx + 1) as span:
+                        synthesized_response, usage, _ = self.remote_client.chat(
+                            supervisor_messages, response_format={"type": "json_object"}
+                        )
+                        span.set_usage(usage)
 
                     # Parse and validate JSON response
                     response_text = synthesized_response[0]
@@ -741,7 +1052,9 @@ class Minions:
                         "jobs": [
                             {k: v for k, v in job.model_dump().items() if k != "sample"}
                             for job in jobs
-                        ]
+                        ],
+                        "job_reuse": job_stats,
+                        "context_splits": num_split_jobs,
                     },
                     "remote": {"messages": supervisor_messages},
                 }
@@ -754,6 +1067,8 @@ class Minions:
                 feedback = obj.get("explanation", None)
                 scratchpad = obj.get("scratchpad", None)
 
+        self._end_round_span(round_span, round_start, local_usage, remote_usage)
+
         if final_answer == None:
             print(
                 f"Exhausted all rounds without finding a final answer. Returning the last synthesized response."
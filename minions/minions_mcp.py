@@ -1,3 +1,4 @@
+import concurrent.futures
 import json
 import os
 import subprocess
@@ -8,7 +9,7 @@ import requests
 import uuid
 import time
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Optional
 
 from mcp import ClientSession, StdioServerParameters
@@ -17,6 +18,9 @@ import asyncio
 from contextlib import AsyncExitStack
 
 from minions.minions import Minions, USEFUL_IMPORTS, JobManifest, JobOutput, Job
+from minions.utils.cache import TTLCache
+from minions.utils.sandbox import compile_code
+from minions.utils.tracing import get_tracer
 
 from minions.prompts.minions_mcp import (
     DECOMPOSE_TASK_PROMPT_AGGREGATION_FUNC,
@@ -31,6 +35,12 @@ class MCPServerConfig:
     command: str
     args: list[str]
     env: Optional[Dict[str, str]] = None
+    # Side-effect-free tools whose results may be reused ("cacheTools" in mcp.json)
+    cache_tools: List[str] = field(default_factory=list)
+    cache_ttl: Optional[float] = 300.0
+    cache_max_entries: int = 1024
+    # Seconds before the tool list is fetched again (None: list once per session)
+    tools_ttl: Optional[float] = None
 
 
 class MCPConfigManager:
@@ -74,6 +84,10 @@ class MCPConfigManager:
                         command=server_config["command"],
                         args=server_config["args"],
                         env=server_config.get("env"),
+                        cache_tools=server_config.get("cacheTools", []),
+                        cache_ttl=server_config.get("cacheTtl", 300.0),
+                        cache_max_entries=server_config.get("cacheMaxEntries", 1024),
+                        tools_ttl=server_config.get("toolsTtl"),
                     )
         except Exception as e:
             raise ValueError(f"Failed to load MCP config from {config_file}: {str(e)}")
@@ -90,19 +104,47 @@ class MCPConfigManager:
 
 
 class SyncMCPClient:
-    """A synchronous wrapper around the async MCP client API"""
+    """A synchronous wrapper around the async MCP client API
 
-    def __init__(self, server_name: str, config_manager: MCPConfigManager):
-        """Initialize the synchronous MCP client"""
+    The MCP session lives on an event loop in a background thread. Each tool call
+    is scheduled onto that loop with ``asyncio.run_coroutine_threadsafe`` and
+    answered through its own future, so any number of threads can have calls in
+    flight at once without sharing result state.
+    """
+
+    def __init__(
+        self,
+        server_name: str,
+        config_manager: MCPConfigManager,
+        tool_timeout: Optional[float] = 240,
+        max_concurrent_calls: int = 16,
+    ):
+        """Initialize the synchronous MCP client
+
+        Args:
+            server_name: Name of the server in the MCP config
+            config_manager: Loaded MCP configuration
+            tool_timeout: Default per-call timeout in seconds (None to wait forever)
+            max_concurrent_calls: Maximum tool calls in flight on the server at once
+        """
         self.server_name = server_name
         self.config_manager = config_manager
         self.server_config = self.config_manager.get_server_config(server_name)
+        self.tool_timeout = tool_timeout
+        self.max_concurrent_calls = max_concurrent_calls
         self._available_tools = []
+        self._tools_listed_at = 0.0
+        self._tool_cache = TTLCache(
+            ttl=self.server_config.cache_ttl,
+            max_entries=self.server_config.cache_max_entries,
+        )
+        self._cacheable_tools = set(self.server_config.cache_tools)
         self._asyncio_thread = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[ClientSession] = None
+        self._call_slots: Optional[asyncio.Semaphore] = None
+        self._shutdown: Optional[asyncio.Event] = None
         self._client_initialized = threading.Event()
-        self._result_ready = threading.Event()
-        self._request_queue = []
-        self._result = None
         self._error = None
         self._initialize()
 
@@ -110,6 +152,7 @@ class SyncMCPClient:
         """Run the asyncio event loop in a separate thread"""
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
+        self._loop = loop
 
         async def init_client():
             try:
@@ -132,39 +175,18 @@ class SyncMCPClient:
                         await session.initialize()
 
                         # Get available tools
-                        response = await session.list_tools()
-                        self._available_tools = [
-                            {
-                                "name": tool.name,
-                                "description": tool.description,
-                                "input_schema": tool.inputSchema,
-                            }
-                            for tool in response.tools
-                        ]
+                        await self._list_tools(session)
+
+                        self._session = session
+                        self._call_slots = asyncio.Semaphore(self.max_concurrent_calls)
+                        self._shutdown = asyncio.Event()
 
                         # Signal that the client is initialized
                         self._client_initialized.set()
 
-                        # Process requests
-                        while True:
-                            if not self._request_queue:
-                                await asyncio.sleep(0.1)  # Don't busy-wait
-                                continue
-
-                            # Get the next request
-                            tool_name, kwargs = self._request_queue.pop(0)
-
-                            try:
-                                # Execute the tool
-                                result = await session.call_tool(tool_name, kwargs)
-                                self._result = result
-                                self._error = None
-                            except Exception as e:
-                                self._result = None
-                                self._error = e
-
-                            # Signal that the result is ready
-                            self._result_ready.set()
+                        # Keep the session open; tool calls arrive via run_coroutine_threadsafe
+                        await self._shutdown.wait()
+                        self._session = None
 
             except Exception as e:
                 print(f"Error initializing MCP client: {e}")
@@ -172,7 +194,10 @@ class SyncMCPClient:
                 self._client_initialized.set()  # Signal even on error
 
         # Start the asyncio task
-        loop.run_until_complete(init_client())
+        try:
+            loop.run_until_complete(init_client())
+        finally:
+            loop.close()
 
     def _initialize(self):
         """Initialize the client in a separate thread"""
@@ -189,38 +214,187 @@ class SyncMCPClient:
         if self._error:
             raise self._error
 
+    async def _list_tools(self, session: ClientSession):
+        response = await session.list_tools()
+        self._available_tools = [
+            {
+                "name": tool.name,
+                "description": tool.description,
+                "input_schema": tool.inputSchema,
+            }
+            for tool in response.tools
+        ]
+        self._tools_listed_at = time.monotonic()
+
+    def refresh_tools(self) -> List[Dict[str, Any]]:
+        """Fetch the tool list from the server again"""
+        asyncio.run_coroutine_threadsafe(
+            self._list_tools(self._session), self._loop
+        ).result(timeout=self.tool_timeout)
+        return self._available_tools
+
     @property
     def available_tools(self) -> List[Dict[str, Any]]:
-        """Get the list of available tools"""
+        """Get the list of available tools, listed once and reused until toolsTtl expires"""
+        tools_ttl = self.server_config.tools_ttl
+        if (
+            tools_ttl is not None
+            and self._session is not None
+            and time.monotonic() - self._tools_listed_at >= tools_ttl
+        ):
+            self.refresh_tools()
         return self._available_tools
 
-    def execute_tool(self, tool_name: str, **kwargs) -> Any:
-        """Execute a tool with the given parameters synchronously"""
-        # Reset flags
-        self._result_ready.clear()
-
-        # Expand home directory if needed
+    @staticmethod
+    def _prepare_arguments(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Expand home directory in path arguments"""
+        arguments = dict(arguments)
         if (
-            "path" in kwargs
-            and isinstance(kwargs["path"], str)
-            and "~" in kwargs["path"]
+            "path" in arguments
+            and isinstance(arguments["path"], str)
+            and "~" in arguments["path"]
         ):
-            kwargs["path"] = os.path.expanduser(kwargs["path"])
+            arguments["path"] = os.path.expanduser(arguments["path"])
+        return arguments
+
+    async def _call_tool(
+        self, tool_name: str, arguments: Dict[str, Any], timeout: Optional[float]
+    ) -> Any:
+        async with self._call_slots:
+            return await asyncio.wait_for(
+                self._session.call_tool(tool_name, arguments), timeout
+            )
+
+    def submit_tool(
+        self,
+        tool_name: str,
+        arguments: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> concurrent.futures.Future:
+        """Schedule a tool call without waiting for it
+
+        Args:
+            tool_name: Name of the MCP tool
+            arguments: Tool arguments
+            timeout: Per-call timeout in seconds (default: tool_timeout)
+
+        Returns:
+            A future for the tool result; cancelling it cancels the call
+        """
+        if self._session is None:
+            raise RuntimeError(f"MCP client for '{self.server_name}' is not running")
+
+        arguments = self._prepare_arguments(arguments or {})
+        tracer = get_tracer()
+        parent = tracer.current_span()
+        start_ns = time.time_ns()
+
+        cache_key = None
+        if tool_name in self._cacheable_tools:
+            cache_key = TTLCache.make_key(tool_name, arguments)
+            cached = self._tool_cache.get(cache_key)
+            if cached is not None:
+                future = concurrent.futures.Future()
+                future.set_result(cached)
+                tracer.record_span(
+                    "mcp.tool", start_ns, time.time_ns(), parent=parent,
+                    tool=tool_name, cached=True,
+                )
+                return future
+        else:
+            # Any other tool may have side effects that change what the cached ones return
+            self._tool_cache.clear()
+
+        print(f"Executing tool {tool_name} with args: {arguments}")
+        future = asyncio.run_coroutine_threadsafe(
+            self._call_tool(
+                tool_name,
+                arguments,
+                self.tool_timeout if timeout is None else timeout,
+            ),
+            self._loop,
+        )
+        if cache_key is not None:
+            future.add_done_callback(lambda f: self._remember_result(cache_key, f))
+        if tracer.enabled:
+            # The call completes on the client's event loop thread
+            future.add_done_callback(
+                lambda f: tracer.record_span(
+                    "mcp.tool", start_ns, time.time_ns(), parent=parent,
+                    tool=tool_name, cached=False,
+                    error=f.cancelled() or f.exception() is not None,
+                )
+            )
+        return future
 
-        print(f"Executing tool {tool_name} with args: {kwargs}")
+    def _remember_result(self, cache_key: str, future: concurrent.futures.Future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        result = future.result()
+        if not getattr(result, "isError", False):
+            self._tool_cache.put(cache_key, result)
 
-        # Add request to queue
-        self._request_queue.append((tool_name, kwargs))
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit/miss counters of the tool result cache"""
+        return self._tool_cache.stats()
 
-        # Wait for the result
-        if not self._result_ready.wait(timeout=240):
+    def execute_tool(self, tool_name: str, **kwargs) -> Any:
+        """Execute a tool with the given parameters synchronously"""
+        future = self.submit_tool(tool_name, kwargs)
+        try:
+            return future.result()
+        except (asyncio.TimeoutError, concurrent.futures.TimeoutError):
             raise TimeoutError(f"Timed out waiting for tool {tool_name} to execute")
 
-        # Check if there was an error
-        if self._error:
-            raise self._error
+    def execute_tools(
+        self,
+        calls: List[Tuple[str, Dict[str, Any]]],
+        timeout: Optional[float] = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Execute several tool calls concurrently
 
-        return self._result
+        Args:
+            calls: (tool_name, arguments) pairs
+            timeout: Per-call timeout in seconds (default: tool_timeout)
+            return_exceptions: Return errors in place of results instead of raising
+
+        Returns:
+            Results in the same order as ``calls``
+        """
+        futures = [
+            self.submit_tool(tool_name, arguments, timeout=timeout)
+            for tool_name, arguments in calls
+        ]
+        results = []
+        try:
+            for (tool_name, _), future in zip(calls, futures):
+                try:
+                    results.append(future.result())
+                except (asyncio.TimeoutError, concurrent.futures.TimeoutError):
+                    error = TimeoutError(f"Timed out waiting for tool {tool_name} to execute")
+                    if not return_exceptions:
+                        raise error
+                    results.append(error)
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    results.append(e)
+        finally:
+            for future in futures:
+                future.cancel()
+        return results
+
+    def close(self):
+        """Shut down the MCP session and its event loop thread"""
+        if self._loop is not None and self._shutdown is not None and not self._loop.is_closed():
+            try:
+                self._loop.call_soon_threadsafe(self._shutdown.set)
+            except RuntimeError:
+                # Loop already stopped
+                pass
+        if self._asyncio_thread is not None:
+            self._asyncio_thread.join(timeout=10)
 
     def format_output(self, output: Any) -> str:
         """Format the output of a tool"""
@@ -239,6 +413,11 @@ class SyncMCPToolExecutor:
         output = self.mcp_client.execute_tool(tool_name, **kwargs)
         return self.mcp_client.format_output(output)
 
+    def execute_tools(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """Execute several MCP tool calls concurrently, returning outputs in order"""
+        outputs = self.mcp_client.execute_tools(calls)
+        return [self.mcp_client.format_output(output) for output in outputs]
+
     # def format_output(self, output: Any) -> str:
     #     """Format the output of a tool"""
     #     return self.mcp_client.format_output(output)
@@ -271,6 +450,10 @@ class SyncMinionsMCP(Minions):
 
         kwargs["decompose_task_prompt"] = decompose_task_prompt
         kwargs["decompose_task_prompt_abbreviated"] = decompose_task_prompt_abbreviated
+        # The code calls mcp_tools, which is bound to this process's MCP session
+        kwargs.setdefault("sandbox_code", False)
+        # Tool calls may return fresh data, so the code is always re-run
+        kwargs.setdefault("cache_code_results", False)
 
         # Set up the parent class
         super().__init__(
@@ -287,6 +470,7 @@ class SyncMinionsMCP(Minions):
             server_name=mcp_server_name, config_manager=self.mcp_config_manager
         )
         self.mcp_tool_executor = SyncMCPToolExecutor(self.mcp_client)
+        self._mcp_tools_info: Optional[Tuple[List[Dict[str, Any]], str]] = None
 
     def _execute_code(
         self,
@@ -305,9 +489,9 @@ class SyncMinionsMCP(Minions):
         print("About to execute code...")
         # Compile and execute the code
         try:
-            compile(code, "<string>", "exec")
+            compiled = compile_code(code)
             print("Code compiled successfully")
-            exec(code, exec_globals)
+            exec(compiled, exec_globals)
             print("Code executed successfully")
 
             if fn_name not in exec_globals:
@@ -324,20 +508,14 @@ class SyncMinionsMCP(Minions):
             print(f"Error executing code: {e}")
             raise
 
-    def __call__(
-        self,
-        task: str,
-        doc_metadata: str,
-        context: List[str],
-        max_rounds=None,
-        num_tasks_per_round=3,
-        num_samples_per_task=1,
-        use_bm25=False,
-    ):
-        """Run the minions protocol with MCP tools available"""
-        # Generate MCP tools info
+    def _format_mcp_tools_info(self) -> str:
+        """Describe the MCP tools for the supervisor, reusing the text while the tool list is unchanged"""
+        tools = self.mcp_client.available_tools
+        if self._mcp_tools_info is not None and self._mcp_tools_info[0] is tools:
+            return self._mcp_tools_info[1]
+
         mcp_tools_info = "# Available MCP Tools\n\n"
-        for tool in self.mcp_client.available_tools:
+        for tool in tools:
             mcp_tools_info += f"## {tool['name']}\n\n"
             mcp_tools_info += f"**Description**: {tool['description']}\n\n"
 
@@ -350,6 +528,28 @@ class SyncMinionsMCP(Minions):
 
             mcp_tools_info += f"**Usage**: mcp_tools.execute_tool(\"{tool['name']}\", {', '.join([f'{p}={p}' for p in params])})\n\n"
 
+        mcp_tools_info += (
+            "To run several independent tool calls at once, use "
+            "`mcp_tools.execute_tools([(\"tool_name\", {\"arg\": value}), ...])`, "
+            "which returns the outputs in the same order.\n\n"
+        )
+
+        self._mcp_tools_info = (tools, mcp_tools_info)
+        return mcp_tools_info
+
+    def __call__(
+        self,
+        task: str,
+        doc_metadata: str,
+        context: List[str],
+        max_rounds=None,
+        num_tasks_per_round=3,
+        num_samples_per_task=1,
+        use_bm25=False,
+    ):
+        """Run the minions protocol with MCP tools available"""
+        mcp_tools_info = self._format_mcp_tools_info()
+
         # Run the parent class call with MCP tools info
         result = super().__call__(
             task=task,
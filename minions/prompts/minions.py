@@ -87,6 +87,40 @@ class JobOutput(BaseModel):
 Your response:"""
 
 
+# Same content as WORKER_PROMPT_SHORT, but the fixed instructions come first so
+# every worker prompt shares one long prefix (and jobs on the same chunk share
+# an even longer one) that the serving engine can reuse from its KV cache.
+WORKER_PROMPT_SHARED_PREFIX = """
+You will be given a document excerpt, a task and higher-level advice on how to approach the task.
+
+Your response should be a `JobOutput` object:
+```python
+class JobOutput(BaseModel):
+  explanation: str # A concise statement of your reasoning (string). If no relevant information is found, set to "None" or "".
+  citation: str | None # A direct snippet of the text that supports your answer (string). If no relevant information is found, set to None or "".
+  answer: str | None # Your answer to the question (string). If no relevant information is found, set your answer to None or "".
+```
+
+--------------------------------
+Here is the document excerpt:
+
+{context}
+
+--------------------------------
+And here is your task:
+
+{task}
+
+--------------------------------
+And here is additional higher-level advice on how to approach the task:
+
+{advice}
+
+--------------------------------
+
+Your response (a `JobOutput` object):"""
+
+
 REMOTE_ANSWER_OR_CONTINUE = """\
 Now synthesize the findings from multiple junior workers (LLMs). 
 Your task is to finalize an answer to the question below **if and only if** you have sufficient, reliable information. 
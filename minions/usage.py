@@ -18,6 +18,11 @@ class Usage:
     # conversation history.
     seen_prompt_tokens: int = 0
 
+    # Calls answered from (or missed in) the response cache, see
+    # minions.clients.cached.CachedClient
+    cache_hits: int = 0
+    cache_misses: int = 0
+
     @property
     def new_prompt_tokens(self) -> int:
         if self.seen_prompt_tokens is None:
@@ -29,13 +34,35 @@ class Usage:
         return self.completion_tokens + self.prompt_tokens
 
     def __add__(self, other: "Usage") -> "Usage":
+        if other is None or other == 0:
+            return self
         return Usage(
             completion_tokens=self.completion_tokens + other.completion_tokens,
             prompt_tokens=self.prompt_tokens + other.prompt_tokens,
             cached_prompt_tokens=self.cached_prompt_tokens + other.cached_prompt_tokens,
             seen_prompt_tokens=self.seen_prompt_tokens + other.seen_prompt_tokens,
+            cache_hits=self.cache_hits + other.cache_hits,
+            cache_misses=self.cache_misses + other.cache_misses,
         )
+
+    def __radd__(self, other) -> "Usage":
+        # Support sum() on lists of Usage objects
+        if other == 0 or other is None:
+            return self
+        return self.__add__(other)
     
+    @classmethod
+    def from_openai(cls, usage: Any) -> "Usage":
+        """Build from an OpenAI-compatible ``usage`` object, including cached prompt tokens."""
+        if usage is None:
+            return cls()
+        details = getattr(usage, "prompt_tokens_details", None)
+        return cls(
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+            cached_prompt_tokens=getattr(details, "cached_tokens", 0) or 0,
+        )
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "completion_tokens": self.completion_tokens,
@@ -44,9 +71,54 @@ class Usage:
             "cached_prompt_tokens": self.cached_prompt_tokens,
             "seen_prompt_tokens": self.seen_prompt_tokens,
             "new_prompt_tokens": self.new_prompt_tokens,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
         }
 
 
+@dataclass
+class GenerationMetrics:
+    """
+    Server-reported timing for a single model call.
+
+    Durations are in seconds. ``time_to_first_token`` is measured on the client
+    and is only known for streamed calls.
+    """
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_duration: float = 0.0
+    load_duration: float = 0.0
+    prompt_eval_duration: float = 0.0
+    eval_duration: float = 0.0
+    time_to_first_token: Optional[float] = None
+
+    @property
+    def tokens_per_sec(self) -> float:
+        return self.completion_tokens / self.eval_duration if self.eval_duration > 0 else 0.0
+
+    @property
+    def prompt_tokens_per_sec(self) -> float:
+        return self.prompt_tokens / self.prompt_eval_duration if self.prompt_eval_duration > 0 else 0.0
+
+    @property
+    def usage(self) -> Usage:
+        return Usage(
+            prompt_tokens=self.prompt_tokens,
+            completion_tokens=self.completion_tokens,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_duration": self.total_duration,
+            "load_duration": self.load_duration,
+            "prompt_eval_duration": self.prompt_eval_duration,
+            "eval_duration": self.eval_duration,
+            "time_to_first_token": self.time_to_first_token,
+            "tokens_per_sec": self.tokens_per_sec,
+            "prompt_tokens_per_sec": self.prompt_tokens_per_sec,
+        }
 
 
 def num_tokens_from_messages_openai(
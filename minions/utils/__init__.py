@@ -7,15 +7,21 @@ import json
 import functools
 from typing import Dict, Any, Optional
 
+from minions.utils.json_parsing import (
+    escape_control_chars_in_strings,
+    find_fenced_blocks,
+    find_json_objects,
+)
+
 # Expose privacy_shield module
-from minions.utils.privacy_shield import apply_privacy_shield
+from minions.utils.privacy_shield import apply_privacy_shield, aapply_privacy_shield
 
 
 @functools.lru_cache(maxsize=32)
 def escape_newlines_in_strings(json_str: str) -> str:
     """
     Escape newlines in JSON strings to ensure proper parsing.
-    Uses a regular expression to find string content and replace newlines.
+    Scans the text once, tracking string boundaries and escaped quotes.
     
     Args:
         json_str: JSON string to process
@@ -23,14 +29,7 @@ def escape_newlines_in_strings(json_str: str) -> str:
     Returns:
         Processed JSON string with escaped newlines in string values
     """
-    def replace_newlines(match):
-        # Replace literal newlines with \\n
-        content = match.group(0)
-        return content.replace('\n', '\\n')
-    
-    # This pattern matches content inside double quotes, handling escaped quotes
-    pattern = r'"(?:[^"\\]|\\.)*"'
-    return re.sub(pattern, replace_newlines, json_str)
+    return escape_control_chars_in_strings(json_str)[0]
 
 
 def extract_json(text: str) -> Dict[str, Any]:
@@ -44,7 +43,7 @@ def extract_json(text: str) -> Dict[str, Any]:
         Extracted JSON as a dictionary
     """
     # Try to find JSON enclosed in triple backticks
-    json_matches = re.findall(r'```(?:json)?\s*([\s\S]*?)\s*```', text)
+    json_matches = find_fenced_blocks(text, "json")
     
     # If found in triple backticks
     if json_matches:
@@ -62,7 +61,7 @@ def extract_json(text: str) -> Dict[str, Any]:
                     continue
     
     # If not found in triple backticks, try to find JSON using brackets
-    curly_matches = re.findall(r'({[\s\S]*?})', text)
+    curly_matches = find_json_objects(text)
     
     for json_str in curly_matches:
         try:
@@ -0,0 +1,310 @@
+"""
+Streaming document chunking over memory-mapped files.
+
+Chunks are described by offsets instead of being materialised as strings, so a
+multi-GB folder can be chunked with constant memory: the text of a chunk is
+only decoded when a caller asks for it.
+
+This is a library API: the CLI and the Minions protocol still hand documents
+around as strings (the ingestion pipeline has to extract PDFs and the like to
+text first, and the worker jobs are built from `chunk_by_section`'s string
+chunks), so only `iter_chunk_spans` is shared with them.
+"""
+
+import mmap
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+# Preferred places to end a chunk, strongest first
+PARAGRAPH_BREAKS = (b"\n\n",)
+SENTENCE_BREAKS = (b". ", b"? ", b"! ", b".\n", b"?\n", b"!\n", b"\n")
+
+FILE_HEADER_PREFIX = b"--- BEGIN FILE: "
+DEFAULT_EXTENSIONS = (".txt", ".md", ".py")
+
+
+@dataclass(frozen=True)
+class ChunkDescriptor:
+    """A chunk of a document, described by its byte range."""
+
+    doc_id: str
+    start: int
+    end: int
+    section: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+
+def iter_chunk_spans(
+    length: int, max_chunk_size: int = 3000, overlap: int = 20
+) -> Iterator[Tuple[int, int]]:
+    """
+    Yield fixed-size (start, end) spans with ``overlap`` between consecutive spans.
+
+    These are the same boundaries `chunk_by_section` uses.
+    """
+    if overlap >= max_chunk_size:
+        raise ValueError("overlap must be smaller than max_chunk_size")
+    start = 0
+    while start < length:
+        yield start, min(start + max_chunk_size, length)
+        start += max_chunk_size - overlap
+
+
+class MappedDocument:
+    """
+    A read-only, memory-mapped document.
+
+    The raw bytes are never copied as a whole: searches run directly on the
+    mmap and `text` only decodes the requested range.
+    """
+
+    def __init__(self, source: Union[str, bytes], doc_id: Optional[str] = None):
+        """
+        Args:
+            source: Path of the file to map, or an in-memory bytes object
+            doc_id: Identifier reported in chunk descriptors (default: the path)
+        """
+        self._file = None
+        self._mmap = None
+        if isinstance(source, (bytes, bytearray)):
+            self.doc_id = doc_id or "<memory>"
+            self.buffer = bytes(source)
+        else:
+            self.doc_id = doc_id or source
+            self._file = open(source, "rb")
+            if os.fstat(self._file.fileno()).st_size == 0:
+                # empty files cannot be mapped
+                self.buffer = b""
+            else:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.buffer = self._mmap
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def view(self, start: int, end: int) -> memoryview:
+        """Zero-copy view of a byte range."""
+        return memoryview(self.buffer)[start:end]
+
+    def text(self, start: int, end: int) -> str:
+        """Decode a byte range to text."""
+        with self.view(start, end) as view:
+            return str(view, "utf-8", errors="replace")
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "MappedDocument":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _align_to_char(buffer, pos: int, lower: int) -> int:
+    """Move ``pos`` back so it does not split a UTF-8 multi-byte character."""
+    while pos > lower and pos < len(buffer) and (buffer[pos] & 0xC0) == 0x80:
+        pos -= 1
+    return pos
+
+
+def _find_break(buffer, start: int, end: int) -> int:
+    """
+    Return the best place to end a chunk within (start, end].
+
+    Paragraph breaks win over sentence breaks; a break is only taken if it
+    keeps at least half of the window, otherwise the chunk is cut at ``end``.
+    """
+    lower = start + (end - start) // 2
+    for breaks in (PARAGRAPH_BREAKS, SENTENCE_BREAKS):
+        best = -1
+        for marker in breaks:
+            pos = buffer.rfind(marker, lower, end)
+            if pos != -1:
+                best = max(best, pos + len(marker))
+        if best != -1:
+            return best
+    return end
+
+
+def _last_section(buffer, start: int, end: int) -> Optional[str]:
+    """Return the last section header (markdown heading or file marker) in [start, end)."""
+    best_pos = -1
+    for marker, skip in ((b"\n#", 1), (b"\n" + FILE_HEADER_PREFIX, 1)):
+        pos = buffer.rfind(marker, start, end)
+        if pos != -1 and pos > best_pos:
+            best_pos = pos + skip
+    if start == 0 and best_pos == -1 and len(buffer) and (
+        buffer[:1] == b"#" or buffer[: len(FILE_HEADER_PREFIX)] == FILE_HEADER_PREFIX
+    ):
+        best_pos = 0
+    if best_pos == -1:
+        return None
+    line_end = buffer.find(b"\n", best_pos, min(len(buffer), best_pos + 512))
+    if line_end == -1:
+        line_end = min(len(buffer), best_pos + 512)
+    line = bytes(buffer[best_pos:line_end]).decode("utf-8", errors="replace")
+    return line.strip().strip("-").strip() or None
+
+
+def iter_chunks(
+    document: MappedDocument,
+    max_chunk_size: int = 3000,
+    overlap: int = 20,
+    respect_boundaries: bool = True,
+    token_counter: Optional[Callable[[str], int]] = None,
+    max_tokens: Optional[int] = None,
+) -> Iterator[ChunkDescriptor]:
+    """
+    Lazily chunk a document into descriptors.
+
+    Args:
+        document: The document to chunk
+        max_chunk_size: Maximum chunk size in bytes
+        overlap: Number of bytes shared by consecutive chunks
+        respect_boundaries: End chunks at paragraph/sentence breaks when possible
+        token_counter: Optional function returning the number of tokens in a string
+            (e.g. ``lambda s: len(encoding.encode(s))``)
+        max_tokens: Token budget per chunk; requires ``token_counter``
+
+    Yields:
+        ChunkDescriptor for each chunk, carrying the most recent section header
+    """
+    if overlap >= max_chunk_size:
+        raise ValueError("overlap must be smaller than max_chunk_size")
+    if max_tokens is not None and token_counter is None:
+        raise ValueError("max_tokens requires a token_counter")
+
+    buffer = document.buffer
+    length = len(buffer)
+    section = None
+    scanned = 0
+    start = 0
+
+    while start < length:
+        end = min(start + max_chunk_size, length)
+        if end < length:
+            if respect_boundaries:
+                end = _find_break(buffer, start, end)
+            end = _align_to_char(buffer, end, start + 1)
+
+        if max_tokens is not None:
+            # Shrink the window proportionally until it fits the budget
+            while end - start > 1:
+                num_tokens = token_counter(document.text(start, end))
+                if num_tokens <= max_tokens:
+                    break
+                target = start + max(1, int((end - start) * max_tokens / num_tokens * 0.95))
+                if respect_boundaries:
+                    target = _find_break(buffer, start, target)
+                end = _align_to_char(buffer, min(target, end - 1), start + 1)
+
+        # Section headers are tracked incrementally so each byte is scanned once
+        header = _last_section(buffer, scanned, end)
+        if header is not None:
+            section = header
+        scanned = end
+
+        yield ChunkDescriptor(doc_id=document.doc_id, start=start, end=end, section=section)
+
+        if end >= length:
+            break
+        start = max(end - overlap, start + 1)
+        start = _align_to_char(buffer, start, 0)
+
+
+class MappedCorpus:
+    """
+    A collection of memory-mapped text files chunked lazily.
+
+    Only a bounded number of files stay mapped at a time, so iterating over a
+    large folder keeps memory constant. Documents that an `iter_chunks`
+    generator is still reading are pinned and never evicted.
+    """
+
+    def __init__(self, paths: Iterable[str], root: Optional[str] = None, max_open: int = 32):
+        """
+        Args:
+            paths: Files in the corpus
+            root: If set, document ids are paths relative to this folder
+            max_open: Maximum number of files kept mapped at once
+        """
+        self.root = root
+        self.max_open = max_open
+        self.paths = {}
+        for path in paths:
+            doc_id = os.path.relpath(path, root) if root else path
+            self.paths[doc_id] = path
+        self._open: "OrderedDict[str, MappedDocument]" = OrderedDict()
+        self._pins: Dict[str, int] = {}
+
+    @classmethod
+    def from_folder(
+        cls, folder_path: str, extensions: Tuple[str, ...] = DEFAULT_EXTENSIONS, **kwargs
+    ) -> "MappedCorpus":
+        """Build a corpus from every file with a supported extension under ``folder_path``."""
+        folder_path = os.path.expanduser(folder_path)
+        paths = []
+        for root, _, files in os.walk(folder_path):
+            for file in sorted(files):
+                if file.lower().endswith(extensions):
+                    paths.append(os.path.join(root, file))
+        return cls(paths, root=folder_path, **kwargs)
+
+    def document(self, doc_id: str) -> MappedDocument:
+        """Return the mapped document for ``doc_id``, mapping it if needed."""
+        document = self._open.get(doc_id)
+        if document is not None:
+            self._open.move_to_end(doc_id)
+            return document
+        document = MappedDocument(self.paths[doc_id], doc_id=doc_id)
+        self._open[doc_id] = document
+        self._evict(keep=doc_id)
+        return document
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Unmap the least recently used unpinned documents until at most ``max_open`` are left."""
+        for doc_id in list(self._open):
+            if len(self._open) <= self.max_open:
+                break
+            if doc_id == keep or self._pins.get(doc_id):
+                continue
+            self._open.pop(doc_id).close()
+
+    def iter_chunks(self, **kwargs) -> Iterator[ChunkDescriptor]:
+        """Yield chunk descriptors for every document; see `iter_chunks` for options."""
+        for doc_id in self.paths:
+            document = self.document(doc_id)
+            self._pins[doc_id] = self._pins.get(doc_id, 0) + 1
+            try:
+                yield from iter_chunks(document, **kwargs)
+            finally:
+                self._pins[doc_id] -= 1
+                if not self._pins[doc_id]:
+                    del self._pins[doc_id]
+                self._evict()
+
+    def text(self, chunk: ChunkDescriptor) -> str:
+        """Decode the text of a chunk."""
+        return self.document(chunk.doc_id).text(chunk.start, chunk.end)
+
+    def close(self) -> None:
+        for document in self._open.values():
+            document.close()
+        self._open.clear()
+
+    def __enter__(self) -> "MappedCorpus":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,153 @@
+"""
+Bounded-concurrency executor for independent worker jobs.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence
+
+
+@dataclass
+class JobResult:
+    """
+    Outcome of a single job run by the JobExecutor.
+    """
+    index: int
+    value: Any = None
+    error: Optional[BaseException] = None
+    latency: float = 0.0
+    timed_out: bool = False
+    started_at: float = 0.0  # wall-clock time (time.time()) the job started
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.timed_out
+
+
+class JobExecutor:
+    """
+    Run independent jobs concurrently with a fixed number of in-flight slots.
+
+    Jobs are started in order and at most ``max_concurrency`` of them run at any
+    time, so the caller never floods the server with more requests than it has
+    parallel slots for. Results are returned in the same order as the inputs,
+    regardless of completion order.
+
+    A job that exceeds ``timeout`` seconds (measured from the moment it started,
+    not from submission) is reported as timed out. The underlying thread cannot
+    be killed, so it is abandoned and its eventual result discarded; since its
+    request is still open, it keeps its slot until the thread really finishes.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        timeout: Optional[float] = None,
+        on_result: Optional[Callable[[JobResult], None]] = None,
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            max_concurrency: Maximum number of jobs running at the same time
+            timeout: Optional per-job timeout in seconds
+            on_result: Optional callback invoked with each JobResult as it completes
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.on_result = on_result
+
+    @staticmethod
+    def _run_one(
+        fn: Callable[[Any], Any],
+        index: int,
+        item: Any,
+        done_queue: "queue.Queue[JobResult]",
+    ) -> None:
+        started_at = time.time()
+        start = time.monotonic()
+        try:
+            value = fn(item)
+            result = JobResult(index=index, value=value)
+        except Exception as e:
+            result = JobResult(index=index, error=e)
+        result.latency = time.monotonic() - start
+        result.started_at = started_at
+        done_queue.put(result)
+
+    def map(self, fn: Callable[[Any], Any], items: Sequence[Any]) -> List[JobResult]:
+        """
+        Apply ``fn`` to every item and return one JobResult per item, in input order.
+
+        Args:
+            fn: Function to run for each item (e.g. a single worker chat request)
+            items: The job inputs
+
+        Returns:
+            List of JobResult objects, aligned with ``items``
+        """
+        results: List[Optional[JobResult]] = [None] * len(items)
+        done_queue: "queue.Queue[JobResult]" = queue.Queue()
+        in_flight = {}  # index -> start time
+        abandoned = set()  # indices of timed-out jobs whose threads still run
+        next_idx = 0
+
+        while next_idx < len(items) or in_flight:
+            # Fill free slots; new jobs only start once a running one finishes
+            while (
+                next_idx < len(items)
+                and len(in_flight) + len(abandoned) < self.max_concurrency
+            ):
+                threading.Thread(
+                    target=self._run_one,
+                    args=(fn, next_idx, items[next_idx], done_queue),
+                    daemon=True,
+                ).start()
+                in_flight[next_idx] = time.monotonic()
+                next_idx += 1
+
+            wait_for = None
+            if self.timeout is not None and in_flight:
+                oldest = min(in_flight.values())
+                wait_for = max(0.0, oldest + self.timeout - time.monotonic())
+
+            try:
+                result = done_queue.get(timeout=wait_for)
+            except queue.Empty:
+                result = None
+
+            if result is not None and result.index in in_flight:
+                del in_flight[result.index]
+                self._record(results, result)
+            elif result is not None:
+                abandoned.discard(result.index)
+
+            if self.timeout is not None:
+                now = time.monotonic()
+                for index, started in list(in_flight.items()):
+                    if now - started >= self.timeout:
+                        del in_flight[index]
+                        abandoned.add(index)
+                        self._record(
+                            results,
+                            JobResult(
+                                index=index,
+                                error=TimeoutError(
+                                    f"Job {index} timed out after {self.timeout}s"
+                                ),
+                                latency=now - started,
+                                timed_out=True,
+                                started_at=time.time() - (now - started),
+                            ),
+                        )
+
+        return results
+
+    def _record(self, results: List[Optional[JobResult]], result: JobResult) -> None:
+        results[result.index] = result
+        if self.on_result:
+            self.on_result(result)
@@ -0,0 +1,327 @@
+"""
+Parallel, cached document ingestion for folders of PDF and text files.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+SUPPORTED_EXTENSIONS = (".txt", ".py", ".pdf", ".md")
+TEXT_EXTENSIONS = (".txt", ".py", ".md")
+
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def iter_pdf_pages(source: Union[str, bytes]) -> Iterator[str]:
+    """
+    Yield the text of a PDF one page at a time.
+
+    Args:
+        source: Path to a PDF file or the raw PDF bytes
+    """
+    import fitz  # PyMuPDF
+
+    if isinstance(source, (bytes, bytearray)):
+        doc = fitz.open(stream=source, filetype="pdf")
+    else:
+        doc = fitz.open(source)
+    try:
+        for page in doc:
+            yield page.get_text()
+    finally:
+        doc.close()
+
+
+def pdf_to_text(source: Union[str, bytes]) -> str:
+    """Extract the full text of a PDF without repeated string concatenation."""
+    return "".join(iter_pdf_pages(source))
+
+
+def read_file_text(file_path: str) -> str:
+    """Extract text from a PDF, TXT, Python, or Markdown file."""
+    if file_path.lower().endswith(".pdf"):
+        return pdf_to_text(file_path)
+    elif file_path.lower().endswith(TEXT_EXTENSIONS):
+        with open(file_path, "r", encoding="utf-8") as f:
+            return f.read()
+    raise ValueError(
+        "Unsupported file format. Only PDF, TXT, PY, and MD files are supported."
+    )
+
+
+def hash_file(file_path: str) -> str:
+    """SHA-256 of a file's contents, read in fixed-size blocks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _extract_worker(file_path: str, cache_dir: Optional[str]) -> Tuple[str, str, bool]:
+    """
+    Process-pool entry point: return (sha256, text, cache_hit) for one file.
+
+    Extracted text is stored under its content hash, so a renamed or touched
+    file whose bytes did not change is still served from the cache.
+    """
+    sha = hash_file(file_path)
+    cached_path = os.path.join(cache_dir, f"{sha}.txt") if cache_dir else None
+    if cached_path and os.path.exists(cached_path):
+        with open(cached_path, "r", encoding="utf-8") as f:
+            return sha, f.read(), True
+
+    text = read_file_text(file_path)
+    if cached_path:
+        tmp_path = f"{cached_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, cached_path)
+    return sha, text, False
+
+
+@dataclass
+class IngestionStats:
+    """
+    Progress and throughput of an ingestion run.
+    """
+    files_total: int = 0
+    files_done: int = 0
+    files_failed: int = 0
+    cache_hits: int = 0
+    bytes_read: int = 0
+    chars_extracted: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def files_per_sec(self) -> float:
+        return self.files_done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def mb_per_sec(self) -> float:
+        return self.bytes_read / (1024 * 1024) / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "files_total": self.files_total,
+            "files_done": self.files_done,
+            "files_failed": self.files_failed,
+            "cache_hits": self.cache_hits,
+            "bytes_read": self.bytes_read,
+            "chars_extracted": self.chars_extracted,
+            "elapsed": self.elapsed,
+            "files_per_sec": self.files_per_sec,
+            "mb_per_sec": self.mb_per_sec,
+        }
+
+
+class IngestionPipeline:
+    """
+    Extract text from many files across a process pool, with an on-disk cache.
+
+    A small SQLite index maps (path, size, mtime) to the content hash of each
+    file, so unchanged files are served from the cache without being re-read or
+    re-hashed. Results are yielded in input order as soon as they are ready.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        use_cache: bool = True,
+        progress_callback: Optional[Callable[[IngestionStats, str], None]] = None,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            max_workers: Number of extraction processes (default: CPU count)
+            cache_dir: Directory for extracted text (default: ~/.cache/minions/extracted)
+            use_cache: Whether to read and write the extraction cache
+            progress_callback: Called with (stats, path) after every file
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_cache = use_cache
+        self.progress_callback = progress_callback
+        self.stats = IngestionStats()
+
+        self.cache_dir = None
+        self._index = None
+        self._index_lock = threading.Lock()
+        if use_cache:
+            self.cache_dir = cache_dir or os.path.join(
+                os.environ.get(
+                    "MINIONS_CACHE_DIR",
+                    os.path.join(os.path.expanduser("~"), ".cache", "minions"),
+                ),
+                "extracted",
+            )
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._index = sqlite3.connect(
+                os.path.join(self.cache_dir, "index.sqlite"), check_same_thread=False
+            )
+            self._index.execute(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    sha256 TEXT NOT NULL
+                )
+                """
+            )
+            self._index.commit()
+
+    @staticmethod
+    def list_files(
+        folder_path: str, extensions: Tuple[str, ...] = SUPPORTED_EXTENSIONS
+    ) -> List[str]:
+        """Return all supported files under ``folder_path`` in a stable order."""
+        paths = []
+        for root, _, files in os.walk(folder_path):
+            for file in files:
+                if file.lower().endswith(extensions):
+                    paths.append(os.path.join(root, file))
+        return sorted(paths)
+
+    def _lookup(self, path: str, st: os.stat_result) -> Optional[str]:
+        """Return cached text for an unchanged file, if any."""
+        if self._index is None:
+            return None
+        with self._index_lock:
+            row = self._index.execute(
+                "SELECT sha256 FROM files WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (path, st.st_size, st.st_mtime_ns),
+            ).fetchone()
+        if row is None:
+            return None
+        cached_path = os.path.join(self.cache_dir, f"{row[0]}.txt")
+        try:
+            with open(cached_path, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _remember(self, path: str, st: os.stat_result, sha: str) -> None:
+        if self._index is None:
+            return
+        with self._index_lock:
+            self._index.execute(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+                (path, st.st_size, st.st_mtime_ns, sha),
+            )
+            self._index.commit()
+
+    def _record(self, path: str, size: int, text: Optional[str], cache_hit: bool) -> None:
+        if text is None:
+            self.stats.files_failed += 1
+        else:
+            self.stats.files_done += 1
+            self.stats.bytes_read += size
+            self.stats.chars_extracted += len(text)
+            self.stats.cache_hits += int(cache_hit)
+        if self.progress_callback:
+            self.progress_callback(self.stats, path)
+
+    def ingest(self, paths: List[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Extract text from ``paths``.
+
+        Yields:
+            (path, text) in input order; text is None if extraction failed
+        """
+        self.stats = IngestionStats(files_total=len(paths))
+
+        # Serve unchanged files straight from the index, queue the rest
+        ready: Dict[int, Optional[str]] = {}
+        stats_by_idx: Dict[int, os.stat_result] = {}
+        pending: List[int] = []
+        for idx, path in enumerate(paths):
+            try:
+                st = os.stat(path)
+            except OSError:
+                ready[idx] = None
+                continue
+            stats_by_idx[idx] = st
+            text = self._lookup(os.path.abspath(path), st)
+            if text is not None:
+                ready[idx] = text
+            else:
+                pending.append(idx)
+
+        results = iter(())
+        pool = None
+        if pending:
+            pending_paths = [paths[idx] for idx in pending]
+            cache_dir = self.cache_dir if self.use_cache else None
+            if self.max_workers > 1 and len(pending) > 1:
+                pool = ProcessPoolExecutor(max_workers=min(self.max_workers, len(pending)))
+                futures = [pool.submit(_extract_worker, p, cache_dir) for p in pending_paths]
+                results = (future for future in futures)
+            else:
+                results = (_InlineResult(_extract_worker, p, cache_dir) for p in pending_paths)
+
+        try:
+            pending_iter = iter(pending)
+            next_pending = next(pending_iter, None)
+            for idx, path in enumerate(paths):
+                if idx == next_pending:
+                    next_pending = next(pending_iter, None)
+                    try:
+                        sha, text, cache_hit = next(results).result()
+                        self._remember(os.path.abspath(path), stats_by_idx[idx], sha)
+                    except Exception as e:
+                        print(f"Error processing {path}: {str(e)}")
+                        text, cache_hit = None, False
+                else:
+                    text, cache_hit = ready[idx], ready[idx] is not None
+                size = stats_by_idx[idx].st_size if idx in stats_by_idx else 0
+                self._record(path, size, text, cache_hit)
+                yield path, text
+        finally:
+            if pool is not None:
+                # cancel_futures needs Python 3.9; cancel the queued files by hand
+                for future in futures:
+                    future.cancel()
+                pool.shutdown(wait=False)
+            self.stats.finished_at = time.monotonic()
+
+    def ingest_folder(self, folder_path: str) -> Dict[str, str]:
+        """
+        Extract every supported file under ``folder_path``.
+
+        Returns:
+            Mapping of path relative to ``folder_path`` to extracted text
+        """
+        folder_path = os.path.expanduser(folder_path)
+        contents = {}
+        for path, text in self.ingest(self.list_files(folder_path)):
+            if text:
+                contents[os.path.relpath(path, folder_path)] = text
+        return contents
+
+    def close(self) -> None:
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+
+class _InlineResult:
+    """Future-like wrapper so single-process extraction shares the pool code path."""
+
+    def __init__(self, fn, *args):
+        self._fn = fn
+        self._args = args
+
+    def result(self):
+        return self._fn(*self._args)
@@ -0,0 +1,282 @@
+"""
+Single-pass helpers for the JSON that models emit.
+
+StreamingJSONParser reads a JSON object from a token stream and reports each
+top-level field as soon as its value is complete, so callers can act on a
+supervisor's ``decision`` before the rest of the completion has arrived.
+find_json_objects and find_fenced_blocks locate JSON in a finished response.
+All of them jump between structural characters with compiled regexes or
+``str.find``, so each character is looked at once and long, brace-heavy model
+outputs are scanned in linear time.
+"""
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_STRUCTURAL = re.compile(r'["{}\[\],:]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_OBJECT_START = re.compile(r'\{\s*"')
+# A double-quoted string (unterminated at the end of the text is allowed),
+# written as an unrolled loop so the regex engine never backtracks
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"?'
+# A run of text outside strings that starts with a backslash escape
+_ESCAPED_RUN = r'\\.[^"\\]*(?:\\.[^"\\]*)*'
+_STRING_OR_ESCAPE = re.compile(_ESCAPED_RUN + "|" + _STRING, re.DOTALL)
+_OBJECT_TOKEN = re.compile(_STRING + r"|[{}]", re.DOTALL)
+_FENCE = "```"
+
+
+def _loads(raw: str) -> Any:
+    try:
+        # strict=False accepts raw newlines inside strings, which models often emit
+        return json.loads(raw, strict=False)
+    except json.JSONDecodeError:
+        return raw.strip()
+
+
+def escape_control_chars_in_strings(text: str) -> Tuple[str, bool]:
+    """
+    Escape raw newlines, carriage returns and tabs inside JSON strings.
+
+    Returns:
+        The escaped text and whether it ended inside an unterminated string
+    """
+    in_string = False
+
+    def escape(match: "re.Match[str]") -> str:
+        nonlocal in_string
+        token = match.group()
+        if token[0] != '"':
+            # Escapes outside any string are left alone
+            return token
+        if len(token) == 1 or token[-1] != '"':
+            in_string = True
+        else:
+            in_string = token[-2] == "\\" and _ends_escaped(token)
+        if "\n" in token:
+            token = token.replace("\n", "\\n")
+        if "\r" in token or "\t" in token:
+            token = token.replace("\r", "\\r").replace("\t", "\\t")
+        return token
+
+    return _STRING_OR_ESCAPE.sub(escape, text), in_string
+
+
+def _ends_escaped(token: str) -> bool:
+    # True if the final quote of a string token is itself escaped
+    backslashes = len(token) - 1 - len(token[:-1].rstrip("\\"))
+    return backslashes % 2 == 1
+
+
+def find_json_objects(text: str, include_partial: bool = False) -> List[str]:
+    """
+    Find the outermost balanced ``{...}`` spans in ``text``, in order.
+
+    Braces inside JSON strings are ignored. If a stray ``{`` never closes, the
+    complete objects nested inside it are still returned.
+
+    Args:
+        text: Text that may contain JSON objects
+        include_partial: Also return the unterminated object at the end of a
+            truncated response, from its opening brace
+
+    Returns:
+        The object spans, as substrings of ``text``
+    """
+    open_positions: List[int] = []
+    # (start, end) of every closed object, in closing order
+    closed: List[Tuple[int, int]] = []
+    pos = 0
+    while True:
+        start = text.find("{", pos)
+        if start < 0:
+            break
+        open_positions = [start]
+        for match in _OBJECT_TOKEN.finditer(text, start + 1):
+            char = text[match.start()]
+            if char == "{":
+                open_positions.append(match.start())
+            elif char == "}":
+                closed.append((open_positions.pop(), match.end()))
+                if not open_positions:
+                    pos = match.end()
+                    break
+        else:
+            # Reached the end of the text inside an object
+            break
+
+    # Inner objects close before the objects containing them, so walking
+    # backwards each kept span starts before everything it contains
+    objects: List[str] = []
+    outer_start = len(text) + 1
+    for start, end in reversed(closed):
+        if start < outer_start:
+            objects.append(text[start:end])
+            outer_start = start
+    objects.reverse()
+    if include_partial and open_positions:
+        objects.append(text[open_positions[0] :])
+    return objects
+
+
+def find_fenced_blocks(text: str, language: str = "", strict: bool = False) -> List[str]:
+    """
+    Return the stripped contents of the Markdown code fences in ``text``.
+
+    Args:
+        text: Text that may contain fenced code blocks
+        language: Info string to drop from the start of a block (e.g. "json")
+        strict: Only keep blocks tagged ``language`` or not tagged at all
+    """
+    blocks: List[str] = []
+    pos = 0
+    while True:
+        start = text.find(_FENCE, pos)
+        if start < 0:
+            break
+        end = text.find(_FENCE, start + len(_FENCE))
+        if end < 0:
+            break
+        body = text[start + len(_FENCE) : end]
+        pos = end + len(_FENCE)
+        if strict and "\n" in body:
+            info = body.split("\n", 1)[0].strip()
+            if info and info != language:
+                continue
+        if language and body.startswith(language):
+            body = body[len(language) :]
+        blocks.append(body.strip())
+    return blocks
+
+
+class StreamingJSONParser:
+    """
+    Incremental parser for the first JSON object in a stream of text chunks.
+
+    Text before the object (reasoning, a ```json fence) is skipped. Every
+    top-level field is parsed as soon as its value ends and passed to
+    ``on_field(name, value)``; nested objects and arrays are reported whole.
+    If ``required_key`` is set, objects without it (e.g. an example in the
+    preamble) are discarded and the parser moves on to the next one.
+    """
+
+    def __init__(
+        self,
+        on_field: Optional[Callable[[str, Any], None]] = None,
+        required_key: Optional[str] = None,
+    ):
+        self.on_field = on_field
+        self.required_key = required_key
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+        self._text = ""
+        self._pos = 0
+        self._reset_object()
+
+    def _reset_object(self) -> None:
+        self.fields = {}
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._expect = "key"  # key | colon | value | nested | comma
+        self._key: Optional[str] = None
+        self._string_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+
+    @property
+    def result(self) -> Optional[Dict[str, Any]]:
+        """The parsed object once it is complete, else None."""
+        return self.fields if self.done else None
+
+    def _emit(self, value: Any) -> None:
+        if self._key is None:
+            return
+        self.fields[self._key] = value
+        if self.on_field is not None:
+            self.on_field(self._key, value)
+
+    def feed(self, chunk: str) -> None:
+        """Consume the next chunk of the stream."""
+        if self.done or not chunk:
+            return
+        self._text += chunk
+        text = self._text
+        pos = self._pos
+
+        while pos < len(text) and not self.done:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(text, pos)
+                if match is None:
+                    pos = len(text)
+                    break
+                if match.group() == "\\":
+                    if match.end() >= len(text):
+                        # Wait for the escaped character
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                self._in_string = False
+                pos = match.end()
+                if self._string_start is not None:
+                    value = _loads(text[self._string_start : pos])
+                    self._string_start = None
+                    if self._expect == "key":
+                        self._key = value if isinstance(value, str) else str(value)
+                        self._expect = "colon"
+                    else:
+                        self._emit(value)
+                        self._expect = "comma"
+                continue
+
+            if not self._started:
+                match = _OBJECT_START.search(text, pos)
+                if match is None:
+                    # Keep a trailing "{" whose key has not arrived yet
+                    brace = text.rfind("{", pos)
+                    pos = brace if brace >= 0 and not text[brace + 1 :].strip() else len(text)
+                    break
+                self._started = True
+                self._depth = 1
+                pos = match.start() + 1
+                continue
+
+            match = _STRUCTURAL.search(text, pos)
+            if match is None:
+                pos = len(text)
+                break
+            char, idx = match.group(), match.start()
+            pos = idx + 1
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect in ("key", "value"):
+                    self._string_start = idx
+            elif char in "{[":
+                if self._depth == 1 and self._expect == "value":
+                    self._value_start = idx
+                    self._expect = "nested"
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._expect == "nested":
+                    self._emit(_loads(text[self._value_start : idx + 1]))
+                    self._expect = "comma"
+                elif self._depth == 0:
+                    if self._expect == "value":
+                        self._emit(_loads(text[self._value_start : idx]))
+                    if self.required_key is None or self.required_key in self.fields:
+                        self.done = True
+                    else:
+                        self._reset_object()
+            elif self._depth == 1:
+                if char == ":" and self._expect == "colon":
+                    self._expect = "value"
+                    self._value_start = idx + 1
+                elif char == ",":
+                    if self._expect == "value":
+                        self._emit(_loads(text[self._value_start : idx]))
+                    self._expect = "key"
+
+        self._pos = pos
@@ -0,0 +1,490 @@
+"""
+Retrieval indexes used by `retrieve_top_k_chunks`.
+
+Three backends share the RetrievalIndex interface: lexical BM25+, dense
+embeddings from a local Ollama model (stored in an on-disk VectorStore so each
+chunk is embedded once), and a hybrid that blends the two.
+"""
+
+import hashlib
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from minions.utils.vector_store import (
+    DEFAULT_BLOCK_ROWS,
+    VectorStore,
+    content_key,
+    get_vector_store,
+)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokenizer shared by indexing and querying."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class RetrievalIndex:
+    """
+    Base class for indexes over a fixed list of chunks.
+
+    Subclasses implement `get_scores`, which scores every chunk against a
+    mapping of query string to weight; higher scores are more relevant.
+    """
+
+    num_docs: int = 0
+
+    def get_scores(self, weighted_queries: Dict[str, float]) -> np.ndarray:
+        raise NotImplementedError("Subclasses must implement get_scores()")
+
+    def top_k(self, weighted_queries: Dict[str, float], k: int = 10) -> List[int]:
+        """Return the indices of the ``k`` best chunks, in document order."""
+        if k >= self.num_docs:
+            return list(range(self.num_docs))
+        if k <= 0:
+            return []
+        scores = self.get_scores(weighted_queries)
+        top = np.argpartition(-scores, k - 1)[:k]
+        return sorted(top.tolist())
+
+
+class BM25Index(RetrievalIndex):
+    """
+    BM25+ index over a fixed list of chunks.
+
+    Postings (document ids and term frequencies, grouped by term) and the
+    per-document length normalisation are computed once at construction, so a
+    query only touches the postings of its own terms. All weighted query terms
+    are scored together in a single vectorized pass.
+    """
+
+    def __init__(
+        self, chunks: Sequence[str], k1: float = 1.5, b: float = 0.75, delta: float = 1.0
+    ):
+        """
+        Build the index.
+
+        Args:
+            chunks: The documents to index
+            k1: BM25 term frequency saturation parameter
+            b: BM25 length normalisation parameter
+            delta: BM25+ lower bound for the term frequency component
+        """
+        self.k1 = k1
+        self.b = b
+        self.delta = delta
+        self.num_docs = len(chunks)
+
+        vocab: Dict[str, int] = {}
+        term_ids: List[int] = []
+        doc_ids: List[int] = []
+        tfs: List[int] = []
+        doc_lengths = np.zeros(self.num_docs, dtype=np.float64)
+
+        for doc_id, chunk in enumerate(chunks):
+            tokens = tokenize(chunk)
+            doc_lengths[doc_id] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                term_ids.append(vocab.setdefault(term, len(vocab)))
+                doc_ids.append(doc_id)
+                tfs.append(tf)
+
+        self.vocab = vocab
+        term_ids_arr = np.asarray(term_ids, dtype=np.int64)
+        order = np.argsort(term_ids_arr, kind="stable")
+        self._doc_ids = np.asarray(doc_ids, dtype=np.int64)[order]
+        self._tfs = np.asarray(tfs, dtype=np.float64)[order]
+
+        # postings for term t live in [_offsets[t], _offsets[t + 1])
+        df = np.bincount(term_ids_arr, minlength=len(vocab))
+        self._offsets = np.concatenate(([0], np.cumsum(df)))
+        self._idf = np.log((self.num_docs + 1) / np.maximum(df, 1))
+
+        avgdl = doc_lengths.mean() if self.num_docs else 0.0
+        if avgdl == 0:
+            avgdl = 1.0
+        self._norm = k1 * (1 - b + b * doc_lengths / avgdl)
+
+    def get_scores(self, weighted_queries: Dict[str, float]) -> np.ndarray:
+        """
+        Score every chunk against a set of weighted queries.
+
+        Each query is tokenized and contributes ``weight * BM25+(token)`` for
+        each of its tokens, so multi-word keywords behave like phrase queries
+        without positional constraints.
+
+        Args:
+            weighted_queries: Mapping of query string to weight
+
+        Returns:
+            Array of scores, one per chunk
+        """
+        term_weights: Dict[int, float] = {}
+        for query, weight in weighted_queries.items():
+            for token in tokenize(query):
+                term_id = self.vocab.get(token)
+                if term_id is not None:
+                    term_weights[term_id] = term_weights.get(term_id, 0.0) + weight
+
+        if not term_weights or self.num_docs == 0:
+            return np.zeros(self.num_docs)
+
+        terms = np.fromiter(term_weights.keys(), dtype=np.int64, count=len(term_weights))
+        weights = np.fromiter(
+            term_weights.values(), dtype=np.float64, count=len(term_weights)
+        )
+        starts = self._offsets[terms]
+        lengths = self._offsets[terms + 1] - starts
+
+        # Gather the postings of all query terms into one flat array
+        segment_starts = np.cumsum(lengths) - lengths
+        posting_idx = np.repeat(starts - segment_starts, lengths) + np.arange(lengths.sum())
+        term_scale = np.repeat(weights * self._idf[terms], lengths)
+        docs = self._doc_ids[posting_idx]
+        tf = self._tfs[posting_idx]
+
+        contributions = term_scale * tf * (self.k1 + 1) / (tf + self._norm[docs])
+        scores = np.bincount(docs, weights=contributions, minlength=self.num_docs)
+        # BM25+ gives every document the delta lower bound for every query term
+        return scores + self.delta * float(np.dot(weights, self._idf[terms]))
+
+
+class OllamaEmbedder:
+    """
+    Embeds text with a local Ollama embedding model.
+
+    Vectors are L2-normalised, so a dot product is the cosine similarity.
+    Query embeddings are kept in memory since supervisors reuse keywords
+    across rounds.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "nomic-embed-text",
+        host: Optional[str] = None,
+        batch_size: int = 64,
+        max_cached_queries: int = 4096,
+    ):
+        """
+        Args:
+            model_name: Ollama embedding model
+            host: Ollama server (default: the ollama package default)
+            batch_size: Texts sent per embedding request
+            max_cached_queries: Query embeddings kept in memory
+        """
+        self.model_name = model_name
+        self.host = host
+        self.batch_size = batch_size
+        self.max_cached_queries = max_cached_queries
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_lock = threading.Lock()
+
+    def __getstate__(self) -> Dict:
+        # Sent to sandboxed supervisor code without its cache or lock
+        return {
+            "model_name": self.model_name,
+            "host": self.host,
+            "batch_size": self.batch_size,
+            "max_cached_queries": self.max_cached_queries,
+        }
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__init__(**state)
+
+    @property
+    def cache_key(self) -> Hashable:
+        return (type(self).__name__, self.model_name)
+
+    @property
+    def client(self):
+        """Pooled ollama.Client, shared with OllamaClient instances on the same host."""
+        import ollama
+        # Imported here: the clients package imports minions.utils
+        from minions.clients.pool import get_connection_pool
+
+        return get_connection_pool().get_client(
+            (ollama.Client, self.host),
+            lambda: ollama.Client(host=self.host, limits=get_connection_pool().limits),
+        )
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed ``texts`` in batches; returns a float32 array of shape (len(texts), dim)."""
+        batches = []
+        for start in range(0, len(texts), self.batch_size):
+            response = self.client.embed(
+                model=self.model_name, input=list(texts[start : start + self.batch_size])
+            )
+            batches.append(np.asarray(response["embeddings"], dtype=np.float32))
+        if not batches:
+            return np.zeros((0, 0), dtype=np.float32)
+        vectors = np.concatenate(batches)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def embed_queries(self, weighted_queries: Dict[str, float]) -> np.ndarray:
+        """Weighted, normalised sum of the embeddings of the query strings."""
+        queries = list(weighted_queries)
+        with self._query_lock:
+            found = {q: self._query_cache[q] for q in queries if q in self._query_cache}
+        missing = [q for q in queries if q not in found]
+        if missing:
+            found.update(zip(missing, self.embed(missing)))
+            with self._query_lock:
+                for query in missing:
+                    self._query_cache[query] = found[query]
+                while len(self._query_cache) > self.max_cached_queries:
+                    self._query_cache.popitem(last=False)
+        combined = sum(weighted_queries[q] * found[q] for q in queries)
+        return combined / max(float(np.linalg.norm(combined)), 1e-12)
+
+
+class EmbeddingIndex(RetrievalIndex):
+    """
+    Dense retrieval over chunk embeddings held in a VectorStore.
+
+    Chunks are looked up by content hash and only those never seen before are
+    embedded, so re-asking over the same corpus costs one query embedding.
+    Scores are computed block by block from the memory-mapped float16 matrix,
+    which keeps memory flat however large the corpus is.
+    """
+
+    def __init__(
+        self,
+        chunks: Sequence[str],
+        embedder: OllamaEmbedder,
+        store: Optional[VectorStore] = None,
+        block_rows: int = DEFAULT_BLOCK_ROWS,
+    ):
+        """
+        Embed any new chunks and build the index.
+
+        Args:
+            chunks: The documents to index
+            embedder: Embeds chunks and queries
+            store: Where vectors are kept (default: the shared store of the model)
+            block_rows: Rows scored at a time
+        """
+        self.num_docs = len(chunks)
+        self.embedder = embedder
+        self.store = store or get_vector_store(embedder.model_name)
+        self.block_rows = block_rows
+
+        keys = [content_key(chunk) for chunk in chunks]
+        rows = self.store.lookup(keys)
+        missing = {}
+        for i in np.flatnonzero(rows < 0).tolist():
+            missing.setdefault(keys[i], i)
+        # Number of chunks embedded while building this index
+        self.num_embedded = len(missing)
+        if missing:
+            missing_keys = list(missing)
+            step = embedder.batch_size * 16
+            for start in range(0, len(missing_keys), step):
+                batch = missing_keys[start : start + step]
+                self.store.add(batch, embedder.embed([chunks[missing[key]] for key in batch]))
+            rows = self.store.lookup(keys)
+
+        self._rows = rows
+        self._window_start = int(rows.min()) if self.num_docs else 0
+        self._window_stop = int(rows.max()) + 1 if self.num_docs else 0
+        self._window: Optional[np.ndarray] = None
+
+    def get_scores(self, weighted_queries: Dict[str, float]) -> np.ndarray:
+        """Cosine similarity of every chunk to the weighted query embedding."""
+        if not weighted_queries or self.num_docs == 0:
+            return np.zeros(self.num_docs)
+        query = self.embedder.embed_queries(weighted_queries).astype(np.float32)
+        if self._window is None:
+            # Only the rows of this corpus are mapped
+            self._window = self.store.window(self._window_start, self._window_stop)
+        local_rows = self._rows - self._window_start
+        scores = np.empty(self.num_docs, dtype=np.float64)
+        for start in range(0, self.num_docs, self.block_rows):
+            block = np.asarray(
+                self._window[local_rows[start : start + self.block_rows]], dtype=np.float32
+            )
+            scores[start : start + len(block)] = block @ query
+        return scores
+
+
+class HybridIndex(RetrievalIndex):
+    """
+    Blend of a lexical and a dense index.
+
+    Each index's scores are min-max normalised so they are comparable, then
+    mixed as ``dense_weight * dense + (1 - dense_weight) * lexical``.
+    """
+
+    def __init__(
+        self, lexical: RetrievalIndex, dense: RetrievalIndex, dense_weight: float = 0.5
+    ):
+        if lexical.num_docs != dense.num_docs:
+            raise ValueError("Both indexes must cover the same chunks")
+        self.lexical = lexical
+        self.dense = dense
+        self.dense_weight = dense_weight
+        self.num_docs = lexical.num_docs
+
+    @staticmethod
+    def _normalise(scores: np.ndarray) -> np.ndarray:
+        low, high = float(scores.min()), float(scores.max())
+        if high <= low:
+            return np.zeros_like(scores, dtype=np.float64)
+        return (scores - low) / (high - low)
+
+    def get_scores(self, weighted_queries: Dict[str, float]) -> np.ndarray:
+        if self.num_docs == 0:
+            return np.zeros(0)
+        lexical = self._normalise(self.lexical.get_scores(weighted_queries))
+        dense = self._normalise(self.dense.get_scores(weighted_queries))
+        return self.dense_weight * dense + (1 - self.dense_weight) * lexical
+
+
+_INDEX_CACHE: "OrderedDict[Hashable, RetrievalIndex]" = OrderedDict()
+_INDEX_CACHE_SIZE = 8
+_INDEX_CACHE_LOCK = threading.Lock()
+
+# id(chunks) -> (chunks, len(chunks), fingerprint) of recently fingerprinted lists;
+# holding the list keeps its id from being reused
+_FINGERPRINTS: "OrderedDict[int, Tuple[Sequence[str], int, str]]" = OrderedDict()
+
+
+def fingerprint_chunks(chunks: Sequence[str]) -> str:
+    """
+    Content hash of a list of chunks, used to share indexes across calls.
+
+    Supervisor code queries the same chunk list many times, so the hash is
+    remembered by list identity rather than recomputed over the whole corpus
+    on every call; a list is assumed not to be edited in place once queried.
+    """
+    with _INDEX_CACHE_LOCK:
+        known = _FINGERPRINTS.get(id(chunks))
+        if known is not None and known[0] is chunks and known[1] == len(chunks):
+            _FINGERPRINTS.move_to_end(id(chunks))
+            return known[2]
+
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in chunks:
+        data = chunk.encode("utf-8", "surrogatepass")
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    fingerprint = digest.hexdigest()
+
+    with _INDEX_CACHE_LOCK:
+        _FINGERPRINTS[id(chunks)] = (chunks, len(chunks), fingerprint)
+        while len(_FINGERPRINTS) > _INDEX_CACHE_SIZE:
+            _FINGERPRINTS.popitem(last=False)
+    return fingerprint
+
+
+def get_bm25_index(chunks: Sequence[str]) -> BM25Index:
+    """
+    Return a BM25Index for ``chunks``, reusing a previously built one when the
+    same chunk set was indexed before (across rounds and tasks).
+    """
+    return _cached_index(fingerprint_chunks(chunks), lambda: BM25Index(chunks))
+
+
+def _cached_index(key: Hashable, build) -> RetrievalIndex:
+    with _INDEX_CACHE_LOCK:
+        index = _INDEX_CACHE.get(key)
+        if index is not None:
+            _INDEX_CACHE.move_to_end(key)
+            return index
+
+    index = build()
+    with _INDEX_CACHE_LOCK:
+        _INDEX_CACHE[key] = index
+        while len(_INDEX_CACHE) > _INDEX_CACHE_SIZE:
+            _INDEX_CACHE.popitem(last=False)
+    return index
+
+
+RETRIEVAL_BACKENDS = ("bm25", "embedding", "hybrid")
+
+
+def get_retrieval_index(
+    chunks: Sequence[str],
+    backend: str = "bm25",
+    embedder: Optional[OllamaEmbedder] = None,
+    dense_weight: float = 0.5,
+) -> RetrievalIndex:
+    """
+    Return an index of ``chunks`` for ``backend``, reusing one built before.
+
+    Args:
+        chunks: The documents to index
+        backend: "bm25", "embedding" or "hybrid"
+        embedder: Embedding model for the dense backends (default: OllamaEmbedder())
+        dense_weight: Share of the dense score in the hybrid backend
+    """
+    if backend not in RETRIEVAL_BACKENDS:
+        raise ValueError(
+            f"Unknown retrieval backend {backend!r}, expected one of {RETRIEVAL_BACKENDS}"
+        )
+    if backend == "bm25":
+        return get_bm25_index(chunks)
+
+    embedder = embedder or OllamaEmbedder()
+    fingerprint = fingerprint_chunks(chunks)
+    dense = _cached_index(
+        ("embedding", embedder.cache_key, fingerprint),
+        lambda: EmbeddingIndex(chunks, embedder),
+    )
+    if backend == "embedding":
+        return dense
+    return _cached_index(
+        ("hybrid", embedder.cache_key, dense_weight, fingerprint),
+        lambda: HybridIndex(get_bm25_index(chunks), dense, dense_weight),
+    )
+
+
+class ChunkRetriever:
+    """
+    `retrieve_top_k_chunks` bound to a retrieval backend.
+
+    Minions passes an instance to supervisor code in place of the BM25-only
+    function; it is picklable, so it also works in the code sandbox.
+    """
+
+    def __init__(
+        self,
+        backend: str = "bm25",
+        embedder: Optional[OllamaEmbedder] = None,
+        dense_weight: float = 0.5,
+    ):
+        if backend not in RETRIEVAL_BACKENDS:
+            raise ValueError(
+                f"Unknown retrieval backend {backend!r}, expected one of {RETRIEVAL_BACKENDS}"
+            )
+        self.backend = backend
+        self.embedder = embedder
+        self.dense_weight = dense_weight
+
+    def prepare(self, chunks: Sequence[str]) -> None:
+        """
+        Embed any of ``chunks`` not in the vector store yet, so that a later
+        call over them (e.g. from sandboxed code) only embeds its queries.
+        """
+        if self.backend != "bm25":
+            get_retrieval_index(
+                chunks, self.backend, embedder=self.embedder, dense_weight=self.dense_weight
+            )
+
+    def __call__(
+        self,
+        keywords: List[str],
+        chunks: List[str],
+        weights: Dict[str, float],
+        k: int = 10,
+    ) -> List[str]:
+        weights = {keyword: weights.get(keyword, 1.0) for keyword in keywords}
+        index = get_retrieval_index(
+            chunks, self.backend, embedder=self.embedder, dense_weight=self.dense_weight
+        )
+        return [chunks[i] for i in index.top_k(weights, k=k)]
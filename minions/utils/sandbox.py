@@ -0,0 +1,400 @@
+"""
+Process-isolated execution of supervisor-generated code.
+
+The supervisor writes ``prepare_jobs`` / ``transform_outputs`` functions that we
+have to run. Doing that with ``exec`` in the orchestrator means a runaway loop or
+allocation stalls (or kills) the whole service, so the CodeSandbox runs them in a
+pool of pre-started worker processes with CPU time, wall time and memory limits.
+A worker that hits the wall-time limit is killed and replaced.
+
+Large inputs such as the document corpus are placed in shared memory once
+(see SharedCorpus) instead of being pickled to a worker on every attempt.
+
+Code objects are cached by normalized source (see compile_code), so a block the
+supervisor repeats across rounds or tasks is only compiled once per process.
+"""
+
+import concurrent.futures
+import functools
+import hashlib
+import multiprocessing
+import os
+import pickle
+import queue
+import signal
+import textwrap
+import threading
+import time
+import types
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def normalize_source(source: str) -> str:
+    """Canonical form of a code block: unified newlines, common indentation and
+    surrounding blank lines removed."""
+    source = source.replace("\r\n", "\n").replace("\r", "\n")
+    return textwrap.dedent(source).strip("\n") + "\n"
+
+
+def source_hash(source: str) -> str:
+    """SHA-256 of the normalized source, used to key cached code and results."""
+    return hashlib.sha256(normalize_source(source).encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_normalized(source: str) -> types.CodeType:
+    return compile(source, "<supervisor code>", "exec")
+
+
+def compile_code(source: str) -> types.CodeType:
+    """Compile a code block, reusing the code object for identical (normalized) sources."""
+    return _compile_normalized(normalize_source(source))
+
+
+class SharedCorpus:
+    """
+    A list of strings stored once in shared memory.
+
+    Workers attach by name and decode the texts on first use, so the corpus is
+    copied into each worker at most once rather than once per code attempt.
+    """
+
+    def __init__(self, texts: Sequence[str]):
+        encoded = [text.encode("utf-8") for text in texts]
+        self.lengths = tuple(len(data) for data in encoded)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, sum(self.lengths)))
+        offset = 0
+        for data in encoded:
+            self._shm.buf[offset : offset + len(data)] = data
+            offset += len(data)
+        self._finalizer = weakref.finalize(self, _release_shared_memory, self._shm)
+
+    @property
+    def handle(self) -> Tuple[str, Tuple[int, ...]]:
+        """Picklable reference that workers use to attach to the corpus."""
+        return self._shm.name, self.lengths
+
+    def close(self) -> None:
+        """Free the shared memory block."""
+        self._finalizer()
+
+
+def _release_shared_memory(shm: shared_memory.SharedMemory) -> None:
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _load_corpus(handle: Tuple[str, Tuple[int, ...]], loaded: Dict[str, List[str]]) -> List[str]:
+    name, lengths = handle
+    if name not in loaded:
+        # Workers share the owner's resource tracker, so attaching does not
+        # register a second owner and the block is unlinked only once
+        shm = shared_memory.SharedMemory(name=name)
+        texts, offset = [], 0
+        for length in lengths:
+            texts.append(bytes(shm.buf[offset : offset + length]).decode("utf-8"))
+            offset += length
+        shm.close()
+        loaded.clear()  # only the current corpus is worth keeping around
+        loaded[name] = texts
+    return list(loaded[name])
+
+
+def _address_space_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def _raise_cpu_limit(signum, frame):
+    raise TimeoutError("CPU time limit exceeded")
+
+
+def _portable(value: Any) -> Any:
+    """Make ``value`` picklable, replacing objects of classes defined by the code itself."""
+    try:
+        pickle.dumps(value)
+        return value
+    except Exception:
+        pass
+    if isinstance(value, (list, tuple)):
+        return type(value)(_portable(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _portable(item) for key, item in value.items()}
+    if hasattr(value, "model_dump"):
+        return types.SimpleNamespace(**_portable(value.model_dump()))
+    if hasattr(value, "__dict__"):
+        return types.SimpleNamespace(**_portable(vars(value)))
+    return repr(value)
+
+
+def _portable_error(error: BaseException) -> BaseException:
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+
+
+def _worker_main(conn, cpu_time: Optional[float], memory_limit: Optional[int]) -> None:
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if resource is not None:
+        if memory_limit:
+            # Limit growth beyond what the process already maps after fork
+            limit = _address_space_bytes() + memory_limit
+            _, hard = resource.getrlimit(resource.RLIMIT_AS)
+            if hard == resource.RLIM_INFINITY or limit < hard:
+                resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+        if cpu_time:
+            signal.signal(signal.SIGXCPU, _raise_cpu_limit)
+
+    corpora: Dict[str, List[str]] = {}
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+        code, fn_name, starting_globals, kwargs, shared = request
+
+        if resource is not None and cpu_time:
+            # RLIMIT_CPU counts the whole process lifetime, so move it forward per job
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            used = usage.ru_utime + usage.ru_stime
+            _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+            soft = int(used + cpu_time) + 1
+            if hard != resource.RLIM_INFINITY:
+                soft = min(soft, hard)
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+        try:
+            kwargs = dict(kwargs)
+            for arg_name, handle in shared.items():
+                kwargs[arg_name] = _load_corpus(handle, corpora)
+            exec_globals = dict(starting_globals)
+            exec(compile_code(code), exec_globals)
+            if fn_name not in exec_globals:
+                raise ValueError(f"Function {fn_name} not found in the code block.")
+            reply = (True, _portable(exec_globals[fn_name](**kwargs)))
+        except BaseException as e:
+            reply = (False, _portable_error(e))
+        try:
+            conn.send(reply)
+        except Exception as e:
+            conn.send((False, RuntimeError(f"Could not return the output of {fn_name}: {e}")))
+
+
+class _Worker:
+    def __init__(self, ctx, cpu_time: Optional[float], memory_limit: Optional[int]):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, cpu_time, memory_limit),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class CodeSandbox:
+    """
+    Pool of pre-started processes that run untrusted code with resource limits.
+
+    Each call sends the code, the globals it may use and the keyword arguments
+    to an idle worker. Everything passed in and returned must be picklable;
+    instances of classes defined by the code itself come back as
+    ``types.SimpleNamespace`` objects with the same attributes. Exceptions raised
+    by the code are re-raised in the caller; exceeding the CPU or wall time limit
+    raises TimeoutError and running out of memory raises MemoryError.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        wall_time: Optional[float] = 60.0,
+        cpu_time: Optional[float] = None,
+        memory_limit_mb: Optional[int] = 2048,
+    ):
+        """
+        Initialize the sandbox and start its worker processes.
+
+        Args:
+            max_workers: Number of worker processes (and of concurrent executions)
+            wall_time: Seconds a single execution may take before its worker is killed
+            cpu_time: CPU seconds a single execution may use (default: wall_time)
+            memory_limit_mb: Extra address space a worker may allocate, in MB
+                (enforced through RLIMIT_AS, the closest portable stand-in for RSS)
+        """
+        self.max_workers = max_workers
+        self.wall_time = wall_time
+        self.cpu_time = cpu_time if cpu_time is not None else wall_time
+        self.memory_limit = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+
+        self._ctx = multiprocessing.get_context()
+        # Started before the workers so they inherit it (see _load_corpus)
+        resource_tracker.ensure_running()
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._closed = False
+        for _ in range(max_workers):
+            self._idle.put(self._spawn())
+        self._finalizer = weakref.finalize(self, CodeSandbox._stop_workers, self._idle)
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._ctx, self.cpu_time, self.memory_limit)
+
+    def run(
+        self,
+        code: str,
+        fn_name: str,
+        starting_globals: Optional[Dict[str, Any]] = None,
+        kwargs: Optional[Dict[str, Any]] = None,
+        shared: Optional[Dict[str, SharedCorpus]] = None,
+        cancelled: Optional[threading.Event] = None,
+    ) -> Any:
+        """
+        Execute ``code`` and return the result of calling ``fn_name(**kwargs)``.
+
+        Args:
+            code: Source defining ``fn_name``
+            fn_name: Function to call after executing the code
+            starting_globals: Globals available to the code
+            kwargs: Keyword arguments for the function
+            shared: Keyword arguments passed through shared memory
+            cancelled: Event that aborts the execution (its worker is replaced)
+
+        Returns:
+            The function's return value
+        """
+        if self._closed:
+            raise RuntimeError("CodeSandbox is closed")
+        request = (
+            code,
+            fn_name,
+            starting_globals or {},
+            kwargs or {},
+            {name: corpus.handle for name, corpus in (shared or {}).items()},
+        )
+
+        worker = self._idle.get()
+        try:
+            if cancelled is not None and cancelled.is_set():
+                # Another candidate won while this one waited for a worker
+                raise concurrent.futures.CancelledError()
+            worker.conn.send(request)
+            deadline = None if self.wall_time is None else time.monotonic() + self.wall_time
+            while not worker.conn.poll(0.05):
+                if cancelled is not None and cancelled.is_set():
+                    worker.kill()
+                    worker = self._spawn()
+                    raise concurrent.futures.CancelledError()
+                if not worker.process.is_alive():
+                    worker.kill()
+                    worker = self._spawn()
+                    raise MemoryError(f"{fn_name} crashed the sandbox worker (out of memory?)")
+                if deadline is not None and time.monotonic() > deadline:
+                    worker.kill()
+                    worker = self._spawn()
+                    raise TimeoutError(f"{fn_name} exceeded the {self.wall_time}s time limit")
+            try:
+                ok, value = worker.conn.recv()
+            except EOFError:
+                worker.kill()
+                worker = self._spawn()
+                raise MemoryError(f"{fn_name} crashed the sandbox worker (out of memory?)")
+        finally:
+            self._idle.put(worker)
+
+        if not ok:
+            raise value
+        return value
+
+    def run_first(
+        self,
+        code_blocks: Sequence[str],
+        fn_name: str,
+        starting_globals: Optional[Dict[str, Any]] = None,
+        kwargs: Optional[Dict[str, Any]] = None,
+        shared: Optional[Dict[str, SharedCorpus]] = None,
+    ) -> Tuple[Any, str]:
+        """
+        Run several candidate code blocks in parallel and keep the first that succeeds.
+
+        Executions still running once a candidate succeeds are aborted. If every
+        candidate fails, the error of the first one is raised.
+
+        Returns:
+            Tuple of (function output, winning code block)
+        """
+        if len(code_blocks) == 1:
+            return self.run(code_blocks[0], fn_name, starting_globals, kwargs, shared), code_blocks[0]
+
+        cancelled = threading.Event()
+        errors: Dict[int, BaseException] = {}
+
+        def attempt(code: str) -> Any:
+            output = self.run(code, fn_name, starting_globals, kwargs, shared, cancelled)
+            # Set here, before this thread can take a queued candidate
+            cancelled.set()
+            return output
+
+        # No more threads than worker processes: the rest would only queue for one
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(len(code_blocks), self.max_workers)
+        ) as pool:
+            futures = {
+                pool.submit(attempt, code): idx
+                for idx, code in enumerate(code_blocks)
+            }
+            for future in concurrent.futures.as_completed(futures):
+                idx = futures[future]
+                try:
+                    output = future.result()
+                except BaseException as e:
+                    errors[idx] = e
+                    continue
+                for other in futures:
+                    other.cancel()
+                return output, code_blocks[idx]
+        raise errors[min(errors)]
+
+    @staticmethod
+    def _stop_workers(idle: "queue.Queue[_Worker]") -> None:
+        while True:
+            try:
+                idle.get_nowait().stop()
+            except queue.Empty:
+                return
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        self._closed = True
+        self._finalizer()
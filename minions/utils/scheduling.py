@@ -0,0 +1,48 @@
+"""
+Ordering of independent worker prompts for server-side prefix (KV) caching.
+
+Serving engines such as Ollama/llama.cpp, vLLM and Tokasaurus skip prefill for
+the part of a prompt that matches one they processed recently. Sending prompts
+in sorted order places every prompt next to the one it shares the longest
+prefix with (the depth-first order of their prefix trie), so jobs on the same
+chunk run back to back after the shared instructions.
+"""
+
+from typing import List, Sequence
+
+
+def common_prefix_length(a: str, b: str) -> int:
+    """Length of the longest common prefix of ``a`` and ``b``."""
+    # Binary search over slice comparisons, which run in C
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def order_for_prefix_reuse(prompts: Sequence[str]) -> List[int]:
+    """
+    Order in which to send ``prompts`` so consecutive ones share the longest prefixes.
+
+    Returns:
+        Indices into ``prompts``
+    """
+    return sorted(range(len(prompts)), key=prompts.__getitem__)
+
+
+def prefix_hit_ratio(prompts: Sequence[str]) -> float:
+    """
+    Fraction of prompt characters that can be served from the prefix cache when
+    ``prompts`` are sent in this order and the server keeps the previous prompt.
+    """
+    total = sum(len(prompt) for prompt in prompts)
+    if not total:
+        return 0.0
+    shared = sum(
+        common_prefix_length(prev, cur) for prev, cur in zip(prompts, prompts[1:])
+    )
+    return shared / total
@@ -0,0 +1,121 @@
+"""
+Prompt token counting and context-window budgeting for local models.
+
+Local servers only report how many tokens a prompt had after the fact, and
+Ollama silently drops the start of a prompt that does not fit ``num_ctx``. The
+TokenCounter estimates counts up front with a tiktoken encoding (or a
+characters-per-token heuristic when no encoding is available) and calibrates
+the estimate per model against the counts the server reports.
+"""
+
+import functools
+import logging
+import math
+import threading
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("TokenBudget")
+
+# Rough characters per token for English text, used when tiktoken is unavailable
+CHARS_PER_TOKEN = 4.0
+
+# Chat templates add a few tokens around every message
+TOKENS_PER_MESSAGE = 4
+
+
+@functools.lru_cache(maxsize=None)
+def _get_encoding(encoding_name: str) -> Optional[Any]:
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        # e.g. the encoding file cannot be downloaded on an offline machine
+        logger.warning(f"Falling back to approximate token counts: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=8192)
+def _raw_count(encoding_name: str, text: str) -> int:
+    encoding = _get_encoding(encoding_name)
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+class TokenCounter:
+    """
+    Fast, calibrated prompt token estimates for one model.
+
+    ``observe`` feeds back the server's count for a prompt whose raw estimate
+    is known; a running ratio then corrects for the difference between the
+    approximation and the model's real tokenizer.
+    """
+
+    def __init__(self, model_name: Optional[str] = None, encoding_name: str = "cl100k_base"):
+        self.model_name = model_name
+        self.encoding_name = encoding_name
+        self.ratio = 1.0
+        self._observations = 0
+        self._lock = threading.Lock()
+
+    def raw_count(self, text: str) -> int:
+        """Uncalibrated token count of ``text``."""
+        return _raw_count(self.encoding_name, text)
+
+    def count(self, text: str) -> int:
+        """Estimated number of model tokens in ``text``."""
+        return math.ceil(self.raw_count(text) * self.ratio)
+
+    def raw_count_messages(self, messages: List[Dict[str, Any]]) -> int:
+        """Uncalibrated token count of a chat request."""
+        return sum(
+            TOKENS_PER_MESSAGE + self.raw_count(str(message.get("content") or ""))
+            for message in messages
+        )
+
+    def count_messages(self, messages: List[Dict[str, Any]]) -> int:
+        """Estimated number of model tokens in a chat request."""
+        return math.ceil(self.raw_count_messages(messages) * self.ratio)
+
+    def observe(self, raw_estimate: int, actual: int) -> None:
+        """Calibrate against the server-reported prompt token count of a request."""
+        if raw_estimate <= 0 or actual <= 0:
+            return
+        sample = actual / raw_estimate
+        # Prefix-cache hits make some servers under-report; ignore implausible samples
+        if not 0.5 <= sample <= 2.0:
+            return
+        with self._lock:
+            self._observations += 1
+            weight = max(1.0 / self._observations, 0.1)
+            self.ratio += weight * (sample - self.ratio)
+
+    def split(self, text: str, max_tokens: int) -> List[str]:
+        """Split ``text`` into consecutive pieces of at most ``max_tokens`` estimated tokens."""
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        if self.count(text) <= max_tokens:
+            return [text]
+        raw_budget = max(1, int(max_tokens / self.ratio))
+        encoding = _get_encoding(self.encoding_name)
+        if encoding is None:
+            step = max(1, int(raw_budget * CHARS_PER_TOKEN))
+            return [text[i : i + step] for i in range(0, len(text), step)]
+        tokens = encoding.encode(text, disallowed_special=())
+        return [
+            encoding.decode(tokens[i : i + raw_budget])
+            for i in range(0, len(tokens), raw_budget)
+        ]
+
+
+_counters: Dict[Optional[str], TokenCounter] = {}
+_counters_lock = threading.Lock()
+
+
+def get_token_counter(model_name: Optional[str] = None) -> TokenCounter:
+    """The shared TokenCounter for ``model_name``, so calibration is kept per model."""
+    with _counters_lock:
+        if model_name not in _counters:
+            _counters[model_name] = TokenCounter(model_name)
+        return _counters[model_name]
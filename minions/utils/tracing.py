@@ -0,0 +1,509 @@
+"""
+Span-based tracing of protocol steps.
+
+Every step worth timing (supervisor and worker calls, decomposition, code
+execution, worker dispatch and the jobs in it, synthesis, the privacy shield,
+MCP tool calls) runs inside a span. Spans nest through a context variable, so
+they follow the call stack and asyncio tasks; work handed to other threads
+passes its parent explicitly.
+
+Tracing is off by default, and a disabled tracer hands out a shared no-op span.
+Enable it with `configure_tracing` or the MINIONS_TRACE environment variable,
+a comma-separated list of targets:
+
+    MINIONS_TRACE=trace.jsonl            one JSON object per span
+    MINIONS_TRACE=trace.json             Chrome trace (chrome://tracing, Perfetto)
+    MINIONS_TRACE=otel                   the OpenTelemetry SDK configured by the app
+
+Enabled tracers also keep latency and token histograms per span name, see
+`Tracer.summary`.
+"""
+
+import asyncio
+import atexit
+import bisect
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar(
+    "minions_current_span", default=None
+)
+
+# Bucket upper bounds for latencies (milliseconds) and token counts
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000)
+TOKEN_BUCKETS = (16, 64, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536, 131072)
+
+
+class Span:
+    """
+    A timed, named step with attributes.
+
+    Use it as a context manager (it becomes the current span inside the
+    block), or call `end` on a span from `Tracer.start_span`.
+    """
+
+    __slots__ = (
+        "tracer", "name", "trace_id", "span_id", "parent_id", "attributes",
+        "start_ns", "end_ns", "thread_id", "status", "_token",
+    )
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        parent: Optional["Span"],
+        attributes: Dict[str, Any],
+        start_ns: Optional[int] = None,
+    ):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = attributes
+        self.start_ns = time.time_ns() if start_ns is None else start_ns
+        self.end_ns: Optional[int] = None
+        self.thread_id = threading.get_ident()
+        self.status = "ok"
+        self._token = None
+
+    @property
+    def duration(self) -> float:
+        """Seconds from start to end (or to now, while the span is open)."""
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e9
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def set_usage(self, usage: Any, prefix: str = "", since: Any = None) -> None:
+        """
+        Record token counts of a Usage as ``<prefix>prompt_tokens`` etc.
+
+        Args:
+            usage: A Usage (anything else, e.g. the 0 of a failed call, is ignored)
+            prefix: Attribute name prefix, e.g. "local_"
+            since: An earlier total to subtract, to record the usage of one step
+        """
+        for field in ("prompt_tokens", "completion_tokens", "cached_prompt_tokens"):
+            value = getattr(usage, field, None)
+            if value is None:
+                continue
+            value -= getattr(since, field, 0) or 0
+            self.attributes[f"{prefix}{field}"] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = "error"
+        self.attributes["error"] = f"{type(error).__name__}: {error}"
+
+    def _activate(self) -> None:
+        self._token = _current_span.set(self)
+
+    def end(self, end_ns: Optional[int] = None) -> None:
+        """Finish the span and hand it to the exporters; later calls do nothing."""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns() if end_ns is None else end_ns
+        if self._token is not None:
+            try:
+                _current_span.reset(self._token)
+            except ValueError:
+                # Ended in another context than it was started in
+                pass
+            self._token = None
+        self.tracer._on_end(self)
+
+    def __enter__(self) -> "Span":
+        self._activate()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is not None:
+            self.record_error(exc)
+        self.end()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": self.duration * 1000,
+            "thread_id": self.thread_id,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stand-in returned by a disabled tracer; every method does nothing."""
+
+    name = ""
+    trace_id = span_id = parent_id = None
+    duration = 0.0
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes: Any) -> None:
+        pass
+
+    def set_usage(self, usage: Any, prefix: str = "", since: Any = None) -> None:
+        pass
+
+    def record_error(self, error: BaseException) -> None:
+        pass
+
+    def end(self, end_ns: Optional[int] = None) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum, min and max."""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q``-th percentile (0-100)."""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bound, count in zip(self.bounds + (self.max,), self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "buckets": dict(zip([*map(str, self.bounds), "inf"], self.counts)),
+        }
+
+
+class SpanExporter:
+    """Receives every finished span; `flush` is called when a root span ends."""
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError("Subclasses must implement export()")
+
+    def flush(self) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        self.flush()
+
+
+class JSONLExporter(SpanExporter):
+    """Appends one JSON object per span to ``path``."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def flush(self) -> None:
+        with self._lock:
+            self._file.flush()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class ChromeTraceExporter(SpanExporter):
+    """
+    Writes spans in the Chrome trace event format to ``path``.
+
+    The file is rewritten whenever a root span ends, so it always holds every
+    span of the process so far. Open it in chrome://tracing or ui.perfetto.dev.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._events: List[Dict[str, Any]] = []
+
+    def export(self, span: Span) -> None:
+        event = {
+            "name": span.name,
+            "cat": "minions",
+            "ph": "X",
+            "ts": span.start_ns / 1000,
+            "dur": (span.end_ns - span.start_ns) / 1000,
+            "pid": os.getpid(),
+            "tid": span.thread_id,
+            "args": {**span.attributes, "trace_id": span.trace_id, "status": span.status},
+        }
+        with self._lock:
+            self._events.append(event)
+
+    def flush(self) -> None:
+        with self._lock:
+            payload = json.dumps(
+                {"traceEvents": self._events, "displayTimeUnit": "ms"}, default=str
+            )
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_path, self.path)
+
+
+class OpenTelemetryExporter(SpanExporter):
+    """
+    Replays spans through the OpenTelemetry API.
+
+    Spans are buffered per trace and emitted, with their original start and end
+    times and parent links, once the root span ends. Where they go is up to the
+    TracerProvider the application configured (OTLP, console, ...).
+    Requires the ``opentelemetry-api`` package.
+    """
+
+    def __init__(self, tracer_provider: Any = None):
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetryExporter requires opentelemetry-api: "
+                "pip install opentelemetry-api opentelemetry-sdk"
+            ) from e
+        self._trace = trace
+        self._otel_tracer = trace.get_tracer("minions", tracer_provider=tracer_provider)
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List[Span]] = defaultdict(list)
+
+    @staticmethod
+    def _attributes(span: Span) -> Dict[str, Any]:
+        # OpenTelemetry only accepts primitive attribute values
+        return {
+            key: value if isinstance(value, (str, bool, int, float)) else str(value)
+            for key, value in span.attributes.items()
+            if value is not None
+        }
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._pending[span.trace_id].append(span)
+            if span.parent_id is not None:
+                return
+            spans = self._pending.pop(span.trace_id)
+
+        otel_spans = {}
+        for item in sorted(spans, key=lambda s: s.start_ns):
+            parent = otel_spans.get(item.parent_id)
+            context = self._trace.set_span_in_context(parent) if parent is not None else None
+            otel_span = self._otel_tracer.start_span(
+                item.name,
+                context=context,
+                start_time=item.start_ns,
+                attributes=self._attributes(item),
+            )
+            if item.status == "error":
+                otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+            otel_spans[item.span_id] = otel_span
+        for item in spans:
+            otel_spans[item.span_id].end(end_time=item.end_ns)
+
+
+class Tracer:
+    """
+    Creates spans and fans finished ones out to exporters and histograms.
+    """
+
+    def __init__(self, exporters: Optional[List[SpanExporter]] = None):
+        self.exporters: List[SpanExporter] = list(exporters or [])
+        self._lock = threading.Lock()
+        self._latency: Dict[str, Histogram] = {}
+        self._tokens: Dict[str, Histogram] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def add_exporter(self, exporter: SpanExporter) -> None:
+        self.exporters.append(exporter)
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        return _current_span.get()
+
+    def span(self, name: str, parent: Optional[Span] = None, **attributes: Any):
+        """
+        A new span, to be used as a context manager.
+
+        Args:
+            name: Step name, e.g. "minions.decompose"
+            parent: Parent span (default: the current span)
+            **attributes: Initial attributes
+        """
+        if not self.exporters:
+            return NOOP_SPAN
+        return Span(self, name, parent or _current_span.get(), attributes)
+
+    def start_span(self, name: str, parent: Optional[Span] = None, **attributes: Any):
+        """A new span that is current until its `end` is called."""
+        span = self.span(name, parent, **attributes)
+        if span is not NOOP_SPAN:
+            span._activate()
+        return span
+
+    def record_span(
+        self,
+        name: str,
+        start_ns: int,
+        end_ns: int,
+        parent: Optional[Span] = None,
+        **attributes: Any,
+    ) -> None:
+        """Record a finished step timed elsewhere, e.g. a job run in a worker thread."""
+        if not self.exporters:
+            return
+        Span(self, name, parent or _current_span.get(), attributes, start_ns=start_ns).end(end_ns)
+
+    def _on_end(self, span: Span) -> None:
+        with self._lock:
+            if span.name not in self._latency:
+                self._latency[span.name] = Histogram(LATENCY_BUCKETS_MS)
+            self._latency[span.name].observe(span.duration * 1000)
+            for key, value in span.attributes.items():
+                if key.endswith("_tokens") and isinstance(value, (int, float)):
+                    metric = f"{span.name}.{key}"
+                    if metric not in self._tokens:
+                        self._tokens[metric] = Histogram(TOKEN_BUCKETS)
+                    self._tokens[metric].observe(value)
+        for exporter in self.exporters:
+            exporter.export(span)
+        if span.parent_id is None:
+            self.flush()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Latency (ms) and token histograms, keyed by span name (and attribute)."""
+        with self._lock:
+            return {
+                "latency_ms": {name: h.to_dict() for name, h in self._latency.items()},
+                "tokens": {name: h.to_dict() for name, h in self._tokens.items()},
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._latency.clear()
+            self._tokens.clear()
+
+    def flush(self) -> None:
+        for exporter in self.exporters:
+            exporter.flush()
+
+    def shutdown(self) -> None:
+        for exporter in self.exporters:
+            exporter.shutdown()
+        self.exporters = []
+
+
+def current_span():
+    """The innermost open span, or a no-op span outside any span."""
+    return _current_span.get() or NOOP_SPAN
+
+
+def traced(name: str) -> Callable:
+    """Decorator running every call of a function or coroutine in a span called ``name``."""
+
+    def decorator(fn: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with get_tracer().span(name):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with get_tracer().span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _exporters_from_env(value: str) -> List[SpanExporter]:
+    exporters: List[SpanExporter] = []
+    for target in filter(None, (t.strip() for t in value.split(","))):
+        if target.lower() == "otel":
+            exporters.append(OpenTelemetryExporter())
+        elif target.endswith(".jsonl"):
+            exporters.append(JSONLExporter(target))
+        else:
+            exporters.append(ChromeTraceExporter(target))
+    return exporters
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """The process-wide tracer, configured from MINIONS_TRACE on first use."""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer(_exporters_from_env(os.environ.get("MINIONS_TRACE", "")))
+                atexit.register(_tracer.flush)
+    return _tracer
+
+
+def configure_tracing(*exporters: SpanExporter) -> Tracer:
+    """Send spans to ``exporters`` (none: turn tracing off) and return the tracer."""
+    tracer = get_tracer()
+    tracer.shutdown()
+    tracer.exporters = list(exporters)
+    tracer.reset_stats()
+    return tracer
@@ -0,0 +1,186 @@
+"""
+On-disk store for embedding vectors, keyed by a hash of the embedded text.
+
+Vectors live in a flat float16 file that is memory-mapped for reading, and a
+SQLite index maps each content key to its row. Rows are only ever appended, so
+a chunk embedded once is never embedded again, by this or any other process
+sharing the store, and a corpus larger than RAM can be scored block by block.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from typing import Optional, Sequence
+
+import numpy as np
+
+# Rows (not bytes) of the vector file scored at a time
+DEFAULT_BLOCK_ROWS = 65536
+
+
+def default_vector_store_dir(model_name: str) -> str:
+    """Directory of the store for ``model_name`` (under MINIONS_CACHE_DIR)."""
+    cache_dir = os.environ.get(
+        "MINIONS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "minions")
+    )
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "_", model_name)
+    return os.path.join(cache_dir, "vectors", slug)
+
+
+def content_key(text: str) -> str:
+    """Key under which the embedding of ``text`` is stored."""
+    return hashlib.blake2b(
+        text.encode("utf-8", "surrogatepass"), digest_size=16
+    ).hexdigest()
+
+
+class VectorStore:
+    """
+    Append-only float16 vector matrix with a key -> row index.
+
+    Several processes may read and append at the same time: appends run inside
+    a SQLite write transaction, which serialises them, and readers only look at
+    rows whose keys have been committed.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the store in directory ``path``.
+
+        Args:
+            path: Directory holding ``vectors.f16`` and ``index.sqlite``
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._vectors_path = os.path.join(path, "vectors.f16")
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(path, "index.sqlite"),
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=60,
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS vectors (key TEXT PRIMARY KEY, row INTEGER NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+        self.dim: Optional[int] = self._read_dim()
+
+    def _read_dim(self) -> Optional[int]:
+        row = self._db.execute("SELECT value FROM meta WHERE name = 'dim'").fetchone()
+        return row[0] if row else None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+
+    def lookup(self, keys: Sequence[str]) -> np.ndarray:
+        """Rows of ``keys`` in the vector file, -1 for keys not stored yet."""
+        found = {}
+        with self._lock:
+            if self.dim is None:
+                # Set by whichever process stored the first vectors
+                self.dim = self._read_dim()
+            # Stay below SQLite's limit on bound parameters
+            for start in range(0, len(keys), 500):
+                batch = list(keys[start : start + 500])
+                placeholders = ",".join("?" * len(batch))
+                found.update(
+                    self._db.execute(
+                        f"SELECT key, row FROM vectors WHERE key IN ({placeholders})", batch
+                    ).fetchall()
+                )
+        return np.fromiter((found.get(key, -1) for key in keys), dtype=np.int64, count=len(keys))
+
+    def add(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        """Append the vectors of keys that are not stored yet."""
+        vectors = np.asarray(vectors, dtype=np.float16)
+        if len(keys) != len(vectors):
+            raise ValueError("keys and vectors must have the same length")
+        if not len(keys):
+            return
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                if self.dim is None:
+                    self.dim = self._read_dim() or vectors.shape[1]
+                    self._db.execute(
+                        "INSERT OR IGNORE INTO meta (name, value) VALUES ('dim', ?)",
+                        (self.dim,),
+                    )
+                if vectors.shape[1] != self.dim:
+                    raise ValueError(
+                        f"Vectors have dimension {vectors.shape[1]}, store has {self.dim}"
+                    )
+                # Another process may have stored some of these meanwhile
+                stored = set()
+                for start in range(0, len(keys), 500):
+                    batch = list(keys[start : start + 500])
+                    placeholders = ",".join("?" * len(batch))
+                    stored.update(
+                        key
+                        for (key,) in self._db.execute(
+                            f"SELECT key FROM vectors WHERE key IN ({placeholders})", batch
+                        )
+                    )
+                new = {}
+                for i, key in enumerate(keys):
+                    if key not in stored and key not in new:
+                        new[key] = i
+                if not new:
+                    self._db.execute("COMMIT")
+                    return
+
+                next_row = self._db.execute(
+                    "SELECT COALESCE(MAX(row) + 1, 0) FROM vectors"
+                ).fetchone()[0]
+                # Rows past the last committed one are leftovers of an aborted
+                # append and are overwritten
+                mode = "r+b" if os.path.exists(self._vectors_path) else "w+b"
+                with open(self._vectors_path, mode) as f:
+                    f.seek(next_row * self.dim * 2)
+                    f.write(vectors[list(new.values())].tobytes())
+                self._db.executemany(
+                    "INSERT INTO vectors (key, row) VALUES (?, ?)",
+                    [(key, next_row + i) for i, key in enumerate(new)],
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def window(self, start: int, stop: int) -> np.ndarray:
+        """Read-only memory map of rows ``[start, stop)``."""
+        if self.dim is None or stop <= start:
+            return np.zeros((0, self.dim or 0), dtype=np.float16)
+        return np.memmap(
+            self._vectors_path,
+            dtype=np.float16,
+            mode="r",
+            offset=start * self.dim * 2,
+            shape=(stop - start, self.dim),
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_vector_store(model_name: str, path: Optional[str] = None) -> VectorStore:
+    """The shared VectorStore for embeddings of ``model_name``."""
+    path = path or default_vector_store_dir(model_name)
+    # SQLite connections must not cross a fork (e.g. into sandbox workers)
+    key = (os.getpid(), path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = VectorStore(path)
+        return _stores[key]
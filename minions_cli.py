@@ -9,9 +9,10 @@ from minions.clients.groq import GroqClient
 
 from minions.clients.perplexity import PerplexityAIClient
 from minions.clients.openrouter import OpenRouterClient
+from minions.clients.cached import CachedClient
 import time
 import argparse
-import fitz  # PyMuPDF for PDF handling
+from minions.utils.ingestion import IngestionPipeline, read_file_text
 import json
 import os
 import sys
@@ -26,29 +27,23 @@ def extract_text_from_file(file_path):
     try:
         # Expand ~ to user's home directory if present
         file_path = os.path.expanduser(file_path)
-
-        if file_path.lower().endswith(".pdf"):
-            # Handle PDF file
-            doc = fitz.open(file_path)
-            text = ""
-            for page in doc:
-                text += page.get_text()
-            doc.close()
-            return text
-        elif file_path.lower().endswith((".txt", ".py", ".md")):
-            # Handle text-based files
-            with open(file_path, "r", encoding="utf-8") as f:
-                return f.read()
-        else:
-            raise ValueError(
-                "Unsupported file format. Only PDF, TXT, PY, and MD files are supported."
-            )
+        return read_file_text(file_path)
     except Exception as e:
         print(f"Error reading file: {str(e)}")
         return ""
 
 
-def extract_text_from_folder(folder_path):
+def _print_ingestion_progress(stats, path):
+    print(
+        f"\rLoaded {stats.files_done + stats.files_failed}/{stats.files_total} files "
+        f"({stats.cache_hits} cached, {stats.files_per_sec:.1f} files/s, "
+        f"{stats.mb_per_sec:.1f} MB/s)",
+        end="",
+        flush=True,
+    )
+
+
+def extract_text_from_folder(folder_path, max_workers=None, use_cache=True):
     """Extract text from all supported files in a folder."""
     try:
         # Expand ~ to user's home directory if present
@@ -57,44 +52,35 @@ def extract_text_from_folder(folder_path):
         if not os.path.isdir(folder_path):
             raise ValueError(f"'{folder_path}' is not a valid directory")
 
-        # Dictionary to store file contents with filenames as keys
-        file_contents = {}
-        file_count = 0
-        total_chars = 0
-
-        # Walk through the directory
-        for root, _, files in os.walk(folder_path):
-            # skip folder with examples in it
-            for file in files:
-                file_path = os.path.join(root, file)
-
-                # Only process supported file types
-                if file.lower().endswith((".txt", ".py", ".pdf", ".md")):
-                    try:
-                        content = extract_text_from_file(file_path)
-                        if content:
-                            # Use relative path from the base folder as the key
-                            rel_path = os.path.relpath(file_path, folder_path)
-                            file_contents[rel_path] = content
-                            file_count += 1
-                            total_chars += len(content)
-                            print(f"Loaded: {rel_path} ({len(content)} chars)")
-                    except Exception as e:
-                        print(f"Error processing {file_path}: {str(e)}")
+        pipeline = IngestionPipeline(
+            max_workers=max_workers,
+            use_cache=use_cache,
+            progress_callback=_print_ingestion_progress,
+        )
+        try:
+            file_contents = pipeline.ingest_folder(folder_path)
+        finally:
+            pipeline.close()
+        if pipeline.stats.files_total:
+            print()
 
         if not file_contents:
             print("No supported files found in the directory.")
             return ""
 
         # Combine all texts with file headers
-        combined_text = ""
+        parts = []
         for filename, content in file_contents.items():
-            combined_text += f"\n\n--- BEGIN FILE: {filename} ---\n\n"
-            combined_text += content
-            combined_text += f"\n\n--- END FILE: {filename} ---\n\n"
+            parts.append(f"\n\n--- BEGIN FILE: {filename} ---\n\n")
+            parts.append(content)
+            parts.append(f"\n\n--- END FILE: {filename} ---\n\n")
+        combined_text = "".join(parts)
 
+        stats = pipeline.stats
         print(
-            f"Successfully loaded {file_count} files with a total of {total_chars} characters."
+            f"Successfully loaded {len(file_contents)} files with a total of "
+            f"{stats.chars_extracted} characters in {stats.elapsed:.2f}s "
+            f"({stats.cache_hits} from cache)."
         )
         return combined_text
 
@@ -380,6 +366,23 @@ def main():
     parser.add_argument(
         "--doc-metadata", type=str, default="", help="Metadata describing the document"
     )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        default=os.environ.get("MINIONS_CACHE", "").lower() in ("1", "true", "yes"),
+        help="Replay identical temperature-0 requests from the on-disk response cache",
+    )
+    parser.add_argument(
+        "--ingest-workers",
+        type=int,
+        default=None,
+        help="Processes used to extract documents from a folder (default: CPU count)",
+    )
+    parser.add_argument(
+        "--no-ingest-cache",
+        action="store_true",
+        help="Re-extract every document instead of reusing cached text",
+    )
     args = parser.parse_args()
 
     # Get model configuration from environment variables
@@ -405,7 +408,11 @@ def main():
         # Check if it's a directory
         if os.path.isdir(context_path):
             print(f"Loading documents from folder: {context_path}")
-            context = extract_text_from_folder(context_path)
+            context = extract_text_from_folder(
+                context_path,
+                max_workers=args.ingest_workers,
+                use_cache=not args.no_ingest_cache,
+            )
             if not context:
                 print("Error: Could not extract text from the specified folder")
                 return
@@ -476,6 +483,11 @@ def main():
         max_tokens=remote_max_tokens,
     )
 
+    if args.cache:
+        print("Using on-disk response cache")
+        local_client = CachedClient(local_client)
+        remote_client = CachedClient(remote_client)
+
     # Instantiate the protocol object with the clients
     print(f"Initializing {args.protocol} protocol")
     if args.protocol == "minions":
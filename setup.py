@@ -12,6 +12,7 @@ setup(
         "together",  # for Together client
         "groq",  # for Groq client
         "requests",  # for API calls
+        "httpx",  # for pooled HTTP connections
         "tiktoken",  # for token counting
         "pymupdf",  # for PDF processing
         "st-theme",
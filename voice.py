@@ -1,5 +1,6 @@
 import nltk
 from gtts import gTTS
+import functools
 import os
 import time
 import subprocess
@@ -17,15 +18,11 @@ import re
 # Ensure NLTK's Punkt tokenizer is downloaded
 nltk.download('punkt_tab')
 
-def save_audio(teks):
 
-    # Clean filename by removing invalid characters and whitespace
-    filename = "".join(c for c in teks if c.isalnum() or c in (' ', '-', '_'))[:50]  # Limit length
-    filename = filename.strip().replace(' ', '_')
-    if not filename:  # Fallback if filename is empty after cleaning
-        filename = "audio"
-    
-    tts = SileroTTS(
+@functools.lru_cache(maxsize=1)
+def get_tts():
+    # Loading the Silero model is expensive, so build it once and reuse it
+    return SileroTTS(
         model_id='v3_en',
         language='en',
         speaker='en_67',  # Using a clearer speaker
@@ -35,6 +32,22 @@ def save_audio(teks):
         put_yo=True,
         num_threads=8  # Optimized number of threads for better processing
     )
+
+
+@functools.lru_cache(maxsize=None)
+def get_translator(source, target):
+    return GoogleTranslator(source=source, target=target)
+
+
+def save_audio(teks):
+
+    # Clean filename by removing invalid characters and whitespace
+    filename = "".join(c for c in teks if c.isalnum() or c in (' ', '-', '_'))[:50]  # Limit length
+    filename = filename.strip().replace(' ', '_')
+    if not filename:  # Fallback if filename is empty after cleaning
+        filename = "audio"
+    
+    tts = get_tts()
     output_path = f"{filename}.wav"
     tts.tts(teks, output_path)
     return output_path
@@ -45,16 +58,7 @@ def voice(teks, chunk_length_ms=5500):  # 'chunk_length_ms' is no longer require
 
     print("isis teks", teks)
 
-    tts = SileroTTS(
-        model_id='v3_en',
-        language='en',
-        speaker='en_67',  # Using a clearer speaker
-        sample_rate=48000,  # Ensuring sample rate does not exceed 48000
-        device='cuda',
-        put_accent=True,
-        put_yo=True,
-        num_threads=8  # Optimized number of threads for better processing
-    )
+    tts = get_tts()
 
     """
     Fungsi untuk mengubah teks menjadi suara, memainkannya, dan menghasilkan subtitle teks.
@@ -74,7 +78,7 @@ def voice(teks, chunk_length_ms=5500):  # 'chunk_length_ms' is no longer require
     cleaned_text = re.sub(r"\*(.*?)\*", r"\1", teks)
 
     # Terjemahkan teks ke dalam Bahasa Inggris
-    translated = GoogleTranslator(source='auto', target='en').translate(cleaned_text)
+    translated = get_translator('auto', 'en').translate(cleaned_text)
     print(f"Teks yang akan diubah menjadi suara: {translated}")
 
     # Split translated text into sentences
@@ -122,7 +126,7 @@ def voice(teks, chunk_length_ms=5500):  # 'chunk_length_ms' is no longer require
     subtitles = []
     current_time = 0
     for idx, sentence in enumerate(sentences):
-        indo_segment = GoogleTranslator(source='en', target='id').translate(sentence)
+        indo_segment = get_translator('en', 'id').translate(sentence)
         subtitle_text = f"[{idx+1}/{len(sentences)}]\n{sentence}\n{indo_segment}"
         subtitle = {
             'start': current_time,